@@ -2,23 +2,86 @@
 """
 FastAPI service for Phonely AI CrewAI inspection
 """
-from fastapi import FastAPI, HTTPException, Header, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from contextlib import asynccontextmanager
+import asyncio
+import math
+import time
 import uvicorn
 import os
 from loguru import logger
-import httpx
 from datetime import datetime
 
-from phonely_ai.langgraph_orchestrator import run_inspection
+from phonely_ai.langgraph_orchestrator import run_inspection_async, warm_up, prefetch_market_data, usable_market_data
+from phonely_ai import deadline
+from phonely_ai.llm_output import node_metrics
+from phonely_ai.tools.browser_pool import browser_pool
+from phonely_ai.tools.price_cache import price_cache
+from phonely_ai.tools.olx_snapshot_cache import olx_snapshot_cache
+from phonely_ai.tools.single_flight import single_flight
+from phonely_ai.tools.http_client import http_client
+from phonely_ai.tools.url_resolver import url_resolver
+from phonely_ai.tools.device_catalog import device_catalog
+from phonely_ai.tools.circuit_breaker import circuit_breakers
+from phonely_ai.job_queue import inspection_queue, QueueFullError
+from phonely_ai.callback_dispatcher import callback_dispatcher
+from phonely_ai.checkpoints import inspection_checkpoints
+from phonely_ai.inspection_registry import inspection_registry, ATTACHED, CACHED
+from phonely_ai.inspection import InspectionRequest, build_inspection_data, finalize_results
+
+# Batch endpoint limits - LLM work across all running batches shares one semaphore,
+# and new batches are rejected (503) once too many batch items are accepted but unfinished
+BATCH_MAX_SIZE = int(os.getenv("INSPECTION_BATCH_MAX_SIZE", "200"))
+BATCH_CONCURRENCY = int(os.getenv("INSPECTION_BATCH_CONCURRENCY", "4"))
+BATCH_MAX_IN_FLIGHT = int(os.getenv("INSPECTION_BATCH_MAX_IN_FLIGHT", "400"))
+batch_semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+batch_tasks: set = set()
+batch_stats: Dict[str, float] = {"in_flight": 0, "finished": 0, "rejected": 0, "run_seconds": 0.0}
+
+# Result of the startup warm-up, reported on /health
+orchestrator_status: Dict[str, Any] = {"ready": False}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start long-lived resources with the service and release them on shutdown"""
+    try:
+        orchestrator_status.update(ready=True, **warm_up())
+        logger.success("✅ Inspection graph and LLM clients ready")
+    except Exception as e:
+        orchestrator_status.update(ready=False, error=str(e))
+        logger.error(f"❌ Orchestrator warm-up failed: {str(e)}")
+    
+    try:
+        await asyncio.to_thread(browser_pool.start)
+    except Exception as e:
+        # The pool starts lazily on the first OLX scrape if warm-up fails here
+        logger.error(f"❌ Failed to start OLX browser pool: {str(e)}")
+    
+    await callback_dispatcher.start(BACKEND_URL, API_KEY)
+    await inspection_queue.start(process_inspection)
+    
+    yield
+    
+    for task in batch_tasks:
+        task.cancel()
+    await asyncio.gather(*batch_tasks, return_exceptions=True)
+    await inspection_queue.stop()
+    await inspection_checkpoints.close()
+    await callback_dispatcher.stop()
+    await http_client.aclose()
+    await asyncio.to_thread(browser_pool.stop)
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Phonely AI Service",
     description="CrewAI-powered phone inspection service with GPT-5.1",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -35,19 +98,24 @@ API_KEY = os.getenv("API_KEY", "fb74a5dd46fde77fa343d4d6b081f4d6")
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3000")
 
 
-class InspectionRequest(BaseModel):
-    """Request model for phone inspection - matches backend payload"""
-    inspection_id: str
-    images: List[str]  # List of image URLs
-    phone_details: Dict[str, Any]  # Contains brand, model, storage, ram, color, condition, hasBox, hasWarranty, launchDate, retailPrice
-    description: str
-
-
 class InspectionResponse(BaseModel):
     """Response model for phone inspection"""
     inspection_id: str
     status: str
     message: str
+    result: Optional[Dict[str, Any]] = None  # Stored result when a duplicate of a finished inspection is re-POSTed
+
+
+class BatchInspectionRequest(BaseModel):
+    """Request model for a batch of inspections (bulk imports, admin re-inspections)"""
+    inspections: List[InspectionRequest]
+
+
+class BatchInspectionResponse(BaseModel):
+    """Response model for a batch - one entry per submitted inspection"""
+    accepted: int
+    groups: int
+    inspections: List[InspectionResponse]
 
 
 @app.get("/")
@@ -69,135 +137,74 @@ async def health():
     return {
         "status": "healthy",
         "engine": "LangGraph + LangChain + CrewAI (gpt-5.1)",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "orchestrator": orchestrator_status,
+        "inspection_queue": inspection_queue.stats(),
+        "batches": {**batch_stats, "max_in_flight": BATCH_MAX_IN_FLIGHT, "concurrency": BATCH_CONCURRENCY},
+        "callbacks": callback_dispatcher.stats(),
+        "inspection_registry": inspection_registry.stats(),
+        "checkpoints": inspection_checkpoints.stats(),
+        "price_cache": price_cache.stats(),
+        "olx_snapshot_cache": olx_snapshot_cache.stats(),
+        "tool_coalescing": single_flight.stats(),
+        "http_client": http_client.stats(),
+        "url_resolver": url_resolver.stats(),
+        "device_catalog": device_catalog.stats(),
+        "circuit_breakers": circuit_breakers.stats(),
+        "llm_nodes": node_metrics.stats(),
+        "olx_browser_pool": browser_pool.stats()
     }
 
 
 async def send_callback(inspection_id: str, callback_data: Dict[str, Any]):
-    """Send results back to backend"""
-    callback_url = f"{BACKEND_URL}/api/v1/inspections/{inspection_id}/callback"
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Add inspection_id to the callback data payload
-            payload = {
-                "inspection_id": inspection_id,
-                **callback_data  # Unpack status, results, processing_time at top level
-            }
-            
-            response = await client.post(
-                callback_url,
-                json=payload,
-                headers={"x-api-key": API_KEY}
-            )
-            
-            if response.status_code == 200:
-                logger.success(f"✅ Callback sent successfully for {inspection_id}")
-            else:
-                logger.error(f"❌ Callback failed: {response.status_code} - {response.text}")
-                
-    except Exception as e:
-        logger.error(f"❌ Callback error for {inspection_id}: {str(e)}")
+    """Queue results for delivery to the backend (durable outbox, retried until delivered)"""
+    # Add inspection_id to the callback data payload
+    payload = {
+        "inspection_id": inspection_id,
+        **callback_data  # Unpack status, results, processing_time at top level
+    }
+    await callback_dispatcher.enqueue(inspection_id, payload)
 
 
-async def process_inspection(request: InspectionRequest):
-    """Background task to process inspection"""
+async def process_inspection(
+    request: InspectionRequest,
+    market_data: Optional[Tuple[Dict[str, str], Dict[str, dict]]] = None
+):
+    """
+    Process one inspection (run by the inspection queue workers and batches)
+    
+    market_data is an optional (tool outputs, timings) pair fetched ahead of
+    time for this phone; pricing then skips its own market data lookups.
+    """
     logger.info(f"🚀 Processing inspection: {request.inspection_id}")
     start_time = datetime.now()
+    inspection_registry.mark_processing(request.inspection_id, request._payload_hash)
     
     try:
-        # Extract phone details
-        pd = request.phone_details
-        brand = pd.get("brand", "Unknown")
-        model = pd.get("model", "Unknown")
-        
-        # Prepare inspection data for LangGraph orchestrator
-        inspection_data = {
-            "images": request.images,
-            "image_urls": ", ".join(request.images),  # LangGraph expects comma-separated string
-            "num_images": len(request.images),
-            "brand": brand,
-            "model": model,
-            "description": request.description,
-            "storage": pd.get("storage", "Unknown"),
-            "ram": pd.get("ram", "Unknown"),
-            "color": pd.get("color", "Unknown"),
-            "has_box": pd.get("hasBox", False),
-            "has_warranty": pd.get("hasWarranty", False),
-            "launch_date": pd.get("launchDate", "2023-01"),
-            "retail_price": pd.get("retailPrice", 0),  # 0 = AI will fetch from WhatMobile/PriceOye tools
-            "age_months": calculate_age_months(pd.get("launchDate", "2023-01")),
-            "pta_approved": pd.get("ptaApproved", True)  # PTA status for Pakistan market
-        }
+        inspection_data = build_inspection_data(request)
+        brand, model = inspection_data["brand"], inspection_data["model"]
+        if market_data:
+            inspection_data["tool_outputs"], inspection_data["source_timings"] = market_data
         
         logger.info(f"   Device: {brand} {model} ({inspection_data['storage']})")
         logger.info(f"   Images: {len(request.images)} images")
         logger.info(f"   Description: {request.description[:50]}...")
         
-        # Run LangGraph orchestrated inspection
-        result = run_inspection(inspection_data)
+        # Run LangGraph orchestrated inspection (async - never blocks the event loop)
+        result = await run_inspection_async(inspection_data)
         
         # Calculate processing time
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds() * 1000  # Convert to ms
         
-        # Extract results from LangGraph response
-        vision_result = result.get('results', {}).get('vision_analysis', {})
-        text_result = result.get('results', {}).get('text_analysis', {})
-        pricing_result = result.get('results', {}).get('pricing_analysis', {})
+        # Extract results from LangGraph response, with fallbacks for anything missing
+        parsed_results = finalize_results(result, inspection_data)
+        pricing_result = parsed_results["pricing_analysis"]
         
         logger.info(f"✅ Inspection completed: {result.get('status', 'unknown')}")
         logger.info(f"   Tools executed: {', '.join(result.get('tools_executed', []))}")
         logger.info(f"   Pricing: PKR {pricing_result.get('suggested_min_price', 0):,}-{pricing_result.get('suggested_max_price', 0):,}")
         
-        # Fallback if any analysis is missing
-        if not vision_result:
-            vision_result = {
-                "condition_score": 7.5,
-                "condition": "Good",
-                "detected_issues": ["Unable to analyze images"],
-                "authenticity": {"score": 85, "is_authentic": True}
-            }
-        
-        if not text_result:
-            text_result = {
-                "description_quality": "fair",
-                "completeness": 50,
-                "missing_information": ["Unable to analyze description"]
-            }
-        
-        if not pricing_result or pricing_result.get("confidence_level") == "low":
-            # Fallback pricing - use WhatMobile/PriceOye data if available
-            # If retail_price is 0 or too low, the pricing agent should have fetched actual price
-            retail_price = inspection_data.get("retail_price", 0)
-            
-            # If retail price is 0 or suspiciously low, log warning
-            if retail_price < 10000:
-                logger.warning(f"⚠️  Retail price too low ({retail_price}), pricing agent should fetch actual price")
-                logger.warning(f"⚠️  This may result in inaccurate pricing estimates")
-                # Use minimum realistic price for budget phones
-                retail_price = 30000
-            
-            age_months = inspection_data.get("age_months", 12)
-            depreciation_factor = max(0.4, 1 - (age_months / 12 * 0.35))  # 35% year 1 for C2C
-            estimated_price = int(retail_price * depreciation_factor)
-            
-            pricing_result = {
-                "suggested_min_price": int(estimated_price * 0.9),
-                "suggested_max_price": int(estimated_price * 1.1),
-                "market_average": estimated_price,
-                "confidence_level": "low",
-                "pta_impact_applied": False
-            }
-            logger.warning(f"⚠️  Using fallback pricing: PKR {pricing_result['suggested_min_price']:,}-{pricing_result['suggested_max_price']:,}")
-        
-        # Structure results in backend's expected format
-        parsed_results = {
-            "vision_analysis": vision_result,
-            "text_analysis": text_result,
-            "pricing_analysis": pricing_result
-        }
-        
         # Prepare results for callback in backend's expected format
         callback_data = {
             "status": result.get("status", "completed"),
@@ -209,49 +216,131 @@ async def process_inspection(request: InspectionRequest):
                 "pricingAgent": round(processing_time * 0.5, 2)
             }),
             "tools_executed": result.get("tools_executed", []),
+            "source_timings": result.get("source_timings", {}),
+            "deadline_exceeded": result.get("deadline_exceeded", False),
             "retries": result.get("retries", {"vision": 0, "text": 0, "pricing": 0})
         }
         
         logger.success(f"✅ Inspection {request.inspection_id} completed successfully")
         logger.info(f"   Processing time: {processing_time:.2f}ms")
         
-        # Send callback to backend
+        # Store the result for duplicate submissions, then send callback to backend
+        if not inspection_registry.finish(request.inspection_id, request._payload_hash, callback_data):
+            logger.warning(f"⚠️  Inspection {request.inspection_id} was re-submitted with a new payload, dropping stale result")
+            return
         await send_callback(request.inspection_id, callback_data)
         
     except Exception as e:
         logger.error(f"❌ Inspection {request.inspection_id} failed: {str(e)}")
         logger.exception(e)  # Full traceback
         
-        # Send error callback
-        await send_callback(request.inspection_id, {
+        # Send error callback (a failed run is retried if the backend re-POSTs it)
+        error_data = {
             "status": "failed",
             "error": str(e)
-        })
+        }
+        if not inspection_registry.finish(request.inspection_id, request._payload_hash, error_data):
+            logger.warning(f"⚠️  Inspection {request.inspection_id} was re-submitted with a new payload, dropping stale error")
+            return
+        await send_callback(request.inspection_id, error_data)
+
+
+def duplicate_response(request: InspectionRequest) -> Optional[InspectionResponse]:
+    """
+    Fingerprint the request and check it against the registry.
+    
+    Returns the response for a duplicate (attached to the running job, or the
+    stored result), or None when the request needs a new run.
+    """
+    request._payload_hash = request.fingerprint()
+    outcome = inspection_registry.check(request.inspection_id, request._payload_hash)
+    if outcome == ATTACHED:
+        logger.info(f"🔁 Duplicate submission of {request.inspection_id}, attached to the running job")
+        return InspectionResponse(
+            inspection_id=request.inspection_id,
+            status="processing",
+            message="Inspection already in progress. Results will be sent via callback."
+        )
+    if outcome == CACHED:
+        logger.info(f"🔁 Duplicate submission of {request.inspection_id}, serving the stored result")
+        record = inspection_registry.get(request.inspection_id)
+        return InspectionResponse(
+            inspection_id=request.inspection_id,
+            status="completed",
+            message="Inspection already completed.",
+            result=record["result"] if record else None
+        )
+    return None
+
 
+def batch_group_key(request: InspectionRequest) -> Tuple[str, str, str]:
+    """Inspections of the same phone share one market data lookup"""
+    pd = request.phone_details
+    return tuple(str(pd.get(field, "Unknown")).strip().lower() for field in ("brand", "model", "storage"))
 
-def calculate_age_months(launch_date: str) -> int:
-    """Calculate device age in months from launch date (YYYY-MM format)"""
+
+async def process_batch_group(requests: List[InspectionRequest]):
+    """Fetch market data once for a group of same-phone inspections, then run them"""
+    pd = requests[0].phone_details
+    brand, model, storage = pd.get("brand", "Unknown"), pd.get("model", "Unknown"), pd.get("storage", "Unknown")
+    
+    market_data = None
     try:
-        year, month = map(int, launch_date.split('-'))
-        now = datetime.now()
-        age_months = (now.year - year) * 12 + (now.month - month)
-        return max(0, age_months)
-    except:
-        return 0
+        # Scraping only - batch slots are kept for the inspections' LLM work
+        outputs, timings = await prefetch_market_data(brand, model, storage)
+        # Share only sources that answered; each inspection re-fetches the ones that timed out or failed
+        outputs = usable_market_data(outputs, timings)
+        if outputs:
+            market_data = (outputs, {name: timings[name] for name in outputs})
+        logger.info(f"📦 Market data for {brand} {model} ({storage}) shared by {len(requests)} inspection(s): "
+                    f"{', '.join(outputs) or 'no source answered'}")
+    except Exception as e:
+        # Each inspection falls back to fetching its own market data
+        logger.error(f"❌ Batch market data prefetch failed for {brand} {model}: {str(e)}")
+    
+    async def run(request: InspectionRequest):
+        try:
+            async with batch_semaphore:
+                # Market data is already shared, so a slot covers the LLM nodes;
+                # callbacks go out as each inspection finishes, not when the batch does
+                start = time.monotonic()
+                await process_inspection(request, market_data)
+                batch_stats["run_seconds"] += time.monotonic() - start
+        finally:
+            batch_stats["in_flight"] -= 1
+            batch_stats["finished"] += 1
+    
+    await asyncio.gather(*(run(request) for request in requests))
+
+
+async def process_batch(groups: Dict[Tuple[str, str, str], List[InspectionRequest]]):
+    """Run every group of a batch (bounded by the shared batch semaphore)"""
+    start_time = datetime.now()
+    await asyncio.gather(*(process_batch_group(requests) for requests in groups.values()))
+    total = sum(len(requests) for requests in groups.values())
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.success(f"✅ Batch of {total} inspection(s) in {len(groups)} group(s) finished in {elapsed:.1f}s")
+
+
+def batch_retry_after(excess: int) -> int:
+    """Estimate (in seconds) when `excess` batch items will have finished, for the Retry-After header"""
+    finished = batch_stats["finished"]
+    avg_run = batch_stats["run_seconds"] / finished if finished else 30.0
+    return max(1, math.ceil(avg_run * excess / BATCH_CONCURRENCY))
 
 
 @app.post("/api/v1/inspection/start", response_model=InspectionResponse)
 async def start_inspection(
     request: InspectionRequest,
-    background_tasks: BackgroundTasks,
     x_api_key: Optional[str] = Header(None)
 ):
     """
     Start a phone inspection using CrewAI agents
     
-    This endpoint receives inspection requests from the backend and runs
-    the Vision, Text, and Pricing agents using GPT-5.1 in the background.
-    Results are sent back to the backend via callback.
+    This endpoint receives inspection requests from the backend and queues
+    the Vision, Text, and Pricing agents using GPT-5.1 on the worker pool.
+    Results are sent back to the backend via callback. Returns 503 with a
+    Retry-After header when the queue is full.
     """
     # Verify API key
     if x_api_key != API_KEY:
@@ -260,14 +349,25 @@ async def start_inspection(
     
     logger.info(f"📱 New inspection request: {request.inspection_id}")
     
-    # Add inspection to background tasks
-    background_tasks.add_task(process_inspection, request)
+    # Re-POSTs of the same payload never start a second pipeline
+    duplicate = duplicate_response(request)
+    if duplicate:
+        return duplicate
     
-    return InspectionResponse(
-        inspection_id=request.inspection_id,
-        status="processing",
-        message="Inspection started. Results will be sent via callback."
-    )
+    request._deadline_at = deadline.new_deadline(request.deadline_seconds)
+    
+    # Queue inspection for the worker pool (bounded - rejects when full)
+    try:
+        inspection_queue.submit(request)
+    except QueueFullError as e:
+        logger.warning(f"⚠️  Inspection queue full, rejecting {request.inspection_id} (retry after {e.retry_after}s)")
+        raise HTTPException(
+            status_code=503,
+            detail="Inspection queue is full. Please retry later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    inspection_registry.register(request.inspection_id, request._payload_hash)
     
     return InspectionResponse(
         inspection_id=request.inspection_id,
@@ -276,6 +376,93 @@ async def start_inspection(
     )
 
 
+@app.post("/api/v1/inspection/batch", response_model=BatchInspectionResponse)
+async def start_inspection_batch(
+    batch: BatchInspectionRequest,
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Start many inspections at once (bulk listing imports, admin re-inspections)
+    
+    Inspections of the same brand, model and storage share one market data
+    lookup. LLM work runs with bounded concurrency (INSPECTION_BATCH_CONCURRENCY)
+    outside the single-inspection queue, and each result is sent via callback
+    as soon as it finishes. Duplicates are handled as in /start. Returns 503
+    with a Retry-After header when the batch would take the number of
+    unfinished batch inspections past INSPECTION_BATCH_MAX_IN_FLIGHT.
+    """
+    if x_api_key != API_KEY:
+        logger.warning("❌ Invalid API key attempt for inspection batch")
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    if len(batch.inspections) > BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_SIZE} inspections)")
+    
+    responses: List[Optional[InspectionResponse]] = []
+    new_requests: List[InspectionRequest] = []
+    for request in batch.inspections:
+        duplicate = duplicate_response(request)
+        responses.append(duplicate)
+        if not duplicate:
+            new_requests.append(request)
+    
+    # Bounded like the single-inspection queue: all of the batch is accepted or none of it
+    excess = batch_stats["in_flight"] + len(new_requests) - BATCH_MAX_IN_FLIGHT
+    if new_requests and excess > 0:
+        batch_stats["rejected"] += len(new_requests)
+        retry_after = batch_retry_after(excess)
+        logger.warning(f"⚠️  Too many batch inspections in flight, rejecting batch of {len(new_requests)} (retry after {retry_after}s)")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many batch inspections in progress. Please retry later.",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    groups: Dict[Tuple[str, str, str], List[InspectionRequest]] = {}
+    for request in new_requests:
+        # The deadline starts when the item runs, so waiting on the batch semaphore does not eat into it
+        inspection_registry.register(request.inspection_id, request._payload_hash)
+        groups.setdefault(batch_group_key(request), []).append(request)
+    responses = [
+        response or InspectionResponse(
+            inspection_id=request.inspection_id,
+            status="processing",
+            message="Inspection started as part of a batch. Results will be sent via callback."
+        )
+        for request, response in zip(batch.inspections, responses)
+    ]
+    
+    accepted = len(new_requests)
+    batch_stats["in_flight"] += accepted
+    logger.info(f"📚 New inspection batch: {accepted} accepted in {len(groups)} group(s), {len(responses) - accepted} duplicate(s)")
+    
+    if groups:
+        task = asyncio.create_task(process_batch(groups))
+        batch_tasks.add(task)
+        task.add_done_callback(batch_tasks.discard)
+    
+    return BatchInspectionResponse(accepted=accepted, groups=len(groups), inspections=responses)
+
+
+@app.get("/api/v1/inspection/{inspection_id}")
+async def get_inspection(
+    inspection_id: str,
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Status of an inspection and, once finished, its stored result
+    
+    Served from the inspection registry - never re-runs anything.
+    """
+    if x_api_key != API_KEY:
+        logger.warning(f"❌ Invalid API key attempt for inspection {inspection_id}")
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    
+    record = inspection_registry.get(inspection_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Inspection not found")
+    return record
+
+
 def start_server():
     """Start the FastAPI server"""
     port = int(os.getenv("PORT", "8000"))
@@ -287,6 +474,8 @@ def start_server():
     logger.info(f"🤖 Engine: CrewAI + GPT-5.1")
     logger.info(f"📡 Host: {host}:{port}")
     logger.info(f"📍 API Endpoint: POST /api/v1/inspection/start")
+    logger.info(f"📍 Batch Endpoint: POST /api/v1/inspection/batch")
+    logger.info(f"📍 Status Endpoint: GET /api/v1/inspection/{{inspection_id}}")
     logger.info(f"🔑 API Key: {API_KEY[:20]}...")
     logger.info("="*60)
     
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Offline backfill / re-inspection pipeline
+
+Streams inspection requests (one backend payload per line, the same JSON the
+backend POSTs to /api/v1/inspection/start) from a JSONL file, runs them
+through the LangGraph orchestrator with bounded concurrency, and appends one
+JSON line per inspection to the output file, with per-item timings.
+
+The output file doubles as the checkpoint: ids already in it are skipped on
+the next run, so a crashed or interrupted backfill resumes where it left off.
+Typical use is repricing the whole catalog after the pricing formula changes:
+
+    backfill inspections.jsonl repriced.jsonl --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from phonely_ai.checkpoints import inspection_checkpoints
+from phonely_ai.inspection import InspectionRequest, build_inspection_data, finalize_results
+from phonely_ai.langgraph_orchestrator import run_inspection_async
+from phonely_ai.tools.browser_pool import browser_pool
+from phonely_ai.tools.http_client import http_client
+
+
+DEFAULT_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+
+
+# ============================================================================
+# Checkpoint
+# ============================================================================
+
+def load_checkpoint(output: Path, retry_failed: bool = False) -> Set[str]:
+    """
+    Ids already written to the output file. A partial last line left by a
+    crash is truncated away; with retry_failed, items that did not complete are re-run.
+    """
+    done: Dict[str, str] = {}
+    if not output.exists():
+        return set()
+
+    valid_bytes = 0
+    with output.open("rb") as f:
+        for raw in f:
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            valid_bytes += len(raw)
+            # A later line for the same id (a retried failure) wins
+            done[record["inspection_id"]] = record.get("status", "")
+
+    if valid_bytes < output.stat().st_size:
+        print(f"⚠️  Truncating incomplete last line of {output}")
+        with output.open("r+b") as f:
+            f.truncate(valid_bytes)
+
+    return {
+        inspection_id for inspection_id, status in done.items()
+        if not (retry_failed and status != "completed")
+    }
+
+
+def read_requests(path: Path) -> Iterator[Tuple[int, Optional[InspectionRequest], str]]:
+    """Yield (line number, request or None, error) for every non-blank input line"""
+    with path.open("r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, InspectionRequest.model_validate(json.loads(line)), ""
+            except ValueError as e:
+                yield line_number, None, str(e).splitlines()[0]
+
+
+# ============================================================================
+# Backfill
+# ============================================================================
+
+async def inspect_one(request: InspectionRequest, deadline_seconds: Optional[float]) -> Dict[str, Any]:
+    """Run one inspection and return its output record"""
+    if deadline_seconds is not None and request.deadline_seconds is None:
+        request.deadline_seconds = deadline_seconds
+
+    started_at = datetime.now().isoformat()
+    start = time.perf_counter()
+    try:
+        inspection_data = build_inspection_data(request)
+        result = await run_inspection_async(inspection_data)
+        # Same fallbacks as the API callback, so backfilled results are comparable
+        result["results"] = finalize_results(result, inspection_data)
+    except Exception as e:
+        result = {"status": "failed", "error": str(e)}
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "inspection_id": request.inspection_id,
+        "status": result.get("status", "failed"),
+        "brand": request.phone_details.get("brand"),
+        "model": request.phone_details.get("model"),
+        "storage": request.phone_details.get("storage"),
+        "results": result.get("results", {}),
+        "error": result.get("error"),
+        "timings": {
+            "started_at": started_at,
+            "total_ms": round(elapsed_ms, 2),
+            "sources": result.get("source_timings", {})
+        },
+        "deadline_exceeded": result.get("deadline_exceeded", False),
+        "retries": result.get("retries", {})
+    }
+
+
+async def backfill(
+    input_path: Path,
+    output_path: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limit: Optional[int] = None,
+    retry_failed: bool = False,
+    deadline_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """Process every not-yet-done input line; returns summary counters"""
+    done = load_checkpoint(output_path, retry_failed)
+    counts = {"skipped": 0, "invalid": 0, "completed": 0, "failed": 0}
+    start = time.perf_counter()
+    print(f"🚚 Backfill {input_path} -> {output_path} ({len(done)} already done, concurrency {concurrency})")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    pending: Set[asyncio.Task] = set()
+    started = 0
+
+    with output_path.open("a", encoding="utf-8") as output:
+        def write(record: Dict[str, Any]):
+            # One flushed line per item - the output is the checkpoint
+            output.write(json.dumps(record, default=str) + "\n")
+            output.flush()
+            counts["completed" if record["status"] == "completed" else "failed"] += 1
+            processed = counts["completed"] + counts["failed"]
+            print(f"{'✅' if record['status'] == 'completed' else '❌'} [{processed}] {record['inspection_id']} "
+                  f"{record['status']} in {record['timings']['total_ms'] / 1000:.1f}s")
+
+        async def drain(until: int):
+            nonlocal pending
+            while len(pending) > until:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    write(task.result())
+
+        for line_number, request, error in read_requests(input_path):
+            if request is None:
+                counts["invalid"] += 1
+                print(f"⚠️  Line {line_number}: invalid inspection request - {error}")
+                continue
+            if request.inspection_id in done:
+                counts["skipped"] += 1
+                continue
+            if limit is not None and started >= limit:
+                break
+
+            # Stream the input: never hold more than `concurrency` items in flight
+            await drain(concurrency - 1)
+            done.add(request.inspection_id)
+            pending.add(asyncio.create_task(inspect_one(request, deadline_seconds)))
+            started += 1
+
+        await drain(0)
+
+    counts["elapsed_seconds"] = round(time.perf_counter() - start, 1)
+    return counts
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        return await backfill(
+            args.input,
+            args.output,
+            concurrency=max(1, args.concurrency),
+            limit=args.limit,
+            retry_failed=args.retry_failed,
+            deadline_seconds=args.deadline_seconds
+        )
+    finally:
+        await inspection_checkpoints.close()
+        await http_client.aclose()
+        await asyncio.to_thread(browser_pool.stop)
+
+
+def main():
+    """CLI to re-run inspections over a JSONL file of backend payloads"""
+    parser = argparse.ArgumentParser(prog="backfill", description="Re-run inspections from a JSONL file (resumable)")
+    parser.add_argument("input", type=Path, help="JSONL file, one inspection request per line")
+    parser.add_argument("output", type=Path, help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Inspections in flight at once")
+    parser.add_argument("--limit", type=int, help="Stop after starting this many inspections")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-run items that failed in a previous run")
+    parser.add_argument("--deadline-seconds", type=float, help="Per-inspection time budget (default: service default)")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"❌ Input file not found: {args.input}")
+        sys.exit(1)
+
+    try:
+        summary = asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted - rerun the same command to resume")
+        sys.exit(130)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
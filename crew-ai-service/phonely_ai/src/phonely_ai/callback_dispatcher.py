@@ -0,0 +1,294 @@
+"""
+Reliable callback delivery to the backend
+
+Finished inspections are written to an on-disk outbox first and then sent
+by a background sender over one long-lived pooled HTTP client. Failed sends
+are retried with exponential backoff and full jitter; anything still in the
+outbox when the service stops is replayed at the next startup, so a slow or
+restarting backend no longer loses results. A newer callback for the same
+inspection replaces one still waiting to be sent, and callbacks that were
+given up on are kept for CALLBACK_DEAD_LETTER_TTL for inspection, then pruned.
+
+If CALLBACK_BATCH_URL is set, due callbacks are POSTed together as
+{"callbacks": [...]} instead of one request each.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from phonely_ai.tools.price_cache import CACHE_DIR
+
+
+MAX_ATTEMPTS = int(os.getenv("CALLBACK_MAX_ATTEMPTS", "8"))
+BACKOFF_BASE_SECONDS = float(os.getenv("CALLBACK_BACKOFF_BASE", "1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("CALLBACK_BACKOFF_MAX", "300"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("CALLBACK_TIMEOUT", "30"))
+CONCURRENCY = int(os.getenv("CALLBACK_CONCURRENCY", "8"))
+BATCH_URL = os.getenv("CALLBACK_BATCH_URL", "")
+BATCH_SIZE = int(os.getenv("CALLBACK_BATCH_SIZE", "20"))
+DEAD_LETTER_TTL_SECONDS = float(os.getenv("CALLBACK_DEAD_LETTER_TTL", str(7 * 24 * 3600)))
+
+# Client errors that may succeed later; any other 4xx is a permanent rejection
+RETRYABLE_STATUS = {408, 409, 425, 429}
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter for the given number of failed attempts"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempts)))
+
+
+class CallbackDispatcher:
+    """
+    Durable outbox plus background sender for backend callbacks.
+
+    Must be started from inside the event loop that will send (the FastAPI lifespan).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else CACHE_DIR / "callback_outbox.sqlite3"
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._backend_url = ""
+        self._api_key = ""
+
+        # Stats
+        self._enqueued = 0
+        self._delivered = 0
+        self._retries = 0
+        self._dead = 0
+        self._batches = 0
+        self._replayed = 0
+        self._superseded = 0
+        self._pruned = 0
+
+    # ------------------------------------------------------------------
+    # Outbox storage
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    inspection_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_error TEXT,
+                    dead INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def _prune(self, now: float):
+        if now - self._last_prune < 3600:
+            return
+        self._last_prune = now
+        # next_attempt_at of a dead row is roughly when it was given up on
+        removed = self._conn().execute(
+            "DELETE FROM outbox WHERE dead = 1 AND next_attempt_at < ?", (now - DEAD_LETTER_TTL_SECONDS,)
+        ).rowcount
+        self._conn().commit()
+        if removed:
+            self._pruned += removed
+            logger.info(f"🧹 Pruned {removed} expired dead callback(s)")
+
+    def _due(self, limit: int) -> List[Tuple[int, str, Dict[str, Any], int]]:
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT id, inspection_id, payload, attempts FROM outbox "
+                "WHERE dead = 0 AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        return [(row[0], row[1], json.loads(row[2]), row[3]) for row in rows]
+
+    def _next_due_in(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn().execute("SELECT MIN(next_attempt_at) FROM outbox WHERE dead = 0").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def _mark_delivered(self, ids: List[int]):
+        with self._lock:
+            self._conn().executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in ids])
+            self._conn().commit()
+        self._delivered += len(ids)
+
+    def _mark_failed(self, row_id: int, inspection_id: str, attempts: int, error: str, retryable: bool):
+        attempts += 1
+        dead = not retryable or attempts >= MAX_ATTEMPTS
+        with self._lock:
+            self._conn().execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, dead = ? WHERE id = ?",
+                (attempts, time.time() + backoff_delay(attempts), error[:500], int(dead), row_id)
+            )
+            self._conn().commit()
+        if dead:
+            self._dead += 1
+            logger.error(f"❌ Callback for {inspection_id} given up after {attempts} attempt(s): {error}")
+        else:
+            self._retries += 1
+            logger.warning(f"⚠️  Callback for {inspection_id} failed (attempt {attempts}/{MAX_ATTEMPTS}), will retry: {error}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self, backend_url: str, api_key: str):
+        """Open the pooled client and start the sender (replays anything left in the outbox)"""
+        if self._sender is not None:
+            return
+        self._backend_url = backend_url.rstrip("/")
+        self._api_key = api_key
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+        )
+        self._wakeup = asyncio.Event()
+
+        with self._lock:
+            pending = self._conn().execute("SELECT COUNT(*) FROM outbox WHERE dead = 0").fetchone()[0]
+            # Replay immediately rather than waiting out backoff from the previous run
+            self._conn().execute("UPDATE outbox SET next_attempt_at = ? WHERE dead = 0", (time.time(),))
+            self._conn().commit()
+        self._replayed = pending
+        if pending:
+            logger.info(f"📬 Replaying {pending} undelivered callback(s) from the outbox")
+
+        self._sender = asyncio.create_task(self._run(), name="callback-dispatcher")
+        logger.info(f"📮 Callback dispatcher started ({'batched via ' + BATCH_URL if BATCH_URL else 'one request per callback'})")
+
+    async def stop(self):
+        """Stop sending; undelivered callbacks stay in the outbox for the next start"""
+        if self._sender is not None:
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+            self._sender = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, inspection_id: str, payload: Dict[str, Any]):
+        """Persist a callback to the outbox and wake the sender"""
+        now = time.time()
+        await asyncio.to_thread(self._insert, inspection_id, payload, now)
+        self._enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _insert(self, inspection_id: str, payload: Dict[str, Any], now: float):
+        with self._lock:
+            # Only the latest result for an inspection is worth delivering
+            superseded = self._conn().execute(
+                "DELETE FROM outbox WHERE inspection_id = ? AND dead = 0", (inspection_id,)
+            ).rowcount
+            self._conn().execute(
+                "INSERT INTO outbox (inspection_id, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                (inspection_id, json.dumps(payload), now, now)
+            )
+            self._conn().commit()
+            self._prune(now)
+        if superseded:
+            self._superseded += superseded
+            logger.info(f"♻️  Replaced {superseded} undelivered callback(s) for {inspection_id}")
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                due = await asyncio.to_thread(self._due, BATCH_SIZE if BATCH_URL else CONCURRENCY)
+                if due:
+                    if BATCH_URL and len(due) > 1:
+                        await self._send_batch(due)
+                    else:
+                        await asyncio.gather(*(self._send_one(*item) for item in due))
+                    continue
+                wait = await asyncio.to_thread(self._next_due_in)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Callback dispatcher error: {str(e)}")
+                wait = 5.0
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _post(self, url: str, body: Dict[str, Any]) -> Tuple[bool, bool, str]:
+        """POST and classify the outcome as (delivered, retryable, error)"""
+        try:
+            response = await self._client.post(url, json=body, headers={"x-api-key": self._api_key})
+        except httpx.HTTPError as e:
+            return False, True, f"{type(e).__name__}: {str(e)}"
+        if response.is_success:
+            return True, False, ""
+        retryable = response.status_code >= 500 or response.status_code in RETRYABLE_STATUS
+        return False, retryable, f"HTTP {response.status_code} - {response.text[:200]}"
+
+    async def _send_one(self, row_id: int, inspection_id: str, payload: Dict[str, Any], attempts: int):
+        url = f"{self._backend_url}/api/v1/inspections/{inspection_id}/callback"
+        delivered, retryable, error = await self._post(url, payload)
+        if delivered:
+            await asyncio.to_thread(self._mark_delivered, [row_id])
+            logger.success(f"✅ Callback sent successfully for {inspection_id}")
+        else:
+            await asyncio.to_thread(self._mark_failed, row_id, inspection_id, attempts, error, retryable)
+
+    async def _send_batch(self, due: List[Tuple[int, str, Dict[str, Any], int]]):
+        self._batches += 1
+        delivered, retryable, error = await self._post(BATCH_URL, {"callbacks": [item[2] for item in due]})
+        if delivered:
+            await asyncio.to_thread(self._mark_delivered, [item[0] for item in due])
+            logger.success(f"✅ Callback batch of {len(due)} sent successfully")
+            return
+        for row_id, inspection_id, _, attempts in due:
+            await asyncio.to_thread(self._mark_failed, row_id, inspection_id, attempts, error, retryable)
+
+    def stats(self) -> Dict[str, Any]:
+        """Outbox depth and delivery counters"""
+        with self._lock:
+            pending, dead = self._conn().execute(
+                "SELECT COALESCE(SUM(dead = 0), 0), COALESCE(SUM(dead = 1), 0) FROM outbox"
+            ).fetchone()
+        return {
+            "running": self._sender is not None,
+            "batch_url": BATCH_URL or None,
+            "pending": pending,
+            "dead_letters": dead,
+            "enqueued": self._enqueued,
+            "delivered": self._delivered,
+            "retries": self._retries,
+            "given_up": self._dead,
+            "batches": self._batches,
+            "replayed_at_startup": self._replayed,
+            "superseded": self._superseded,
+            "dead_letters_pruned": self._pruned
+        }
+
+
+# Process-wide dispatcher used by the API
+callback_dispatcher = CallbackDispatcher()
@@ -0,0 +1,149 @@
+"""
+Persistent LangGraph checkpoints for inspections
+
+The compiled graph checkpoints its state to a local SQLite file after every
+step, keyed by thread_id = "{inspection_id}:{payload hash}". When the same
+inspection is re-submitted after a failure, or restarted after a crash, the
+orchestrator restores the steps that already completed (vision, text, market data) from the last
+checkpoint and only re-runs the rest - the expensive vision call is not
+repeated just because pricing failed.
+
+Checkpoints of completed inspections are deleted straight away; abandoned ones
+are pruned once they are older than INSPECTION_CHECKPOINT_TTL.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from loguru import logger
+
+from phonely_ai.tools.price_cache import CACHE_DIR
+
+
+CHECKPOINTS_ENABLED = os.getenv("INSPECTION_CHECKPOINTS", "true").lower() in ("1", "true", "yes")
+CHECKPOINT_TTL_SECONDS = float(os.getenv("INSPECTION_CHECKPOINT_TTL", str(24 * 3600)))
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class InspectionCheckpoints:
+    """
+    One AsyncSqliteSaver per event loop (aiosqlite connections are loop-bound),
+    plus a small table tracking when each inspection thread was last used.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else CACHE_DIR / "graph_checkpoints.sqlite3"
+        self._savers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = weakref.WeakKeyDictionary()
+        self._last_prune = 0.0
+
+        # Stats
+        self._resumed = 0
+        self._completed = 0
+        self._pruned = 0
+        self._errors = 0
+
+    async def _open(self) -> AsyncSqliteSaver:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = await aiosqlite.connect(str(self.path))
+        await conn.execute("PRAGMA journal_mode=WAL")
+        saver = AsyncSqliteSaver(conn)
+        await saver.setup()
+        async with saver.lock:
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS inspection_threads (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+            )
+            await conn.commit()
+        logger.info(f"💾 Inspection checkpoints at {self.path}")
+        return saver
+
+    async def saver(self) -> Optional[AsyncSqliteSaver]:
+        """Checkpointer for the running event loop, or None when checkpointing is off or unavailable"""
+        if not CHECKPOINTS_ENABLED:
+            return None
+        loop = asyncio.get_running_loop()
+        task = self._savers.get(loop)
+        if task is None:
+            # Concurrent first callers share one open
+            task = self._savers[loop] = asyncio.ensure_future(self._open())
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            self._savers.pop(loop, None)
+            self._errors += 1
+            logger.error(f"❌ Inspection checkpoints unavailable, running without: {str(e)}")
+            return None
+
+    async def touch(self, saver: AsyncSqliteSaver, thread_id: str):
+        """Mark a thread as in use (and prune abandoned threads at most hourly)"""
+        now = time.time()
+        async with saver.lock:
+            await saver.conn.execute(
+                "INSERT OR REPLACE INTO inspection_threads (thread_id, updated_at) VALUES (?, ?)", (thread_id, now)
+            )
+            await saver.conn.commit()
+        if now - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            self._last_prune = now
+            await self.prune(saver)
+
+    async def delete(self, saver: AsyncSqliteSaver, thread_id: str):
+        """Drop every checkpoint of a thread"""
+        await saver.adelete_thread(thread_id)
+        async with saver.lock:
+            await saver.conn.execute("DELETE FROM inspection_threads WHERE thread_id = ?", (thread_id,))
+            await saver.conn.commit()
+
+    async def prune(self, saver: AsyncSqliteSaver) -> int:
+        """Delete threads not used for CHECKPOINT_TTL_SECONDS; returns how many"""
+        async with saver.lock:
+            async with saver.conn.execute(
+                "SELECT thread_id FROM inspection_threads WHERE updated_at < ?",
+                (time.time() - CHECKPOINT_TTL_SECONDS,)
+            ) as cursor:
+                expired = [row[0] for row in await cursor.fetchall()]
+        for thread_id in expired:
+            await self.delete(saver, thread_id)
+        if expired:
+            self._pruned += len(expired)
+            logger.info(f"🧹 Pruned {len(expired)} expired inspection checkpoint(s)")
+        return len(expired)
+
+    def record(self, resumed: bool = False, completed: bool = False):
+        if resumed:
+            self._resumed += 1
+        if completed:
+            self._completed += 1
+
+    def opened(self) -> Optional[AsyncSqliteSaver]:
+        """The running loop's checkpointer if it is already open (never opens one)"""
+        task = self._savers.get(asyncio.get_running_loop())
+        if task is not None and task.done() and not task.cancelled() and task.exception() is None:
+            return task.result()
+        return None
+
+    async def close(self):
+        """Close the running loop's connection (on shutdown, or when a run_sync loop ends)"""
+        saver = self.opened()
+        self._savers.pop(asyncio.get_running_loop(), None)
+        if saver is not None:
+            await saver.conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": CHECKPOINTS_ENABLED,
+            "path": str(self.path),
+            "ttl_seconds": CHECKPOINT_TTL_SECONDS,
+            "resumed": self._resumed,
+            "completed": self._completed,
+            "pruned": self._pruned,
+            "errors": self._errors
+        }
+
+
+# Process-wide checkpoint store used by the orchestrator
+inspection_checkpoints = InspectionCheckpoints()
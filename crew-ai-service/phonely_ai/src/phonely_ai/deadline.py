@@ -0,0 +1,98 @@
+"""
+Per-inspection deadline budget
+
+Each inspection gets an absolute deadline (wall-clock epoch seconds) when it
+starts. It is stored in the graph state as `deadline_at` and in a context
+variable, so graph nodes and the scraper tools they call can size their own
+timeouts from whatever budget is left instead of fixed worst-case values.
+
+Work shared by several inspections (a coalesced tool lookup) runs under a
+SharedDeadline: the latest deadline among the callers waiting on it.
+"""
+
+import contextvars
+import os
+import time
+from typing import Optional, Union
+
+
+# Service default; requests may override it with `deadline_seconds`
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("INSPECTION_DEADLINE_SECONDS", "120"))
+
+# Never let a single request ask for more than this
+MAX_DEADLINE_SECONDS = float(os.getenv("INSPECTION_MAX_DEADLINE_SECONDS", "300"))
+
+
+
+class SharedDeadline:
+    """
+    Deadline of work shared by several callers - the latest of their
+    deadlines, or none at all once a caller without a deadline joins.
+    """
+
+    def __init__(self, deadline_at: Optional[float]):
+        self.deadline_at = deadline_at
+
+    def join(self, deadline_at: Optional[float]):
+        """A caller with this deadline now waits on the shared work too"""
+        if self.deadline_at is not None:
+            self.deadline_at = None if deadline_at is None else max(self.deadline_at, deadline_at)
+
+
+_deadline_at: contextvars.ContextVar[Union[float, SharedDeadline, None]] = contextvars.ContextVar(
+    "inspection_deadline_at", default=None
+)
+
+
+def new_deadline(seconds: Optional[float] = None) -> float:
+    """Absolute deadline for an inspection starting now"""
+    seconds = DEFAULT_DEADLINE_SECONDS if seconds is None else min(float(seconds), MAX_DEADLINE_SECONDS)
+    return time.time() + seconds
+
+
+def set_deadline(deadline_at: Union[float, SharedDeadline, None]) -> contextvars.Token:
+    """Make deadline_at the deadline for the current context (and tasks spawned from it)"""
+    return _deadline_at.set(deadline_at)
+
+
+def reset_deadline(token: contextvars.Token):
+    _deadline_at.reset(token)
+
+
+def current() -> Optional[float]:
+    """Absolute deadline of the current context, or None when there is none"""
+    deadline_at = _deadline_at.get()
+    if isinstance(deadline_at, SharedDeadline):
+        return deadline_at.deadline_at
+    return deadline_at
+
+
+def remaining(deadline_at: Optional[float] = None) -> Optional[float]:
+    """Seconds left before the deadline (never negative), or None when there is no deadline"""
+    if deadline_at is None:
+        deadline_at = current()
+    if deadline_at is None:
+        return None
+    return max(0.0, deadline_at - time.time())
+
+
+def expired(deadline_at: Optional[float] = None) -> bool:
+    """True once the deadline has passed"""
+    left = remaining(deadline_at)
+    return left is not None and left <= 0
+
+
+def budget(cap: float, reserve: float = 0.0, deadline_at: Optional[float] = None) -> float:
+    """
+    Timeout for one step: the step's own cap, shortened to fit the remaining
+    budget minus `reserve` seconds kept back for later steps.
+    """
+    left = remaining(deadline_at)
+    if left is None:
+        return cap
+    return max(0.0, min(cap, left - reserve))
+
+
+def call_timeout(cap: float, floor: float = 1.0) -> float:
+    """Timeout for one network call: `cap`, shortened to the remaining budget but never below `floor`"""
+    return max(floor, budget(cap))
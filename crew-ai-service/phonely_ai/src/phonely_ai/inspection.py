@@ -0,0 +1,120 @@
+"""
+Inspection request model and result post-processing
+
+Shared by the API and the offline backfill, so both build the orchestrator
+input and fill in missing or low-confidence results the same way. Nothing
+here touches the web app or its module-level state.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, PrivateAttr
+
+from phonely_ai import deadline
+from phonely_ai.inspection_registry import payload_hash
+from phonely_ai.langgraph_orchestrator import fallback_pricing
+from phonely_ai.tools.device_catalog import device_catalog
+
+
+class InspectionRequest(BaseModel):
+    """Request model for phone inspection - matches backend payload"""
+    inspection_id: str
+    images: List[str]  # List of image URLs
+    phone_details: Dict[str, Any]  # Contains brand, model, storage, ram, color, condition, hasBox, hasWarranty, launchDate, retailPrice
+    description: str
+    deadline_seconds: Optional[float] = None  # Overall time budget; defaults to INSPECTION_DEADLINE_SECONDS
+
+    # Absolute deadline, fixed when the request is accepted so queueing time counts against it
+    _deadline_at: Optional[float] = PrivateAttr(default=None)
+
+    # Fingerprint of the payload, used to recognise re-POSTs of the same inspection
+    _payload_hash: str = PrivateAttr(default="")
+
+    def fingerprint(self) -> str:
+        """Hash of everything that affects the result (the deadline does not)"""
+        return payload_hash(self.model_dump(exclude={"deadline_seconds"}))
+
+
+def calculate_age_months(launch_date: str) -> int:
+    """Calculate device age in months from launch date (YYYY-MM format)"""
+    try:
+        year, month = map(int, launch_date.split('-'))
+        now = datetime.now()
+        age_months = (now.year - year) * 12 + (now.month - month)
+        return max(0, age_months)
+    except:
+        return 0
+
+
+def build_inspection_data(request: InspectionRequest) -> Dict[str, Any]:
+    """Convert a backend inspection request into the LangGraph orchestrator's input"""
+    # Extract phone details
+    pd = request.phone_details
+    brand = pd.get("brand", "Unknown")
+    model = pd.get("model", "Unknown")
+
+    # Backend may omit the launch date - the offline catalog usually knows it
+    launch_date = pd.get("launchDate") or device_catalog.launch_date(brand, model) or "2023-01"
+
+    # Prepare inspection data for LangGraph orchestrator
+    return {
+        "inspection_id": request.inspection_id,  # Checkpoint thread - a re-run resumes where this one stopped
+        "payload_hash": request._payload_hash or request.fingerprint(),  # ... of this payload only
+        "images": request.images,
+        "image_urls": ", ".join(request.images),  # LangGraph expects comma-separated string
+        "num_images": len(request.images),
+        "brand": brand,
+        "model": model,
+        "description": request.description,
+        "storage": pd.get("storage", "Unknown"),
+        "ram": pd.get("ram", "Unknown"),
+        "color": pd.get("color", "Unknown"),
+        "has_box": pd.get("hasBox", False),
+        "has_warranty": pd.get("hasWarranty", False),
+        "launch_date": launch_date,
+        "retail_price": pd.get("retailPrice", 0),  # 0 = AI will fetch from WhatMobile/PriceOye tools
+        "age_months": calculate_age_months(launch_date),
+        "pta_approved": pd.get("ptaApproved", True),  # PTA status for Pakistan market
+        "deadline_at": request._deadline_at or deadline.new_deadline(request.deadline_seconds)
+    }
+
+
+def finalize_results(result: Dict[str, Any], inspection_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Backend-format results from an orchestrator run: missing analyses get
+    neutral defaults and missing or low-confidence pricing uses the formula.
+    """
+    vision_result = result.get('results', {}).get('vision_analysis', {})
+    text_result = result.get('results', {}).get('text_analysis', {})
+    pricing_result = result.get('results', {}).get('pricing_analysis', {})
+
+    # Fallback if any analysis is missing
+    if not vision_result:
+        vision_result = {
+            "condition_score": 7.5,
+            "condition": "Good",
+            "detected_issues": ["Unable to analyze images"],
+            "authenticity": {"score": 85, "is_authentic": True}
+        }
+
+    if not text_result:
+        text_result = {
+            "description_quality": "fair",
+            "completeness": 50,
+            "missing_information": ["Unable to analyze description"]
+        }
+
+    if not pricing_result or pricing_result.get("confidence_level") == "low":
+        pricing_result = fallback_pricing(
+            inspection_data.get("retail_price", 0),
+            inspection_data.get("age_months", 12)
+        )
+        logger.warning(f"⚠️  Using fallback pricing: PKR {pricing_result['suggested_min_price']:,}-{pricing_result['suggested_max_price']:,}")
+
+    return {
+        "vision_analysis": vision_result,
+        "text_analysis": text_result,
+        "pricing_analysis": pricing_result
+    }
@@ -0,0 +1,210 @@
+"""
+Inspection registry - idempotent submission by inspection_id
+
+The backend may re-POST the same inspection after a timeout. Each submission
+is fingerprinted by a hash of its payload; a duplicate of a job that is still
+queued or running attaches to it, a duplicate of a finished job is answered
+from the stored result, and only a changed payload (or a retry of a failed
+run) starts a new pipeline. Records live in SQLite next to the other caches,
+so finished results survive restarts until INSPECTION_REGISTRY_TTL expires.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from phonely_ai.tools.price_cache import CACHE_DIR
+
+
+# How long finished inspections are kept for GET /api/v1/inspection/{id} and dedup
+RECORD_TTL_SECONDS = float(os.getenv("INSPECTION_REGISTRY_TTL", str(7 * 24 * 3600)))
+
+# Statuses of a job that is live in this process
+ACTIVE_STATUSES = ("queued", "processing")
+
+# Submission outcomes returned by check()
+NEW = "new"
+ATTACHED = "attached"
+CACHED = "cached"
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """Stable fingerprint of an inspection payload (key order does not matter)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class InspectionRegistry:
+    """Status and result of every inspection seen recently, keyed by inspection_id"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else CACHE_DIR / "inspections.sqlite3"
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+        # Jobs queued or running in this process: inspection_id -> payload hash
+        self._active: Dict[str, str] = {}
+
+        # Stats
+        self._new = 0
+        self._attached = 0
+        self._cached = 0
+        self._changed = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS inspections (
+                    inspection_id TEXT PRIMARY KEY,
+                    payload_hash TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            # Anything still live in the file belonged to a previous process
+            interrupted = self._db.execute(
+                "UPDATE inspections SET status = 'interrupted' WHERE status IN (?, ?)", ACTIVE_STATUSES
+            ).rowcount
+            self._db.commit()
+            if interrupted:
+                logger.warning(f"⚠️  {interrupted} inspection(s) were interrupted by the last shutdown")
+        return self._db
+
+    def _prune(self, now: float):
+        if now - self._last_prune < 3600:
+            return
+        self._last_prune = now
+        removed = self._conn().execute(
+            "DELETE FROM inspections WHERE finished_at IS NOT NULL AND finished_at < ?",
+            (now - RECORD_TTL_SECONDS,)
+        ).rowcount
+        self._conn().commit()
+        if removed:
+            logger.info(f"🧹 Pruned {removed} expired inspection record(s)")
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def check(self, inspection_id: str, digest: str) -> str:
+        """
+        Decide what a submission should do: NEW (run it), ATTACHED (the same
+        payload is already queued or running) or CACHED (the same payload
+        already completed - serve the stored result).
+        """
+        if self._active.get(inspection_id) == digest:
+            self._attached += 1
+            return ATTACHED
+
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT payload_hash, status FROM inspections WHERE inspection_id = ?", (inspection_id,)
+            ).fetchone()
+        if row and row[0] == digest and row[1] == "completed":
+            self._cached += 1
+            return CACHED
+        if row and row[0] != digest:
+            self._changed += 1
+        return NEW
+
+    def register(self, inspection_id: str, digest: str):
+        """Record a newly accepted submission as queued (replaces any older run of the id)"""
+        now = time.time()
+        self._active[inspection_id] = digest
+        self._new += 1
+        with self._lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO inspections (inspection_id, payload_hash, status, submitted_at) "
+                "VALUES (?, ?, 'queued', ?)",
+                (inspection_id, digest, now)
+            )
+            self._conn().commit()
+            self._prune(now)
+
+    # ------------------------------------------------------------------
+    # Progress (only the run that currently owns the id may write)
+    # ------------------------------------------------------------------
+
+    def mark_processing(self, inspection_id: str, digest: str):
+        with self._lock:
+            self._conn().execute(
+                "UPDATE inspections SET status = 'processing', started_at = ? "
+                "WHERE inspection_id = ? AND payload_hash = ?",
+                (time.time(), inspection_id, digest)
+            )
+            self._conn().commit()
+
+    def finish(self, inspection_id: str, digest: str, result: Dict[str, Any]) -> bool:
+        """
+        Store the final callback payload; status is taken from result['status'].
+        
+        Returns False if a newer payload has replaced this run - its result is
+        stale and must not be sent.
+        """
+        status = result.get("status", "completed")
+        with self._lock:
+            updated = self._conn().execute(
+                "UPDATE inspections SET status = ?, finished_at = ?, result = ?, error = ? "
+                "WHERE inspection_id = ? AND payload_hash = ?",
+                (status, time.time(), json.dumps(result, default=str), result.get("error"), inspection_id, digest)
+            ).rowcount
+            self._conn().commit()
+        if self._active.get(inspection_id) == digest:
+            del self._active[inspection_id]
+        return updated > 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, inspection_id: str) -> Optional[Dict[str, Any]]:
+        """Status record for an inspection (including its result once finished), or None"""
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT status, submitted_at, started_at, finished_at, result, error "
+                "FROM inspections WHERE inspection_id = ?",
+                (inspection_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, submitted_at, started_at, finished_at, result, error = row
+        return {
+            "inspection_id": inspection_id,
+            "status": status,
+            "submitted_at": submitted_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "result": json.loads(result) if result else None,
+            "error": error
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stored = self._conn().execute("SELECT COUNT(*) FROM inspections").fetchone()[0]
+        return {
+            "active": len(self._active),
+            "stored": stored,
+            "new_runs": self._new,
+            "attached": self._attached,
+            "served_from_cache": self._cached,
+            "changed_payloads": self._changed
+        }
+
+
+# Process-wide registry used by the API
+inspection_registry = InspectionRegistry()
@@ -0,0 +1,141 @@
+"""
+Bounded in-process job queue for inspections
+
+A fixed number of async workers drain a bounded queue, so a burst of new
+listings can no longer launch unbounded concurrent browsers and LLM calls.
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at max depth and cannot accept another job"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inspection queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InspectionJobQueue:
+    """
+    Bounded FIFO of inspection jobs processed by a pool of async workers.
+
+    Must be started from inside the event loop that will run the jobs
+    (the FastAPI lifespan).
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_depth: Optional[int] = None):
+        self.num_workers = workers or int(os.getenv("INSPECTION_WORKERS", "4"))
+        self.max_depth = max_depth or int(os.getenv("INSPECTION_QUEUE_MAX_DEPTH", "50"))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._handler: Optional[Callable[[Any], Awaitable[None]]] = None
+        self._started_at = 0.0
+
+        # Stats
+        self._busy = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def start(self, handler: Callable[[Any], Awaitable[None]]):
+        """Create the queue and spawn the worker tasks"""
+        if self._workers:
+            return
+        self._handler = handler
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._started_at = time.monotonic()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"inspection-worker-{index}")
+            for index in range(self.num_workers)
+        ]
+        logger.info(f"🧵 Inspection queue started: {self.num_workers} workers, max depth {self.max_depth}")
+
+    async def stop(self):
+        """Cancel the workers (queued jobs that have not started are dropped)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._queue is not None and not self._queue.empty():
+            logger.warning(f"⚠️  Inspection queue stopped with {self._queue.qsize()} pending jobs")
+
+    def submit(self, job: Any):
+        """
+        Enqueue a job without waiting.
+
+        Raises:
+            QueueFullError: if the queue is at max depth
+        """
+        if self._queue is None:
+            raise RuntimeError("Inspection queue is not started")
+        try:
+            self._queue.put_nowait((job, time.monotonic()))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise QueueFullError(self.retry_after())
+        self._submitted += 1
+
+    def retry_after(self) -> int:
+        """Estimate (in seconds) when a slot should free up, for the Retry-After header"""
+        finished = self._completed + self._failed
+        avg_run = self._total_run / finished if finished else 30.0
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return max(1, math.ceil(avg_run * max(1, depth) / max(1, self.num_workers)))
+
+    async def _worker(self, index: int):
+        while True:
+            job, enqueued_at = await self._queue.get()
+            waited = time.monotonic() - enqueued_at
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+            self._busy += 1
+            start = time.monotonic()
+            try:
+                await self._handler(job)
+                self._completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"❌ Inspection worker {index} job failed: {str(e)}")
+                logger.exception(e)
+            finally:
+                self._total_run += time.monotonic() - start
+                self._busy -= 1
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and worker utilisation"""
+        started = self._submitted - (self._queue.qsize() if self._queue is not None else 0)
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "workers": self.num_workers,
+            "busy_workers": self._busy,
+            "utilisation": round(self._busy / self.num_workers, 2) if self.num_workers else 0.0,
+            "avg_utilisation": round(self._total_run / (uptime * self.num_workers), 3) if uptime else 0.0,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_depth": self.max_depth,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._total_wait / started * 1000, 2) if started > 0 else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 2)
+        }
+
+
+# Process-wide queue used by the API
+inspection_queue = InspectionJobQueue()
@@ -10,16 +10,19 @@ This replaces the pure CrewAI approach which had issues with Claude
 simulating tool responses instead of executing them.
 """
 
-from typing import TypedDict, Annotated, Sequence, Literal
+from typing import TypedDict, Annotated, Sequence, Literal, Any, Awaitable, Callable, Collection, Dict, Optional, Tuple
 from typing_extensions import TypedDict
+import asyncio
 import operator
 from datetime import datetime
 import json
 import os
+import threading
+import time
 import yaml
 from pathlib import Path
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import Tool
@@ -31,6 +34,12 @@ from phonely_ai.tools.whatmobile_tool import WhatMobileTool
 from phonely_ai.tools.olx_scraper_tool import OLXScraperTool
 from phonely_ai.tools.gsmarena_tool_fixed import GSMArenaTool
 from phonely_ai.tools.priceoye_tool import PriceOyeTool
+from phonely_ai.tools.async_utils import on_loop_close, run_sync
+from phonely_ai import deadline
+from phonely_ai.checkpoints import inspection_checkpoints
+from phonely_ai.llm_output import (
+    JSONObjectScanner, PricingResult, TextResult, VisionResult, node_metrics, parse_output
+)
 
 
 # ============================================================================
@@ -78,7 +87,17 @@ class InspectionState(TypedDict):
     
     # Tool execution tracking
     tools_called: Annotated[list[str], operator.add]
-    tool_outputs: dict
+    tool_outputs: dict  # Market data keyed by tool name, reused by pricing retries
+    source_timings: dict
+    
+    # Per-branch status (vision and text run in parallel)
+    vision_status: str  # "vision_completed", "vision_failed"
+    text_status: str  # "text_completed", "text_failed"
+    
+    # Deadline budget (epoch seconds); past it the graph degrades to fallbacks
+    deadline_at: float
+    pricing_reserve: float  # Budget vision/text leave for pricing, scaled to the deadline
+    deadline_exceeded: Annotated[bool, operator.or_]  # either branch may set it
     
     # Retry tracking
     vision_retries: int
@@ -106,10 +125,18 @@ def wrap_tool_for_langchain(crewai_tool, tool_name: str):
         print(f"✅ Tool {tool_name} completed")
         return result
     
+    async def tool_coroutine(**kwargs):
+        print(f"🔧 LangChain executing tool (async): {tool_name}")
+        print(f"   Parameters: {kwargs}")
+        result = await crewai_tool._arun(**kwargs)
+        print(f"✅ Tool {tool_name} completed")
+        return result
+    
     return Tool(
         name=tool_name,
         description=crewai_tool.description,
-        func=tool_func
+        func=tool_func,
+        coroutine=tool_coroutine
     )
 
 
@@ -132,24 +159,280 @@ priceoye_langchain = wrap_tool_for_langchain(
 )
 
 
+# ============================================================================
+# LLM Clients - created once per process and reused across inspections
+# ============================================================================
+
+LLM_MODEL = "gpt-5.1"
+
+# Per-agent sampling temperature
+LLM_TEMPERATURES = {
+    'vision_agent': 0.3,
+    'text_agent': 0.3,
+    'pricing_agent': 0.1,
+}
+
+# Upper bound on one LLM call (further shortened by the inspection deadline)
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+# Budget vision/text leave untouched so pricing can still run afterwards
+PRICING_RESERVE_SECONDS = float(os.getenv("PRICING_RESERVE_SECONDS", "30"))
+
+# Budget the market data fetch leaves for the pricing LLM call
+PRICING_LLM_RESERVE_SECONDS = float(os.getenv("PRICING_LLM_RESERVE_SECONDS", "15"))
+
+# Ask for schema-constrained output (disable for endpoints without json_schema support)
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"
+
+# Stream completions and stop as soon as the JSON object is complete (takes precedence over structured output)
+LLM_STREAMING = os.getenv("LLM_STREAMING", "false").lower() == "true"
+
+# Output schema per agent
+AGENT_SCHEMAS = {
+    'vision_agent': VisionResult,
+    'text_agent': TextResult,
+    'pricing_agent': PricingResult,
+}
+
+_llm_clients: Dict[str, ChatOpenAI] = {}
+_structured_clients: Dict[str, Any] = {}
+_llm_lock = threading.RLock()
+
+
+def get_llm(agent_name: str) -> ChatOpenAI:
+    """
+    Return the shared ChatOpenAI client for an agent.
+    
+    Clients (and their HTTP connection pools) are built on first use and
+    reused by every inspection and every retry afterwards.
+    """
+    client = _llm_clients.get(agent_name)
+    if client is None:
+        with _llm_lock:
+            client = _llm_clients.get(agent_name)
+            if client is None:
+                client = ChatOpenAI(
+                    model=LLM_MODEL,
+                    temperature=LLM_TEMPERATURES[agent_name],
+                    openai_api_key=os.getenv("OPENAI_API_KEY")
+                )
+                _llm_clients[agent_name] = client
+    return client
+
+
+def get_structured_llm(agent_name: str):
+    """
+    Return the agent's LLM bound to its output schema (OpenAI json_schema mode).
+    
+    include_raw keeps the raw message, so a reply that still fails schema
+    parsing can fall back to lenient extraction instead of a retry.
+    """
+    client = _structured_clients.get(agent_name)
+    if client is None:
+        with _llm_lock:
+            client = _structured_clients.get(agent_name)
+            if client is None:
+                client = get_llm(agent_name).with_structured_output(
+                    AGENT_SCHEMAS[agent_name],
+                    method="json_schema",
+                    include_raw=True
+                )
+                _structured_clients[agent_name] = client
+    return client
+
+
+async def stream_json_object(agent_name: str, prompt: str) -> dict:
+    """
+    Stream the agent's completion and stop the request as soon as a complete
+    JSON object has arrived, skipping any explanation the model writes after it.
+    
+    Raises:
+        ValueError: if the object is invalid or the stream ends without one
+    """
+    scanner = JSONObjectScanner()
+    chunks = 0
+    stream = get_llm(agent_name).astream(prompt)
+    try:
+        async for chunk in stream:
+            chunks += 1
+            source = scanner.feed(chunk.content if isinstance(chunk.content, str) else "")
+            if source is not None:
+                result = AGENT_SCHEMAS[agent_name].model_validate(json.loads(source)).model_dump()
+                print(f"✂️  {agent_name}: JSON object complete after {chunks} chunks, closing stream")
+                return result
+    finally:
+        # Closing the generator aborts the HTTP stream, so no further tokens are generated
+        await stream.aclose()
+    raise ValueError("Stream ended without a complete JSON object")
+
+
+async def invoke_structured(
+    agent_name: str,
+    prompt: str,
+    state: InspectionState,
+    reserve: float = 0.0
+) -> Tuple[dict, str]:
+    """
+    Call an agent's LLM within the inspection's remaining budget and return
+    (validated output dict, parse path) where the path is "streamed",
+    "structured" or "lenient".
+    
+    Raises:
+        asyncio.TimeoutError: if the call (or the budget) runs out
+        ValueError: if no schema-valid JSON object could be extracted
+    """
+    timeout = deadline.budget(LLM_TIMEOUT_SECONDS, reserve, state.get('deadline_at'))
+    if timeout <= 0:
+        raise asyncio.TimeoutError(f"no budget left for {agent_name}")
+    
+    schema = AGENT_SCHEMAS[agent_name]
+    if LLM_STREAMING:
+        return await asyncio.wait_for(stream_json_object(agent_name, prompt), timeout=timeout), "streamed"
+    if LLM_STRUCTURED_OUTPUT:
+        output = await asyncio.wait_for(get_structured_llm(agent_name).ainvoke(prompt), timeout=timeout)
+        if output.get("parsed") is not None:
+            return output["parsed"].model_dump(), "structured"
+        text = output["raw"].content
+    else:
+        text = (await asyncio.wait_for(get_llm(agent_name).ainvoke(prompt), timeout=timeout)).content
+    return parse_output(text, schema), "lenient"
+
+
+# ============================================================================
+# Market Data - concurrent fetch with a shared deadline
+# ============================================================================
+
+# Total time the pricing node waits for all market data sources together
+MARKET_DATA_DEADLINE_SECONDS = float(os.getenv("MARKET_DATA_DEADLINE_SECONDS", "60"))
+
+# Optional extra sources, e.g. "priceoye,gsmarena"
+PRICING_EXTRA_SOURCES = [
+    source.strip().lower()
+    for source in os.getenv("PRICING_EXTRA_SOURCES", "").split(",")
+    if source.strip()
+]
+
+
+async def _timed_call(func: Callable[[], Awaitable[str]]) -> Tuple[str, float]:
+    """Await a tool call and return (result, elapsed_ms)"""
+    start = time.perf_counter()
+    result = await func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def usable_market_data(outputs: Dict[str, str], timings: Dict[str, dict]) -> Dict[str, str]:
+    """Market data worth reusing: only sources that answered, not timeout/error placeholders"""
+    return {
+        name: result for name, result in outputs.items()
+        if timings.get(name, {}).get('status') == "ok"
+    }
+
+
+async def fetch_market_data(
+    state: InspectionState,
+    timeout: float = MARKET_DATA_DEADLINE_SECONDS,
+    skip: Collection[str] = ()
+) -> Tuple[Dict[str, str], Dict[str, dict]]:
+    """
+    Fetch WhatMobile, OLX (and optional PriceOye/GSM Arena) data concurrently.
+    
+    All sources share one timeout. Sources that miss it are cancelled,
+    reported as timed out, and pricing continues with whatever arrived.
+    Sources named in `skip` (already fetched) are left out.
+    
+    Returns:
+        (results keyed by tool name, timings keyed by tool name)
+    """
+    brand, model, storage = state['brand'], state['model'], state['storage']
+    
+    sources: Dict[str, Callable[[], Awaitable[str]]] = {
+        "WhatMobile_Pakistan_Info": lambda: WhatMobileTool()._arun(brand, model),
+        "OLX_Market_Scraper": lambda: OLXScraperTool()._arun(brand, model, storage),
+    }
+    if "priceoye" in PRICING_EXTRA_SOURCES:
+        sources["PriceOye_Pakistan_Info"] = lambda: PriceOyeTool()._arun(brand, model)
+    if "gsmarena" in PRICING_EXTRA_SOURCES:
+        sources["GSM_Arena_Launch_Date"] = lambda: GSMArenaTool()._arun(brand, model)
+    sources = {name: func for name, func in sources.items() if name not in skip}
+    if not sources:
+        return {}, {}
+    
+    print(f"\n🔧 Fetching market data concurrently: {', '.join(sources)}")
+    start = time.perf_counter()
+    tasks = {
+        asyncio.create_task(_timed_call(func)): name
+        for name, func in sources.items()
+    }
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    
+    results: Dict[str, str] = {}
+    timings: Dict[str, dict] = {}
+    for task, name in tasks.items():
+        if task in pending:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            results[name] = f"⏱️ {name} did not respond within {timeout:.0f}s - no data available."
+            timings[name] = {"ms": round(elapsed_ms, 2), "status": "timeout"}
+            print(f"⏱️ {name} timed out, continuing without it")
+            continue
+        try:
+            result, elapsed_ms = task.result()
+            results[name] = result
+            timings[name] = {"ms": round(elapsed_ms, 2), "status": "ok"}
+            print(f"✅ {name} result ({elapsed_ms:.0f}ms): {result[:100]}...")
+        except Exception as e:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            results[name] = f"❌ {name} failed: {str(e)}"
+            timings[name] = {"ms": round(elapsed_ms, 2), "status": "error"}
+            print(f"❌ {name} failed: {e}")
+    
+    return results, timings
+
+
+async def prefetch_market_data(
+    brand: str,
+    model: str,
+    storage: str,
+    deadline_at: Optional[float] = None
+) -> Tuple[Dict[str, str], Dict[str, dict]]:
+    """
+    Fetch market data ahead of the graph, e.g. once for a group of inspections
+    of the same phone. Pass the results as `tool_outputs` (and the timings as
+    `source_timings`) in the inspection input and pricing will reuse them.
+    """
+    deadline_at = deadline_at or deadline.new_deadline()
+    token = deadline.set_deadline(deadline_at)
+    try:
+        return await fetch_market_data(
+            {'brand': brand, 'model': model, 'storage': storage},
+            timeout=deadline.budget(MARKET_DATA_DEADLINE_SECONDS, PRICING_LLM_RESERVE_SECONDS, deadline_at)
+        )
+    finally:
+        deadline.reset_deadline(token)
+
+
 # ============================================================================
 # Node Functions - Each step in LangGraph
 # ============================================================================
 
-def vision_analysis_node(state: InspectionState) -> InspectionState:
+async def vision_analysis_node(state: InspectionState) -> dict:
     """
-    Step 1: Analyze phone images for condition
+    Step 1a: Analyze phone images for condition (runs in parallel with text)
     Uses CrewAI agent definition but LangChain execution
     """
     print("\n" + "="*80)
     print("VISION ANALYSIS NODE")
     print("="*80)
     
+    if state.get('vision_status') == "vision_completed" and state.get('vision_result'):
+        print("♻️  Vision result restored from checkpoint, skipping")
+        return {}
+    
     # Get vision agent config from CrewAI (just for prompts)
     vision_config = agents_config['vision_agent']
     
-    llm = ChatOpenAI(model="gpt-5.1", temperature=0.3, openai_api_key=os.getenv("OPENAI_API_KEY"))
-    
     prompt = f"""
 Role: {vision_config['role']}
 Goal: {vision_config['goal']}
@@ -172,33 +455,46 @@ Return ONLY valid JSON:
 }}
 """
     
-    response = llm.invoke(prompt)
-    
+    attempt = state.get('vision_retries', 0)
     try:
-        # Parse JSON from response
-        result = json.loads(response.content)
-        state['vision_result'] = result
-        state['status'] = "vision_completed"
-        print(f"✅ Vision analysis completed: {result['condition']}")
-    except json.JSONDecodeError as e:
-        print(f"❌ Vision analysis failed to parse JSON: {e}")
-        state['vision_retries'] = state.get('vision_retries', 0) + 1
-        state['status'] = "vision_failed"
-    
-    return state
+        result, parsed_by = await invoke_structured('vision_agent', prompt, state, reserve=state.get('pricing_reserve', PRICING_RESERVE_SECONDS))
+        node_metrics.record('vision_analysis', attempt, True, parsed_by)
+        print(f"✅ Vision analysis completed: {result['condition']} ({parsed_by})")
+        return {
+            'vision_result': result,
+            'vision_status': "vision_completed"
+        }
+    except asyncio.TimeoutError:
+        node_metrics.record('vision_analysis', attempt, False)
+        print("⏱️ Vision analysis timed out")
+        return {
+            'vision_retries': state.get('vision_retries', 0) + 1,
+            'vision_status': "vision_failed",
+            'deadline_exceeded': not deadline.budget(LLM_TIMEOUT_SECONDS, state.get('pricing_reserve', PRICING_RESERVE_SECONDS), state.get('deadline_at'))
+        }
+    except ValueError as e:
+        node_metrics.record('vision_analysis', attempt, False)
+        print(f"❌ Vision analysis returned no valid JSON: {e}")
+        return {
+            'vision_retries': state.get('vision_retries', 0) + 1,
+            'vision_status': "vision_failed"
+        }
 
 
-def text_analysis_node(state: InspectionState) -> InspectionState:
+async def text_analysis_node(state: InspectionState) -> dict:
     """
-    Step 2: Analyze description quality
+    Step 1b: Analyze description quality (runs in parallel with vision)
+    Only needs the description and phone details, not the vision output.
     """
     print("\n" + "="*80)
     print("TEXT ANALYSIS NODE")
     print("="*80)
     
-    text_config = agents_config['text_agent']
+    if state.get('text_status') == "text_completed" and state.get('text_result'):
+        print("♻️  Text result restored from checkpoint, skipping")
+        return {}
     
-    llm = ChatOpenAI(model="gpt-5.1", temperature=0.3, openai_api_key=os.getenv("OPENAI_API_KEY"))
+    text_config = agents_config['text_agent']
     
     prompt = f"""
 Role: {text_config['role']}
@@ -217,24 +513,35 @@ Return ONLY valid JSON:
 }}
 """
     
-    response = llm.invoke(prompt)
-    
+    attempt = state.get('text_retries', 0)
     try:
-        result = json.loads(response.content)
-        state['text_result'] = result
-        state['status'] = "text_completed"
-        print(f"✅ Text analysis completed: {result['description_quality']}")
-    except json.JSONDecodeError as e:
-        print(f"❌ Text analysis failed: {e}")
-        state['text_retries'] = state.get('text_retries', 0) + 1
-        state['status'] = "text_failed"
-    
-    return state
+        result, parsed_by = await invoke_structured('text_agent', prompt, state, reserve=state.get('pricing_reserve', PRICING_RESERVE_SECONDS))
+        node_metrics.record('text_analysis', attempt, True, parsed_by)
+        print(f"✅ Text analysis completed: {result['description_quality']} ({parsed_by})")
+        return {
+            'text_result': result,
+            'text_status': "text_completed"
+        }
+    except asyncio.TimeoutError:
+        node_metrics.record('text_analysis', attempt, False)
+        print("⏱️ Text analysis timed out")
+        return {
+            'text_retries': state.get('text_retries', 0) + 1,
+            'text_status': "text_failed",
+            'deadline_exceeded': not deadline.budget(LLM_TIMEOUT_SECONDS, state.get('pricing_reserve', PRICING_RESERVE_SECONDS), state.get('deadline_at'))
+        }
+    except ValueError as e:
+        node_metrics.record('text_analysis', attempt, False)
+        print(f"❌ Text analysis returned no valid JSON: {e}")
+        return {
+            'text_retries': state.get('text_retries', 0) + 1,
+            'text_status': "text_failed"
+        }
 
 
-def pricing_analysis_node(state: InspectionState) -> InspectionState:
+async def pricing_analysis_node(state: InspectionState) -> dict:
     """
-    Step 3: Determine pricing using ACTUAL tool execution via LangChain
+    Step 2: Determine pricing (joins the vision and text branches) using ACTUAL tool execution via LangChain
     This is where the magic happens - tools MUST be called, no simulation
     """
     print("\n" + "="*80)
@@ -243,20 +550,46 @@ def pricing_analysis_node(state: InspectionState) -> InspectionState:
     
     pricing_config = agents_config['pricing_agent']
     
-    # Step 1: FORCE tool execution - call tools directly
-    print("\n🔧 Step 1: Calling WhatMobile tool...")
-    whatmobile_result = WhatMobileTool()._run(state['brand'], state['model'])
-    state['tools_called'] = state.get('tools_called', []) + ["WhatMobile_Pakistan_Info"]
-    print(f"✅ WhatMobile result: {whatmobile_result[:100]}...")
+    if deadline.expired(state.get('deadline_at')):
+        print("⏱️ Inspection deadline reached before pricing, using fallback pricing")
+        return {
+            'pricing_result': fallback_pricing(state['retail_price'], state['age_months']),
+            'status': "completed",
+            'deadline_exceeded': True
+        }
     
-    print("\n🔧 Step 2: Calling OLX tool...")
-    olx_result = OLXScraperTool()._run(state['brand'], state['model'], state['storage'])
-    state['tools_called'] = state.get('tools_called', []) + ["OLX_Market_Scraper"]
-    print(f"✅ OLX result: {olx_result[:100]}...")
+    # Step 1: FORCE tool execution - call all market data tools concurrently,
+    # leaving enough of the budget for the pricing LLM call. Retries reuse the
+    # outputs stored by the first attempt, so they only redo the LLM call.
+    # Sources that timed out or failed last time are fetched again.
+    reused = usable_market_data(state.get('tool_outputs') or {}, state.get('source_timings') or {})
+    if reused:
+        print(f"♻️  Reusing market data from previous attempt: {', '.join(reused)}")
+    fetched, timings = await fetch_market_data(
+        state,
+        timeout=deadline.budget(MARKET_DATA_DEADLINE_SECONDS, PRICING_LLM_RESERVE_SECONDS, state.get('deadline_at')),
+        skip=reused
+    )
+    market_data = {**reused, **fetched}
+    updates = {
+        'tool_outputs': market_data,
+        # tools_called is append-only - only add tools not recorded yet
+        'tools_called': [name for name in market_data if name not in state.get('tools_called', [])],
+        'source_timings': {**state.get('source_timings', {}), **timings}
+    }
     
-    # Step 2: Use LLM to analyze tool results and calculate pricing
-    llm = ChatOpenAI(model="gpt-5.1", temperature=0.1, openai_api_key=os.getenv("OPENAI_API_KEY"))
+    whatmobile_result = market_data.get("WhatMobile_Pakistan_Info", "No WhatMobile data available.")
+    olx_result = market_data.get("OLX_Market_Scraper", "No OLX data available.")
+    
+    extra_results = ""
+    extra_labels = {
+        "PriceOye_Pakistan_Info": "PriceOye Result (cross-check retail price)",
+        "GSM_Arena_Launch_Date": "GSM Arena Result (verify launch date)",
+    }
+    for number, name in enumerate([n for n in extra_labels if n in market_data], start=3):
+        extra_results += f"\n{number}. {extra_labels[name]}:\n{market_data[name]}\n"
     
+    # Step 2: Use LLM to analyze tool results and calculate pricing
     prompt = f"""
 {pricing_config['role']}
 
@@ -269,7 +602,7 @@ TOOL RESULTS (already executed):
 
 2. OLX Market Result:
 {olx_result}
-
+{extra_results}
 Now calculate pricing based on:
 - Age: {state['age_months']} months
 - Condition: {state.get('vision_result', {}).get('condition', 'Good')} ({state.get('vision_result', {}).get('condition_score', 7)}/10)
@@ -314,51 +647,91 @@ Return ONLY this JSON (no explanations):
 }}
 """
     
+    attempt = state.get('pricing_retries', 0)
     try:
-        response = llm.invoke(prompt)
-        output = response.content
-        
-        # Parse JSON from response
-        import re
-        json_match = re.search(r'\{[^{}]*\}', output, re.DOTALL)
-        if json_match:
-            pricing_result = json.loads(json_match.group())
-        else:
-            pricing_result = json.loads(output)
+        pricing_result, parsed_by = await invoke_structured('pricing_agent', prompt, state)
+        node_metrics.record('pricing_analysis', attempt, True, parsed_by)
         
-        state['pricing_result'] = pricing_result
-        state['status'] = "completed"
+        updates['pricing_result'] = pricing_result
+        updates['status'] = "completed"
         print(f"\n✅ Pricing completed: PKR {pricing_result['suggested_min_price']:,}-{pricing_result['suggested_max_price']:,}")
         print(f"   Market Avg: PKR {pricing_result['market_average']:,}")
         print(f"   Confidence: {pricing_result['confidence_level']}")
         
     except Exception as e:
+        node_metrics.record('pricing_analysis', attempt, False)
+        if not deadline.budget(LLM_TIMEOUT_SECONDS, deadline_at=state.get('deadline_at')):
+            print(f"\n⏱️ Pricing ran out of budget ({str(e) or 'timeout'}), using fallback pricing")
+            updates['pricing_result'] = fallback_pricing(state['retail_price'], state['age_months'])
+            updates['status'] = "completed"
+            updates['deadline_exceeded'] = True
+            return updates
+        
         print(f"\n❌ Pricing failed: {e}")
-        state['pricing_retries'] = state.get('pricing_retries', 0) + 1
-        state['status'] = "pricing_failed"
-        state['error'] = str(e)
+        updates['pricing_retries'] = state.get('pricing_retries', 0) + 1
+        updates['status'] = "pricing_failed"
+        updates['error'] = str(e)
+    
+    return updates
+
+
+def fallback_pricing(retail_price: int, age_months: int) -> dict:
+    """
+    Formula-only price range, used when market data or the pricing agent is
+    unavailable (failed retries or an exhausted deadline budget).
+    """
+    # If retail price is 0 or suspiciously low, the pricing agent should have fetched the actual price
+    if retail_price < 10000:
+        print(f"⚠️  Retail price too low ({retail_price}), fallback pricing may be inaccurate")
+        # Use minimum realistic price for budget phones
+        retail_price = 30000
+    
+    depreciation_factor = max(0.4, 1 - (age_months / 12 * 0.35))  # 35% year 1 for C2C
+    estimated_price = int(retail_price * depreciation_factor)
     
-    return state
+    return {
+        "suggested_min_price": int(estimated_price * 0.9),
+        "suggested_max_price": int(estimated_price * 1.1),
+        "market_average": estimated_price,
+        "confidence_level": "low",
+        "pta_impact_applied": False
+    }
+
+
+async def branch_done_node(state: InspectionState) -> dict:
+    """Marks a parallel branch as finished so the pricing join can fire"""
+    return {}
 
 
 # ============================================================================
 # Conditional Logic - LangGraph controls flow
 # ============================================================================
 
-def should_retry_vision(state: InspectionState) -> Literal["retry_vision", "text_analysis", "failed"]:
+def pricing_reserve(deadline_at: float) -> float:
+    """PRICING_RESERVE_SECONDS, but at most a third of the budget so short deadlines still leave vision/text time"""
+    return min(PRICING_RESERVE_SECONDS, deadline.remaining(deadline_at) / 3)
+
+
+def should_retry_vision(state: InspectionState) -> Literal["retry_vision", "vision_done", "failed"]:
     """Decide if we should retry vision analysis"""
-    if state['status'] == "vision_completed":
-        return "text_analysis"
+    if state.get('vision_status') == "vision_completed":
+        return "vision_done"
+    if not deadline.budget(LLM_TIMEOUT_SECONDS, state.get('pricing_reserve', PRICING_RESERVE_SECONDS), state.get('deadline_at')):
+        print("⏱️ No budget left to retry vision, continuing with fallback values")
+        return "vision_done"
     if state.get('vision_retries', 0) < 3:
         print(f"⚠️ Retrying vision analysis (attempt {state.get('vision_retries', 0) + 1}/3)")
         return "retry_vision"
     return "failed"
 
 
-def should_retry_text(state: InspectionState) -> Literal["retry_text", "pricing_analysis", "failed"]:
+def should_retry_text(state: InspectionState) -> Literal["retry_text", "text_done", "failed"]:
     """Decide if we should retry text analysis"""
-    if state['status'] == "text_completed":
-        return "pricing_analysis"
+    if state.get('text_status') == "text_completed":
+        return "text_done"
+    if not deadline.budget(LLM_TIMEOUT_SECONDS, state.get('pricing_reserve', PRICING_RESERVE_SECONDS), state.get('deadline_at')):
+        print("⏱️ No budget left to retry text analysis, continuing with fallback values")
+        return "text_done"
     if state.get('text_retries', 0) < 3:
         print(f"⚠️ Retrying text analysis (attempt {state.get('text_retries', 0) + 1}/3)")
         return "retry_text"
@@ -379,29 +752,42 @@ def should_retry_pricing(state: InspectionState) -> Literal["retry_pricing", "fi
 # Graph Construction - LangGraph orchestrates everything
 # ============================================================================
 
-def create_inspection_graph():
+def create_inspection_graph(checkpointer=None):
     """
     Create the LangGraph state machine for phone inspection.
     
     Flow:
-    START → Vision → (retry?) → Text → (retry?) → Pricing → (retry?) → END
+    START ─┬→ Vision → (retry?) → vision_done ─┬→ Pricing → (retry?) → END
+           └→ Text   → (retry?) → text_done   ─┘
+    
+    Vision and text run as parallel branches, each with its own retry loop.
+    Pricing only starts once both branches have completed successfully; if
+    either branch exhausts its retries the inspection ends without pricing.
+    When the deadline budget runs out, branches stop retrying and pricing
+    degrades to the fallback formula instead.
+    
+    With a checkpointer, state is persisted after every step so a failed or
+    interrupted inspection can be resumed (see restore_from_checkpoint).
     """
     workflow = StateGraph(InspectionState)
     
     # Add nodes
     workflow.add_node("vision_analysis", vision_analysis_node)
     workflow.add_node("text_analysis", text_analysis_node)
+    workflow.add_node("vision_done", branch_done_node)
+    workflow.add_node("text_done", branch_done_node)
     workflow.add_node("pricing_analysis", pricing_analysis_node)
     
-    # Define edges with conditional logic
-    workflow.set_entry_point("vision_analysis")
+    # Fan out: both analysis branches start immediately
+    workflow.add_edge(START, "vision_analysis")
+    workflow.add_edge(START, "text_analysis")
     
     workflow.add_conditional_edges(
         "vision_analysis",
         should_retry_vision,
         {
             "retry_vision": "vision_analysis",
-            "text_analysis": "text_analysis",
+            "vision_done": "vision_done",
             "failed": END
         }
     )
@@ -411,11 +797,14 @@ def create_inspection_graph():
         should_retry_text,
         {
             "retry_text": "text_analysis",
-            "pricing_analysis": "pricing_analysis",
+            "text_done": "text_done",
             "failed": END
         }
     )
     
+    # Join: pricing waits for both branches
+    workflow.add_edge(["vision_done", "text_done"], "pricing_analysis")
+    
     workflow.add_conditional_edges(
         "pricing_analysis",
         should_retry_pricing,
@@ -426,17 +815,166 @@ def create_inspection_graph():
         }
     )
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+# How far past the deadline the whole graph may run before it is abandoned
+DEADLINE_GRACE_SECONDS = float(os.getenv("INSPECTION_DEADLINE_GRACE_SECONDS", "5"))
+
+_compiled_graph = None
+_checkpointed_graphs: Dict[Any, Any] = {}
+_graph_lock = threading.Lock()
+
+
+def get_inspection_graph(checkpointer=None):
+    """Return the compiled inspection graph, compiling it once per process (and per checkpointer)"""
+    global _compiled_graph
+    if checkpointer is not None:
+        with _graph_lock:
+            if checkpointer not in _checkpointed_graphs:
+                _checkpointed_graphs[checkpointer] = create_inspection_graph(checkpointer)
+            return _checkpointed_graphs[checkpointer]
+    if _compiled_graph is None:
+        with _graph_lock:
+            if _compiled_graph is None:
+                _compiled_graph = create_inspection_graph()
+    return _compiled_graph
+
+
+@on_loop_close
+async def release_loop_checkpointer():
+    """
+    Close the running loop's checkpoint connection and drop the graph
+    compiled for it. run_sync loops (the sync run_inspection) are
+    short-lived; an open aiosqlite connection would keep the process alive.
+    """
+    saver = inspection_checkpoints.opened()
+    if saver is not None:
+        with _graph_lock:
+            _checkpointed_graphs.pop(saver, None)
+    await inspection_checkpoints.close()
+
+
+def warm_up() -> dict:
+    """
+    Build and validate the compiled graph and every agent's LLM client.
+    
+    Called once at service startup so the first inspection pays no setup cost.
+    
+    Raises:
+        RuntimeError: if configuration is missing or the graph is incomplete
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    
+    missing_configs = [agent for agent in LLM_TEMPERATURES if agent not in agents_config]
+    if missing_configs:
+        raise RuntimeError(f"Missing agent configs in agents.yaml: {', '.join(missing_configs)}")
+    
+    graph = get_inspection_graph()
+    graph_nodes = set(graph.get_graph().nodes)
+    required_nodes = {"vision_analysis", "text_analysis", "pricing_analysis"}
+    if not required_nodes <= graph_nodes:
+        raise RuntimeError(f"Inspection graph is missing nodes: {', '.join(required_nodes - graph_nodes)}")
+    
+    for agent in LLM_TEMPERATURES:
+        get_llm(agent)
+        if LLM_STRUCTURED_OUTPUT and not LLM_STREAMING:
+            get_structured_llm(agent)
+    
+    print(f"✅ Orchestrator warmed up: graph compiled, {len(_llm_clients)} LLM clients ready")
+    return {
+        "graph_nodes": sorted(graph_nodes),
+        "llm_clients": sorted(_llm_clients),
+        "model": LLM_MODEL,
+        "structured_output": LLM_STRUCTURED_OUTPUT,
+        "streaming": LLM_STREAMING
+    }
 
 
 # ============================================================================
 # Main Execution Function
 # ============================================================================
 
+def overall_status(final_state: dict) -> str:
+    """Collapse per-branch statuses into the single status reported to the backend"""
+    # Out of budget: the backend still gets a (degraded) result in time
+    if final_state.get('deadline_exceeded') and final_state.get('pricing_result'):
+        return "completed"
+    if final_state.get('vision_status') == "vision_failed":
+        return "vision_failed"
+    if final_state.get('text_status') == "text_failed":
+        return "text_failed"
+    return final_state['status']
+
+
+# Inputs the restorable steps depend on; a checkpoint is only reused if they are unchanged
+RESUME_INPUT_KEYS = (
+    'brand', 'model', 'storage', 'ram', 'color', 'description', 'image_urls', 'num_images',
+    'has_box', 'has_warranty', 'pta_approved'
+)
+
+
+async def restore_from_checkpoint(graph, config: dict, initial_state: dict) -> Tuple[dict, list]:
+    """
+    Seed a run with the steps a previous run of the same inspection completed.
+    
+    Vision and text results and fetched market data are carried over from the
+    thread's last checkpoint (pricing always re-runs), then the thread is reset
+    so append-only channels start empty. Nodes whose result was restored skip
+    straight through, so the run resumes at the first incomplete step.
+    
+    Returns:
+        (initial state for the new run, names of the restored steps)
+    """
+    thread_id = config['configurable']['thread_id']
+    snapshot = await graph.aget_state(config)
+    prior = snapshot.values if snapshot else {}
+    restored: Dict[str, Any] = {}
+    names = []
+    
+    if prior:
+        if any(prior.get(key) != initial_state.get(key) for key in RESUME_INPUT_KEYS):
+            print("🔄 Checkpoint is for a different payload, starting fresh")
+        else:
+            if prior.get('vision_status') == "vision_completed" and prior.get('vision_result'):
+                restored.update(vision_result=prior['vision_result'], vision_status="vision_completed")
+                names.append("vision")
+            if prior.get('text_status') == "text_completed" and prior.get('text_result'):
+                restored.update(text_result=prior['text_result'], text_status="text_completed")
+                names.append("text")
+            if prior.get('tool_outputs') and not initial_state.get('tool_outputs'):
+                restored.update(tool_outputs=prior['tool_outputs'], source_timings=prior.get('source_timings', {}))
+                names.append("market_data")
+        await inspection_checkpoints.delete(graph.checkpointer, thread_id)
+    
+    await inspection_checkpoints.touch(graph.checkpointer, thread_id)
+    if names:
+        inspection_checkpoints.record(resumed=True)
+        print(f"♻️  Resuming {thread_id} from checkpoint: {', '.join(names)} already done")
+    return {**initial_state, **restored}, names
+
+
 def run_inspection(input_data: dict) -> dict:
+    """
+    Synchronous wrapper around run_inspection_async for scripts and CLIs.
+    
+    Args:
+        input_data: Dict with phone details (brand, model, images, etc.)
+    
+    Returns:
+        Dict with vision_result, text_result, pricing_result, and metadata
+    """
+    return run_sync(run_inspection_async(input_data))
+
+
+async def run_inspection_async(input_data: dict) -> dict:
     """
     Execute phone inspection using LangGraph orchestration.
     
+    Fully async: nodes await the LLM and tools, so many inspections can
+    interleave on one event loop without blocking it.
+    
     Args:
         input_data: Dict with phone details (brand, model, images, etc.)
     
@@ -449,15 +987,25 @@ def run_inspection(input_data: dict) -> dict:
     print(f"Phone: {input_data['brand']} {input_data['model']}")
     print("="*80)
     
+    # Deadline: set by the API when the request was accepted, else starts now
+    deadline_at = input_data.get('deadline_at') or deadline.new_deadline(input_data.get('deadline_seconds'))
+    print(f"⏱️ Deadline budget: {deadline.remaining(deadline_at):.0f}s")
+    
     # Initialize state
     initial_state: InspectionState = {
         **input_data,
+        'deadline_at': deadline_at,
+        'pricing_reserve': pricing_reserve(deadline_at),
+        'deadline_exceeded': False,
         'messages': [],
         'vision_result': {},
         'text_result': {},
         'pricing_result': {},
         'tools_called': [],
-        'tool_outputs': {},
+        'tool_outputs': input_data.get('tool_outputs') or {},
+        'source_timings': input_data.get('source_timings') or {},
+        'vision_status': '',
+        'text_status': '',
         'vision_retries': 0,
         'text_retries': 0,
         'pricing_retries': 0,
@@ -465,18 +1013,50 @@ def run_inspection(input_data: dict) -> dict:
         'error': ''
     }
     
-    # Create and run graph
-    graph = create_inspection_graph()
+    # Reuse the process-wide compiled graph - checkpointed per inspection_id
+    # when the input has one, so a failed or interrupted run can be resumed.
+    # The thread is per payload: a changed payload may run while the old one
+    # is still in flight, and the two must never share (or delete) a thread.
+    inspection_id = input_data.get('inspection_id')
+    checkpointer = await inspection_checkpoints.saver() if inspection_id else None
+    graph = get_inspection_graph(checkpointer)
+    thread_id = f"{inspection_id}:{input_data['payload_hash']}" if input_data.get('payload_hash') else str(inspection_id)
+    config = {'configurable': {'thread_id': thread_id}} if checkpointer else None
+    resumed = []
+    if config:
+        try:
+            initial_state, resumed = await restore_from_checkpoint(graph, config, initial_state)
+        except Exception as e:
+            print(f"⚠️ Checkpoint restore failed, running without checkpoints: {e}")
+            checkpointer, config = None, None
+            graph = get_inspection_graph()
     start_time = datetime.now()
     
-    final_state = graph.invoke(initial_state)
+    # Tools read the deadline from this context; the timeout is a last-resort
+    # bound in case a node overruns its own budget
+    token = deadline.set_deadline(deadline_at)
+    try:
+        final_state = await asyncio.wait_for(
+            graph.ainvoke(initial_state, config),
+            timeout=deadline.remaining(deadline_at) + DEADLINE_GRACE_SECONDS
+        )
+    except asyncio.TimeoutError:
+        print("⏱️ Inspection overran its deadline, returning fallback pricing")
+        final_state = {
+            **initial_state,
+            'pricing_result': fallback_pricing(initial_state['retail_price'], initial_state['age_months']),
+            'status': "completed",
+            'deadline_exceeded': True
+        }
+    finally:
+        deadline.reset_deadline(token)
     
     end_time = datetime.now()
     total_time = (end_time - start_time).total_seconds() * 1000
     
     # Compile results
     result = {
-        'status': final_state['status'],
+        'status': overall_status(final_state),
         'results': {
             'vision_analysis': final_state.get('vision_result', {}),
             'text_analysis': final_state.get('text_result', {}),
@@ -486,6 +1066,9 @@ def run_inspection(input_data: dict) -> dict:
             'total': total_time
         },
         'tools_executed': final_state.get('tools_called', []),
+        'source_timings': final_state.get('source_timings', {}),
+        'deadline_exceeded': final_state.get('deadline_exceeded', False),
+        'resumed_from_checkpoint': resumed,
         'retries': {
             'vision': final_state.get('vision_retries', 0),
             'text': final_state.get('text_retries', 0),
@@ -496,6 +1079,14 @@ def run_inspection(input_data: dict) -> dict:
     if final_state.get('error'):
         result['error'] = final_state['error']
     
+    # Nothing left to resume once the inspection completed
+    if config and result['status'] == "completed":
+        try:
+            await inspection_checkpoints.delete(checkpointer, config['configurable']['thread_id'])
+            inspection_checkpoints.record(completed=True)
+        except Exception as e:
+            print(f"⚠️ Could not delete checkpoint (pruned later): {e}")
+    
     print("\n" + "="*80)
     print("INSPECTION COMPLETED")
     print("="*80)
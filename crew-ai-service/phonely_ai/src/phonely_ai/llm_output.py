@@ -0,0 +1,164 @@
+"""
+LLM Output - schemas, lenient JSON extraction and parse metrics for the agent nodes
+
+The nodes ask the model for schema-constrained output first. When a reply
+still arrives as free text (prose around the JSON, a code fence, ...), the
+first complete JSON object is extracted incrementally and validated against
+the same Pydantic model, instead of burning a full retry.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Literal, Optional, Type
+
+from pydantic import BaseModel, Field
+
+
+# ============================================================================
+# Output Schemas
+# ============================================================================
+
+class Authenticity(BaseModel):
+    score: float = Field(description="Authenticity score 0-100")
+    is_authentic: bool
+
+
+class VisionResult(BaseModel):
+    """Vision agent output"""
+    condition_score: float = Field(description="Condition score 0-10")
+    condition: Literal["Excellent", "Very Good", "Good", "Fair", "Poor"]
+    detected_issues: List[str]
+    authenticity: Authenticity
+
+
+class TextResult(BaseModel):
+    """Text agent output"""
+    description_quality: Literal["excellent", "good", "fair", "poor"]
+    completeness: float = Field(description="Completeness percentage 0-100")
+    missing_information: List[str]
+
+
+class PricingResult(BaseModel):
+    """Pricing agent output"""
+    suggested_min_price: int
+    suggested_max_price: int
+    market_average: int
+    confidence_level: Literal["low", "medium", "high"]
+    pta_impact_applied: bool
+
+
+# ============================================================================
+# Incremental JSON Extraction
+# ============================================================================
+
+class JSONObjectScanner:
+    """
+    Finds the first complete top-level JSON object in text fed chunk by chunk.
+
+    Tracks brace depth outside of strings, so nested objects, braces inside
+    strings and prose before or after the object are all handled.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self.result: Optional[str] = None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Consume more text; return the object's source once it is complete"""
+        if self.result is not None:
+            return self.result
+        for char in chunk:
+            if not self._started:
+                if char != '{':
+                    continue
+                self._started = True
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.result = "".join(self._buffer)
+                    return self.result
+        return None
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """
+    Return the first complete JSON object in text.
+
+    Raises:
+        ValueError: if no complete, parseable object is found
+    """
+    source = JSONObjectScanner().feed(text)
+    if source is None:
+        raise ValueError("No complete JSON object in LLM output")
+    return json.loads(source)
+
+
+def parse_output(text: str, schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Leniently extract and validate an agent's JSON output.
+
+    Raises:
+        ValueError: if no valid object is found (pydantic's ValidationError is a ValueError)
+    """
+    return schema.model_validate(extract_json_object(text)).model_dump()
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+class NodeMetrics:
+    """Per-node attempt, retry and parse-path counters (exposed on /health)"""
+
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, node: str, attempt: int, ok: bool, parsed_by: Optional[str] = None):
+        """
+        Record one node attempt.
+
+        attempt is the node's retry count before this attempt (0 = first try);
+        parsed_by is "structured", "streamed" or "lenient" for successful attempts.
+        """
+        with self._lock:
+            counters = self._nodes.setdefault(
+                node, {"runs": 0, "attempts": 0, "failures": 0, "structured": 0, "streamed": 0, "lenient": 0}
+            )
+            counters["attempts"] += 1
+            if attempt == 0:
+                counters["runs"] += 1
+            if not ok:
+                counters["failures"] += 1
+            elif parsed_by in ("structured", "streamed", "lenient"):
+                counters[parsed_by] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = {node: dict(counters) for node, counters in self._nodes.items()}
+        for counters in nodes.values():
+            # Extra attempts per inspection reaching the node (0.0 = no retries at all)
+            retries = counters["attempts"] - counters["runs"]
+            counters["retry_rate"] = round(retries / counters["runs"], 3) if counters["runs"] else 0.0
+        return nodes
+
+
+# Process-wide metrics shared by every inspection
+node_metrics = NodeMetrics()
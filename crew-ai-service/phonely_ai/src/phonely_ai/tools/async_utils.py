@@ -0,0 +1,49 @@
+"""
+Async helpers shared by the tools
+"""
+
+import asyncio
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Coroutine, List
+
+
+# Async cleanups for loop-bound resources (pooled clients, database
+# connections), run before each run_sync loop is torn down
+_loop_cleanups: List[Callable[[], Awaitable[None]]] = []
+
+
+def on_loop_close(cleanup: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Register a coroutine function that releases the current loop's resources"""
+    _loop_cleanups.append(cleanup)
+    return cleanup
+
+
+async def _run_and_clean_up(coro: Coroutine) -> Any:
+    try:
+        return await coro
+    finally:
+        for cleanup in _loop_cleanups:
+            try:
+                await cleanup()
+            except Exception as e:
+                print(f"⚠️  Loop cleanup failed: {e}")
+
+
+def run_sync(coro: Coroutine, timeout: float = None) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run directly when no loop is running in this thread. When
+    called from inside a running loop (e.g. a CrewAI agent executing inside
+    FastAPI) the coroutine runs on a fresh loop in a worker thread instead,
+    since the caller's loop cannot be re-entered. Either way the loop is
+    new, so resources registered with on_loop_close are released before it
+    closes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_run_and_clean_up(coro))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _run_and_clean_up(coro)).result(timeout=timeout)
@@ -0,0 +1,283 @@
+"""
+Browser Pool for OLX Scraping
+Keeps warm Playwright Chromium browsers and contexts alive across scrapes
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Error as PlaywrightError
+
+
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled'
+]
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+VIEWPORT = {'width': 1920, 'height': 1080}
+
+# How Playwright words "the page, context or browser is gone". Any other error
+# (navigation timeouts, DNS failures, ...) leaves the context healthy
+CLOSED_MARKERS = ('has been closed', 'target closed', 'browser closed', 'crashed')
+
+
+def _is_closed_error(error: BaseException) -> bool:
+    return isinstance(error, PlaywrightError) and any(marker in str(error).lower() for marker in CLOSED_MARKERS)
+
+
+class _ContextSlot:
+    """One warm browser context that can be leased by a single scrape at a time"""
+
+    def __init__(self, browser_index: int):
+        self.browser_index = browser_index
+        self.context: Optional[BrowserContext] = None
+        self.uses = 0
+        self.broken = False
+
+
+class BrowserPool:
+    """
+    Bounded pool of warm Chromium browsers and contexts.
+
+    Playwright objects are bound to the event loop that created them, so the
+    pool owns a dedicated loop running in a daemon thread and every scrape is
+    executed there. Contexts are recycled after `max_context_uses` leases or
+    as soon as a page crashes.
+    """
+
+    def __init__(
+        self,
+        browsers: Optional[int] = None,
+        contexts_per_browser: Optional[int] = None,
+        max_context_uses: Optional[int] = None,
+        acquire_timeout: Optional[float] = None
+    ):
+        self.num_browsers = browsers or int(os.getenv("OLX_POOL_BROWSERS", "1"))
+        self.contexts_per_browser = contexts_per_browser or int(os.getenv("OLX_POOL_CONTEXTS_PER_BROWSER", "2"))
+        self.max_context_uses = max_context_uses or int(os.getenv("OLX_POOL_MAX_CONTEXT_USES", "50"))
+        self.acquire_timeout = acquire_timeout or float(os.getenv("OLX_POOL_ACQUIRE_TIMEOUT", "30"))
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browsers: List[Optional[Browser]] = []
+        self._slots: Optional[asyncio.Queue] = None
+        self._lock = threading.Lock()
+        self._started = False
+
+        # Stats
+        self._leases = 0
+        self._in_use = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recycled = 0
+        self._crashes = 0
+        self._navigation_errors = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the pool loop and launch warm browsers (idempotent)"""
+        with self._lock:
+            if self._started:
+                return
+            print(f"🔧 OLX pool: starting {self.num_browsers} browser(s) x {self.contexts_per_browser} context(s)")
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever,
+                name="olx-browser-pool",
+                daemon=True
+            )
+            self._thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._astart(), self._loop).result(timeout=60)
+            except Exception:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop.close()
+                self._loop = None
+                raise
+            self._started = True
+            print("✅ OLX pool: browsers ready")
+
+    def stop(self):
+        """Close all contexts and browsers and stop the pool loop"""
+        with self._lock:
+            if not self._started:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._astop(), self._loop).result(timeout=30)
+            except Exception as e:
+                print(f"⚠️  OLX pool: error during shutdown: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._started = False
+            print("🔒 OLX pool: stopped")
+
+    async def _astart(self):
+        self._playwright = await async_playwright().start()
+        self._browsers = []
+        for _ in range(self.num_browsers):
+            self._browsers.append(await self._launch_browser())
+
+        self._slots = asyncio.Queue()
+        for index in range(self.num_browsers):
+            for _ in range(self.contexts_per_browser):
+                slot = _ContextSlot(index)
+                slot.context = await self._new_context(index)
+                self._slots.put_nowait(slot)
+
+    async def _astop(self):
+        while self._slots is not None and not self._slots.empty():
+            slot = self._slots.get_nowait()
+            await self._close_context(slot)
+        for browser in self._browsers:
+            if browser is not None:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+        self._browsers = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # ------------------------------------------------------------------
+    # Browser / context management (pool loop only)
+    # ------------------------------------------------------------------
+
+    async def _launch_browser(self) -> Browser:
+        return await self._playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+
+    async def _new_context(self, browser_index: int) -> BrowserContext:
+        browser = self._browsers[browser_index]
+        if browser is None or not browser.is_connected():
+            print(f"🔄 OLX pool: relaunching browser #{browser_index}")
+            browser = await self._launch_browser()
+            self._browsers[browser_index] = browser
+        return await browser.new_context(user_agent=USER_AGENT, viewport=VIEWPORT)
+
+    async def _close_context(self, slot: _ContextSlot):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+            slot.context = None
+
+    async def _recycle(self, slot: _ContextSlot):
+        await self._close_context(slot)
+        slot.context = await self._new_context(slot.browser_index)
+        slot.uses = 0
+        slot.broken = False
+        self._recycled += 1
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Lease a fresh page from a warm context.
+
+        Must be used from a coroutine running on the pool loop (see `run`).
+        """
+        wait_start = time.perf_counter()
+        slot = await asyncio.wait_for(self._slots.get(), timeout=self.acquire_timeout)
+        waited = time.perf_counter() - wait_start
+
+        self._leases += 1
+        self._in_use += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+        page = None
+        try:
+            try:
+                if slot.context is None:
+                    raise RuntimeError("context not available")
+                page = await slot.context.new_page()
+            except Exception:
+                # Context (or its browser) died while idle - rebuild once
+                await self._recycle(slot)
+                page = await slot.context.new_page()
+
+            def on_crash(_page):
+                slot.broken = True
+
+            page.on("crash", on_crash)
+            yield page
+        except Exception as e:
+            if _is_closed_error(e):
+                slot.broken = True
+            elif isinstance(e, PlaywrightError):
+                self._navigation_errors += 1
+            raise
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    slot.broken = True
+            slot.uses += 1
+            self._in_use -= 1
+            if slot.broken:
+                self._crashes += 1
+            if slot.broken or slot.uses >= self.max_context_uses:
+                try:
+                    await self._recycle(slot)
+                except Exception as e:
+                    print(f"⚠️  OLX pool: failed to recycle context: {e}")
+                    await self._close_context(slot)
+            self._slots.put_nowait(slot)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(self, coro_fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run `coro_fn(*args)` on the pool loop and block until it finishes"""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro_fn(*args), self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    async def arun(self, coro_fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Await `coro_fn(*args)` on the pool loop without blocking the caller's loop"""
+        if not self._started:
+            await asyncio.to_thread(self.start)
+        future = asyncio.run_coroutine_threadsafe(coro_fn(*args), self._loop)
+        # Cancelling the wrapper (e.g. on timeout) also cancels the scrape on the pool loop
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, utilisation and lease wait-time statistics"""
+        size = self.num_browsers * self.contexts_per_browser
+        return {
+            "started": self._started,
+            "browsers": self.num_browsers,
+            "size": size,
+            "in_use": self._in_use,
+            "idle": self._slots.qsize() if self._slots is not None else 0,
+            "leases": self._leases,
+            "avg_wait_ms": round(self._total_wait / self._leases * 1000, 2) if self._leases else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 2),
+            "contexts_recycled": self._recycled,
+            "crashes": self._crashes,
+            "navigation_errors": self._navigation_errors,
+            "max_context_uses": self.max_context_uses
+        }
+
+
+# Process-wide pool shared by every OLXScraperTool instance
+browser_pool = BrowserPool()
@@ -0,0 +1,167 @@
+"""
+Circuit breakers for the scraped sources (WhatMobile, PriceOye, GSM Arena, OLX)
+
+When a site is down or blocking us, every lookup would otherwise wait out
+its full timeouts. Each source gets a breaker:
+- closed: calls go through; outcomes are tracked over a sliding window
+- open: once the failure rate crosses the threshold, calls fail fast and
+  the tools fall back to cached or default data
+- half-open: after a cool-down a single probe call is let through; success
+  closes the breaker, failure re-opens it
+
+Settings can be overridden per source, e.g. CIRCUIT_OPEN_SECONDS_OLX=120
+takes precedence over CIRCUIT_OPEN_SECONDS.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Client errors that mean the site is blocking, rate-limiting or timing us out
+UNAVAILABLE_STATUS = {403, 408, 429}
+
+
+def is_unavailable(status_code: int) -> bool:
+    """True for responses that count as a failed call rather than an answer (5xx, 403, 408, 429)"""
+    return status_code >= 500 or status_code in UNAVAILABLE_STATUS
+
+
+def _setting(name: str, source: str, default: float) -> float:
+    """Per-source env override, then the global env value, then the default"""
+    value = os.getenv(f"CIRCUIT_{name}_{source.upper()}") or os.getenv(f"CIRCUIT_{name}")
+    return float(value) if value else default
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the source's breaker is open"""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"{source} circuit is open (retry in {retry_in:.0f}s)")
+        self.source = source
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one source (thread-safe)"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.failure_rate = _setting("FAILURE_RATE", source, 0.5)
+        self.min_calls = int(_setting("MIN_CALLS", source, 5))
+        self.window_seconds = _setting("WINDOW_SECONDS", source, 60)
+        self.open_seconds = _setting("OPEN_SECONDS", source, 30)
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+        self._rejected = 0
+        self._times_opened = 0
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the source right now"""
+        now = time.time()
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+                self._probe_started_at = 0.0
+            # Half-open: one probe at a time (a probe abandoned by a
+            # cancelled caller is replaced after another cool-down)
+            if self._state == HALF_OPEN and now - self._probe_started_at >= self.open_seconds:
+                self._probe_started_at = now
+                print(f"🟡 {self.source} circuit half-open, sending probe")
+                return True
+            self._rejected += 1
+            return False
+
+    def record(self, success: bool):
+        """Record the outcome of a call that allow() let through"""
+        now = time.time()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if success:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    print(f"🟢 {self.source} circuit closed, source recovered")
+                else:
+                    self._state = OPEN
+                    self._opened_at = now
+                    print(f"🔴 {self.source} circuit re-opened, probe failed")
+                return
+
+            self._outcomes.append((now, success))
+            self._trim(now)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and self._failure_rate() >= self.failure_rate
+            ):
+                self._state = OPEN
+                self._opened_at = now
+                self._times_opened += 1
+                print(f"🔴 {self.source} circuit opened ({self._failure_rate():.0%} of recent calls failed)")
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 when closed)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.time() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            return {
+                "state": self._state,
+                "failure_rate": round(self._failure_rate(), 3),
+                "window_calls": len(self._outcomes),
+                "rejected": self._rejected,
+                "times_opened": self._times_opened,
+                "retry_in_seconds": round(max(0.0, self.open_seconds - (now - self._opened_at)), 1)
+                if self._state != CLOSED else 0.0
+            }
+
+
+class CircuitBreakerRegistry:
+    """One breaker per source, created on first use"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(source)
+            if breaker is None:
+                breaker = self._breakers[source] = CircuitBreaker(source)
+            return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {source: breaker.stats() for source, breaker in breakers.items()}
+
+
+# Process-wide breakers shared by every scraper tool
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,305 @@
+"""
+Device Catalog - offline index of launch dates and base specs
+
+Maps normalized (brand, model) to launch date, variants and RAM/storage
+options. The whole catalog is held in memory after the first lookup, so
+answering "when did this phone launch?" never touches the network. GSM
+Arena is only hit for models missing from the catalog, and what it finds
+is written back here.
+
+CLI:
+    device_catalog stats
+    device_catalog lookup --brand Samsung --model "Galaxy A06"
+    device_catalog import devices.json          (JSON list or CSV with a header row)
+    device_catalog export [--output devices.json]
+    device_catalog refresh [--brand Samsung] [--model "Galaxy A06"] [--missing-only]
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.price_cache import CACHE_DIR, normalize_model_key
+
+
+# Storage sizes in a normalized model key, with or without a space ("128gb", "128 gb")
+STORAGE_SIZE = re.compile(r'\b\d+\s*(gb|tb)\b')
+
+# Fields kept per device; list fields are stored as JSON arrays
+CATALOG_FIELDS = ("phone_name", "launch_date", "announced", "status", "variants", "ram_options", "storage_options", "source_url")
+LIST_FIELDS = ("variants", "ram_options", "storage_options")
+
+MONTHS = {name: number for number, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+
+
+def catalog_key(brand: str, model: str) -> Tuple[str, str]:
+    """Normalized key without storage sizes ("Galaxy A06 128 GB" -> ("samsung", "galaxy a06"))"""
+    brand_key, model_key = normalize_model_key(brand, model)
+    model_key = " ".join(STORAGE_SIZE.sub(" ", model_key).split())
+    return brand_key, model_key
+
+
+def _as_list(value: Any) -> List[str]:
+    """Accept a list or a comma/pipe separated string (CSV imports)"""
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in re.split(r'[,|]', str(value)) if item.strip()]
+
+
+def normalize_launch_date(value: Any) -> Optional[str]:
+    """
+    Launch date as YYYY-MM, or None if it cannot be read.
+
+    Accepts "2024-03", "2024-03-15", "2024/3", "March 2024", "2024, March" and a bare "2024".
+    """
+    text = str(value or "").strip().lower()
+    numeric = re.match(r'^(\d{4})[-/.](\d{1,2})(?:[-/.]\d{1,2})?$', text)
+    if numeric:
+        year, month = int(numeric.group(1)), int(numeric.group(2))
+    else:
+        year_match = re.search(r'\b(\d{4})\b', text)
+        if not year_match:
+            return None
+        year = int(year_match.group(1))
+        month_match = re.search(r'\b(' + '|'.join(MONTHS) + r')[a-z]*\b', text)
+        if month_match:
+            month = MONTHS[month_match.group(1)]
+        elif text == year_match.group(1):
+            month = 1
+        else:
+            return None
+    if not (1900 < year < 2100 and 1 <= month <= 12):
+        return None
+    return f"{year}-{month:02d}"
+
+
+class DeviceCatalog:
+    """SQLite-backed device catalog with an in-memory index"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else CACHE_DIR / "device_catalog.sqlite3"
+        self._index: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS devices (
+                    brand TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (brand, model)
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def _load(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        if self._index is None:
+            try:
+                rows = self._conn().execute("SELECT brand, model, value FROM devices").fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️  Device catalog load failed: {e}")
+                rows = []
+            self._index = {(row[0], row[1]): json.loads(row[2]) for row in rows}
+        return self._index
+
+    def get(self, brand: str, model: str) -> Optional[Dict[str, Any]]:
+        """Return the catalog entry for this phone, or None if it is not indexed"""
+        key = catalog_key(brand, model)
+        with self._lock:
+            entry = self._load().get(key)
+            self._stats["hits" if entry is not None else "misses"] += 1
+            return entry
+
+    def launch_date(self, brand: str, model: str) -> Optional[str]:
+        """Launch date (YYYY-MM) from the catalog, or None"""
+        entry = self.get(brand, model)
+        return entry.get("launch_date") if entry else None
+
+    def upsert(self, brand: str, model: str, info: Dict[str, Any], source: str = "manual"):
+        """Merge info into the entry for this phone (empty fields never overwrite known ones)"""
+        key = catalog_key(brand, model)
+        with self._lock:
+            index = self._load()
+            entry = dict(index.get(key, {}))
+            for field in CATALOG_FIELDS:
+                value = info.get(field)
+                if field in LIST_FIELDS:
+                    value = _as_list(value)
+                if value:
+                    entry[field] = value
+            index[key] = entry
+            self._stats["writes"] += 1
+            try:
+                self._conn().execute(
+                    "INSERT OR REPLACE INTO devices (brand, model, value, source, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (*key, json.dumps(entry), source, time.time())
+                )
+                self._conn().commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  Device catalog write failed: {e}")
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All entries as flat dicts (brand, model, fields...), ordered by brand/model"""
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT brand, model, value, source, updated_at FROM devices ORDER BY brand, model"
+            ).fetchall()
+        return [
+            {"brand": row[0], "model": row[1], **json.loads(row[2]), "source": row[3], "updated_at": row[4]}
+            for row in rows
+        ]
+
+    def import_records(self, records: List[Dict[str, Any]], source: str = "import") -> int:
+        """
+        Upsert records that carry at least brand and model; return how many were imported.
+
+        Launch dates are normalized to YYYY-MM; rows with an unreadable launch date are rejected.
+        """
+        imported = 0
+        for record in records:
+            brand, model = record.get("brand"), record.get("model")
+            if not brand or not model:
+                continue
+            if record.get("launch_date"):
+                launch_date = normalize_launch_date(record["launch_date"])
+                if launch_date is None:
+                    print(f"⚠️  Skipping {brand} {model}: unreadable launch date {record['launch_date']!r}")
+                    continue
+                record = {**record, "launch_date": launch_date}
+            self.upsert(brand, model, record, source=source)
+            imported += 1
+        return imported
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and lookup hit rate"""
+        with self._lock:
+            entries = len(self._index) if self._index is not None else None
+            counters = dict(self._stats)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        return {"entries": entries, "path": str(self.path), **counters}
+
+
+# Process-wide catalog shared by the tools and the API
+device_catalog = DeviceCatalog()
+
+
+def _read_records(path: Path) -> List[Dict[str, Any]]:
+    """Load catalog records from a JSON list or a CSV file with a header row"""
+    if path.suffix.lower() == ".csv":
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get("devices", []) if isinstance(data, dict) else data
+
+
+async def _refresh(brand: Optional[str], model: Optional[str], missing_only: bool) -> Dict[str, int]:
+    """Re-fetch catalog entries from GSM Arena (writes through to the catalog)"""
+    # Imported here: the GSM Arena tool itself depends on this module
+    from phonely_ai.tools.gsmarena_tool_fixed import CACHE_SOURCE, GSMArenaTool
+    from phonely_ai.tools.price_cache import price_cache
+
+    tool = GSMArenaTool()
+    counts = {"refreshed": 0, "failed": 0, "skipped": 0}
+    for entry in device_catalog.entries():
+        if brand and entry["brand"] != normalize_model_key(brand, "")[0]:
+            continue
+        if model and entry["model"] != catalog_key(brand or entry["brand"], model)[1]:
+            continue
+        if missing_only and entry.get("launch_date"):
+            counts["skipped"] += 1
+            continue
+
+        price_cache.purge(source=CACHE_SOURCE, brand=entry["brand"], model=entry["model"])
+        before = entry.get("launch_date")
+        await tool._lookup(entry["brand"], entry["model"], use_catalog=False)
+        after = device_catalog.launch_date(entry["brand"], entry["model"])
+        if after:
+            counts["refreshed"] += 1
+            print(f"✅ {entry['brand']} {entry['model']}: {before or '-'} -> {after}")
+        else:
+            counts["failed"] += 1
+            print(f"❌ {entry['brand']} {entry['model']}: no launch date found")
+    return counts
+
+
+def main():
+    """CLI to import, export, inspect or refresh the device catalog"""
+    parser = argparse.ArgumentParser(prog="device_catalog", description="Manage the offline device catalog")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show entry counts")
+
+    lookup_parser = subparsers.add_parser("lookup", help="Look up one phone")
+    lookup_parser.add_argument("--brand", required=True)
+    lookup_parser.add_argument("--model", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import devices from a JSON list or CSV file")
+    import_parser.add_argument("file", type=Path)
+
+    export_parser = subparsers.add_parser("export", help="Export the catalog as JSON")
+    export_parser.add_argument("--output", type=Path, help="Write to a file instead of stdout")
+
+    refresh_parser = subparsers.add_parser("refresh", help="Re-fetch entries from GSM Arena")
+    refresh_parser.add_argument("--brand", help="Only refresh this brand")
+    refresh_parser.add_argument("--model", help="Only refresh this model")
+    refresh_parser.add_argument("--missing-only", action="store_true", help="Only entries without a launch date")
+
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        entries = device_catalog.entries()
+        brands: Dict[str, int] = {}
+        for entry in entries:
+            brands[entry["brand"]] = brands.get(entry["brand"], 0) + 1
+        print(json.dumps({
+            "path": str(device_catalog.path),
+            "entries": len(entries),
+            "missing_launch_date": sum(1 for entry in entries if not entry.get("launch_date")),
+            "brands": brands
+        }, indent=2))
+    elif args.command == "lookup":
+        entry = device_catalog.get(args.brand, args.model)
+        if entry is None:
+            print(f"Not in catalog: {args.brand} {args.model}")
+            sys.exit(1)
+        print(json.dumps(entry, indent=2))
+    elif args.command == "import":
+        imported = device_catalog.import_records(_read_records(args.file))
+        print(f"Imported {imported} device(s) into {device_catalog.path}")
+    elif args.command == "export":
+        output = json.dumps(device_catalog.entries(), indent=2)
+        if args.output:
+            args.output.write_text(output, encoding='utf-8')
+            print(f"Exported catalog to {args.output}")
+        else:
+            print(output)
+    elif args.command == "refresh":
+        # One loop (and one pooled HTTP client) for the whole refresh
+        print(json.dumps(run_sync(_refresh(args.brand, args.model, args.missing_only)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
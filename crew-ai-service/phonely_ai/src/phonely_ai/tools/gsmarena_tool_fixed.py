@@ -6,13 +6,24 @@ GSM Arena Tool - Fetch phone launch dates and specifications
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import os
 from pathlib import Path
 
+from phonely_ai import deadline
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.circuit_breaker import circuit_breakers, is_unavailable
+from phonely_ai.tools.device_catalog import device_catalog
+from phonely_ai.tools.http_client import http_client
+from phonely_ai.tools.price_cache import price_cache, normalize_model_key, is_miss
+from phonely_ai.tools.single_flight import single_flight
+from phonely_ai.tools.url_resolver import url_resolver
+
+
+CACHE_SOURCE = "gsmarena"
+
 
 class GSMArenaToolInput(BaseModel):
     """Input schema for GSMArenaToolSchema."""
@@ -49,17 +60,84 @@ class GSMArenaTool(BaseTool):
         except Exception as e:
             print(f"⚠️  Failed to save GSM Arena log: {e}")
 
+    def _format_result(self, info: dict) -> str:
+        """Render a structured lookup result as the text the pricing agent reads"""
+        result = f"📱 {info.get('phone_name')}\n\n"
+        if info.get("announced"):
+            result += f"📅 Announced: {info['announced']}\n"
+        if info.get("launch_date"):
+            result += f"🗓️  Launch Date: {info['launch_date']}\n"
+            
+            # Age is derived at render time so cached launch dates stay correct
+            try:
+                year, month = map(int, info["launch_date"].split('-')[:2])
+                now = datetime.now()
+                age_months = (now.year - year) * 12 + (now.month - month)
+                result += f"⏳ Device Age: {age_months} months\n"
+            except ValueError:
+                pass
+        if info.get("status"):
+            result += f"✅ Status: {info['status']}\n"
+        if info.get("storage_options"):
+            result += f"💾 Storage: {', '.join(info['storage_options'])}\n"
+        if info.get("ram_options"):
+            result += f"🧠 RAM: {', '.join(info['ram_options'])}\n"
+        if info.get("source_url"):
+            result += f"\n🔗 Source: {info['source_url']}\n"
+        result += "\n⚠️ For Pakistani retail prices, use WhatMobile or PriceOye tools."
+        return result
+
     def _run(self, brand: str, model: str) -> str:
+        """Synchronous entry point for CrewAI/LangChain callers"""
+        return run_sync(self._arun(brand, model))
+
+    async def _arun(self, brand: str, model: str) -> str:
+        """Coalesce concurrent identical lookups into one fetch"""
+        return await single_flight.do(
+            CACHE_SOURCE,
+            normalize_model_key(brand, model),
+            lambda: self._lookup(brand, model)
+        )
+
+    async def _lookup(self, brand: str, model: str, use_catalog: bool = True) -> str:
         """
         Fetch phone launch date from GSM Arena
         
         Args:
             brand: Phone brand name
             model: Phone model name
+            use_catalog: Answer from the offline device catalog when it knows the phone
             
         Returns:
             Formatted string with launch date and device age
         """
+        if use_catalog:
+            entry = device_catalog.get(brand, model)
+            if entry is not None and entry.get("launch_date"):
+                print(f"📚 Device catalog hit: {brand} {model}")
+                return self._format_result({"phone_name": f"{brand} {model}", **entry})
+        
+        cached = price_cache.get(CACHE_SOURCE, brand, model)
+        if is_miss(cached):
+            print(f"⚡ GSM Arena cached miss: {brand} {model}")
+            return f"Phone not found on GSM Arena: {brand} {model}"
+        if cached is not None:
+            print(f"⚡ GSM Arena cache hit: {brand} {model}")
+            return self._format_result(cached)
+        
+        if deadline.expired():
+            print(f"⏱️ Deadline reached, skipping GSM Arena lookup for {brand} {model}")
+            return "⏱️ GSM Arena skipped: inspection deadline reached.\nUse provided launch_date as fallback."
+        
+        breaker = circuit_breakers.get(CACHE_SOURCE)
+        if not breaker.allow():
+            print(f"⛔ GSM Arena circuit open, skipping lookup for {brand} {model}")
+            stale = price_cache.get(CACHE_SOURCE, brand, model, allow_expired=True)
+            if stale is not None and not is_miss(stale):
+                return self._format_result(stale)
+            return f"⚠️ GSM Arena is temporarily unavailable (retry in {breaker.retry_in():.0f}s).\nUse provided launch_date as fallback."
+        
+        answered = False
         try:
             # GSM Arena search - use their search endpoint
             search_query = f"{brand}+{model}".replace(" ", "+")
@@ -72,27 +150,46 @@ class GSMArenaTool(BaseTool):
                 'Referer': 'https://www.gsmarena.com/'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                return f"Failed to search GSM Arena: HTTP {response.status_code}"
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find search results - GSM Arena uses .makers ul li structure
-            makers_div = soup.find('div', class_='makers')
-            if not makers_div:
-                return f"Phone not found on GSM Arena: {brand} {model}"
-            
-            first_result = makers_div.find('a')
-            if not first_result:
-                return f"Phone not found on GSM Arena: {brand} {model}"
-            
-            # Get phone page URL (e.g., samsung_galaxy_a06-13265.php)
-            phone_url = "https://www.gsmarena.com/" + first_result['href']
+            # Skip the search when we already know the phone's page
+            phone_url = url_resolver.resolve(CACHE_SOURCE, brand, model)
+            if phone_url:
+                print(f"🧭 Using known GSM Arena page: {phone_url}")
+            else:
+                response = await http_client.get(search_url, headers=headers, timeout=deadline.call_timeout(10))
+                if response.status_code != 200:
+                    answered = True
+                    # 5xx, or the site blocking / rate-limiting us, counts against the breaker
+                    breaker.record(not is_unavailable(response.status_code))
+                    return f"Failed to search GSM Arena: HTTP {response.status_code}"
+                
+                soup = BeautifulSoup(response.content, 'html.parser')
+                
+                # Find search results - GSM Arena uses .makers ul li structure
+                makers_div = soup.find('div', class_='makers')
+                if not makers_div:
+                    answered = True
+                    breaker.record(True)
+                    price_cache.put_miss(CACHE_SOURCE, brand, model)
+                    return f"Phone not found on GSM Arena: {brand} {model}"
+                
+                first_result = makers_div.find('a')
+                if not first_result:
+                    answered = True
+                    breaker.record(True)
+                    price_cache.put_miss(CACHE_SOURCE, brand, model)
+                    return f"Phone not found on GSM Arena: {brand} {model}"
+                
+                # Get phone page URL (e.g., samsung_galaxy_a06-13265.php)
+                phone_url = "https://www.gsmarena.com/" + first_result['href']
             
             # Fetch phone details page
-            phone_response = requests.get(phone_url, headers=headers, timeout=10)
+            phone_response = await http_client.get(phone_url, headers=headers, timeout=deadline.call_timeout(10))
+            answered = True
+            breaker.record(not is_unavailable(phone_response.status_code))
             if phone_response.status_code != 200:
+                # Being blocked says nothing about whether the known page is still right
+                if not is_unavailable(phone_response.status_code):
+                    url_resolver.forget(CACHE_SOURCE, brand, model)
                 return f"Failed to fetch phone details: HTTP {phone_response.status_code}"
             
             phone_soup = BeautifulSoup(phone_response.content, 'html.parser')
@@ -101,16 +198,15 @@ class GSMArenaTool(BaseTool):
             phone_name_elem = phone_soup.find('h1', class_='specs-phone-name-title')
             phone_name = phone_name_elem.text.strip() if phone_name_elem else f"{brand} {model}"
             
-            result = f"📱 {phone_name}\n\n"
-            
             # Find specs in #specs-list
             specs_list = phone_soup.find('div', id='specs-list')
             if not specs_list:
                 return f"Specs not found for {brand} {model}"
             
-            # Extract launch information
+            # Extract launch information and memory options
             announced_date = None
             status = None
+            internal_memory = None
             
             # Find all spec tables
             tables = specs_list.find_all('table')
@@ -128,14 +224,13 @@ class GSMArenaTool(BaseTool):
                             announced_date = value
                         elif 'status' in key:
                             status = value
+                        elif 'internal' in key:
+                            internal_memory = value
             
             # Parse launch date
             launch_date = None
-            age_months = 0
             
             if announced_date:
-                result += f"📅 Announced: {announced_date}\n"
-                
                 # Parse date - e.g., "2024, October 18" or "2024, October"
                 date_match = re.search(r'(\d{4})[,\s]*(\w+)', announced_date)
                 if date_match:
@@ -152,19 +247,31 @@ class GSMArenaTool(BaseTool):
                     
                     # Format as YYYY-MM
                     launch_date = f"{year}-{month:02d}"
-                    result += f"🗓️  Launch Date: {launch_date}\n"
-                    
-                    # Calculate age
-                    launch_datetime = datetime(year, month, 1)
-                    now = datetime.now()
-                    age_months = (now.year - launch_datetime.year) * 12 + (now.month - launch_datetime.month)
-                    result += f"⏳ Device Age: {age_months} months\n"
             
-            if status:
-                result += f"✅ Status: {status}\n"
+            # e.g. "64GB 4GB RAM, 128GB 4GB RAM, 128GB 6GB RAM"
+            storage_options, ram_options = [], []
+            if internal_memory:
+                for size in re.findall(r'(\d+\s?[GT]B)(?!\s*RAM)', internal_memory):
+                    if size.replace(" ", "") not in storage_options:
+                        storage_options.append(size.replace(" ", ""))
+                for size in re.findall(r'(\d+\s?[GM]B)\s*RAM', internal_memory):
+                    if size.replace(" ", "") not in ram_options:
+                        ram_options.append(size.replace(" ", ""))
             
-            result += f"\n🔗 Source: {phone_url}\n"
-            result += "\n⚠️ For Pakistani retail prices, use WhatMobile or PriceOye tools."
+            info = {
+                "phone_name": phone_name,
+                "announced": announced_date,
+                "launch_date": launch_date,
+                "status": status,
+                "storage_options": storage_options,
+                "ram_options": ram_options,
+                "source_url": phone_url
+            }
+            result = self._format_result(info)
+            price_cache.put(CACHE_SOURCE, brand, model, info)
+            if launch_date:
+                device_catalog.upsert(brand, model, info, source=CACHE_SOURCE)
+            url_resolver.record(CACHE_SOURCE, brand, model, phone_url)
             
             # Save log
             self._save_tool_log(brand, model, phone_url, phone_response.text, result)
@@ -172,4 +279,7 @@ class GSMArenaTool(BaseTool):
             return result
             
         except Exception as e:
+            # A call cut short by the inspection deadline says nothing about the site
+            if not answered and not deadline.expired():
+                breaker.record(False)
             return f"❌ Error fetching GSM Arena data: {str(e)}\nUse provided launch_date as fallback."
@@ -0,0 +1,154 @@
+"""
+Shared HTTP client for the scraper tools
+
+One process-wide httpx client with keep-alive, a per-host connection cap,
+HTTP/2 when the `h2` package is installed and gzip/brotli compression, so
+repeat lookups skip DNS, TCP and TLS setup.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from typing import Any, Dict
+
+import httpx
+
+from phonely_ai.tools.async_utils import on_loop_close
+
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _LoopClient:
+    """The httpx client and per-host limits owned by one event loop"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+class SharedHTTPClient:
+    """
+    Process-wide pooled HTTP client used by every scraper tool.
+
+    httpx connections and asyncio semaphores are bound to the loop that
+    created them, so one underlying client is kept per event loop. In the
+    API service that means exactly one client on the uvicorn loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY_SECONDS
+    ):
+        self.max_per_host = max_per_host
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClient]" = weakref.WeakKeyDictionary()
+
+        # Stats per host: requests, errors, in_flight, total_ms, wait_ms
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def _loop_client(self) -> _LoopClient:
+        loop = asyncio.get_running_loop()
+        loop_client = self._clients.get(loop)
+        if loop_client is None or loop_client.client.is_closed:
+            loop_client = _LoopClient(httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=self.limits,
+                follow_redirects=True,
+                timeout=httpx.Timeout(10.0)
+            ))
+            self._clients[loop] = loop_client
+        return loop_client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared pool, respecting the per-host connection cap"""
+        loop_client = self._loop_client()
+        host = httpx.URL(url).host
+        limit = loop_client.host_limits.get(host)
+        if limit is None:
+            limit = loop_client.host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        counters = self._hosts.setdefault(
+            host, {"requests": 0, "errors": 0, "in_flight": 0, "total_ms": 0.0, "wait_ms": 0.0}
+        )
+
+        wait_start = time.perf_counter()
+        async with limit:
+            counters["wait_ms"] += (time.perf_counter() - wait_start) * 1000
+            counters["requests"] += 1
+            counters["in_flight"] += 1
+            start = time.perf_counter()
+            try:
+                return await loop_client.client.get(url, **kwargs)
+            except Exception:
+                counters["errors"] += 1
+                raise
+            finally:
+                counters["in_flight"] -= 1
+                counters["total_ms"] += (time.perf_counter() - start) * 1000
+
+    async def aclose(self):
+        """Close the client owned by the current loop"""
+        loop_client = self._clients.pop(asyncio.get_running_loop(), None)
+        if loop_client is not None:
+            await loop_client.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool limits, live connection counts and per-host request stats"""
+        connections = 0
+        idle_connections = 0
+        http2_connections = 0
+        for loop_client in list(self._clients.values()):
+            # httpcore does not expose pool state publicly - best effort
+            pool = getattr(getattr(loop_client.client, "_transport", None), "_pool", None)
+            for connection in getattr(pool, "connections", []):
+                connections += 1
+                if connection.is_idle():
+                    idle_connections += 1
+                if "HTTP/2" in repr(connection):
+                    http2_connections += 1
+
+        hosts = {}
+        for host, counters in self._hosts.items():
+            requests = counters["requests"]
+            hosts[host] = {
+                "requests": int(requests),
+                "errors": int(counters["errors"]),
+                "in_flight": int(counters["in_flight"]),
+                "avg_ms": round(counters["total_ms"] / requests, 2) if requests else 0.0,
+                "avg_pool_wait_ms": round(counters["wait_ms"] / requests, 2) if requests else 0.0
+            }
+
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "max_connections_per_host": self.max_per_host,
+            "connections": connections,
+            "idle_connections": idle_connections,
+            "http2_connections": http2_connections,
+            "hosts": hosts
+        }
+
+
+# Process-wide client shared by every scraper tool
+http_client = SharedHTTPClient()
+
+# Short-lived run_sync loops (scripts, CLIs, sync tool calls) close their client with the loop
+on_loop_close(http_client.aclose)
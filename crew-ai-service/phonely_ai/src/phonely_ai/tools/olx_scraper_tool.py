@@ -15,9 +15,29 @@ from datetime import datetime
 from pathlib import Path
 
 # Playwright imports (better for cloud servers)
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 import asyncio
 
+from phonely_ai import deadline
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.browser_pool import browser_pool
+from phonely_ai.tools.circuit_breaker import CircuitOpenError, circuit_breakers
+from phonely_ai.tools.olx_snapshot_cache import olx_snapshot_cache
+from phonely_ai.tools.single_flight import single_flight
+
+
+LISTING_CLASS = '_617daaaa'
+LISTING_SELECTOR = f'article.{LISTING_CLASS}'
+
+# Number of listing cards we parse - the page is "ready" once this many are rendered
+MAX_LISTINGS = int(os.getenv("OLX_MAX_LISTINGS", "10"))
+
+# Upper bound on how long a single page load waits for listings to render
+READY_TIMEOUT_MS = int(os.getenv("OLX_READY_TIMEOUT_MS", "20000"))
+
+# Upper bound on a whole scrape (page lease, load and parse)
+SCRAPE_TIMEOUT_SECONDS = 60
+
 
 class OLXScraperInput(BaseModel):
     """Input schema for OLX Scraper."""
@@ -68,30 +88,73 @@ class OLXScraperTool(BaseTool):
         model: str,
         storage: Optional[str] = None
     ) -> str:
-        """Run OLX scraping with Playwright async in a separate thread"""
+        """Synchronous entry point for CrewAI/LangChain callers"""
+        return run_sync(self._arun(brand, model, storage))
+
+    async def _arun(
+        self,
+        brand: str,
+        model: str,
+        storage: Optional[str] = None
+    ) -> str:
+        """Coalesce concurrent identical OLX lookups into one scrape"""
+        return await single_flight.do(
+            "olx",
+            olx_snapshot_cache.key(brand, model, storage),
+            lambda: self._lookup(brand, model, storage)
+        )
+
+    async def _lookup(
+        self,
+        brand: str,
+        model: str,
+        storage: Optional[str] = None
+    ) -> str:
+        """
+        Serve a recent OLX snapshot if one exists, otherwise scrape.
+        
+        Snapshots past the soft TTL are still served but re-scraped in the
+        background; past the hard TTL we scrape synchronously.
+        """
         print(f"🚀 OLX SCRAPER ACTUALLY CALLED: {brand} {model} {storage or ''}")
         print(f"🔍 OLX execution started at: {datetime.now().isoformat()}")
         
+        snapshot, age = olx_snapshot_cache.get(brand, model, storage)
+        if snapshot is not None:
+            if olx_snapshot_cache.is_stale(age):
+                print(f"♻️  OLX snapshot is {age / 60:.0f} min old, serving it and refreshing in background")
+                olx_snapshot_cache.refresh_in_background(
+                    brand, model, storage,
+                    lambda: self._scrape_guarded(brand, model, storage, timeout=SCRAPE_TIMEOUT_SECONDS)
+                )
+            else:
+                print(f"⚡ OLX snapshot cache hit ({age / 60:.0f} min old)")
+            return json.dumps({**snapshot, "snapshot_age_seconds": int(age)}, indent=2)
+        
+        if deadline.expired():
+            print(f"⏱️ Deadline reached, skipping OLX scrape for {brand} {model}")
+            return json.dumps({
+                "error": "inspection deadline reached",
+                "listings": [],
+                "message": "OLX skipped. Using fallback pricing."
+            })
+        
         try:
-            # Run async function in a separate thread to avoid event loop conflicts
-            import concurrent.futures
-            
-            def run_async_in_thread():
-                """Run the async function in a new event loop in a separate thread"""
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    result = loop.run_until_complete(self._scrape_olx_async(brand, model, storage))
-                    return result
-                finally:
-                    loop.close()
-            
-            # Execute in thread pool to avoid uvloop conflicts
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_async_in_thread)
-                result = future.result(timeout=60)  # 60 second timeout
+            result = await self._scrape_guarded(brand, model, storage)
+            if not result.get("error"):
+                olx_snapshot_cache.put(brand, model, storage, result)
             
             return json.dumps(result, indent=2)
+        except CircuitOpenError as e:
+            print(f"⛔ {e}, skipping scrape for {brand} {model}")
+            snapshot, age = olx_snapshot_cache.get(brand, model, storage, ignore_hard_ttl=True)
+            if snapshot is not None:
+                return json.dumps({**snapshot, "snapshot_age_seconds": int(age)}, indent=2)
+            return json.dumps({
+                "error": str(e),
+                "listings": [],
+                "message": "OLX is temporarily unavailable. Using fallback pricing."
+            })
         except Exception as e:
             import traceback
             print(f"❌ OLX scraping failed: {e}")
@@ -102,6 +165,96 @@ class OLXScraperTool(BaseTool):
                 "message": "Failed to scrape OLX. Using fallback pricing."
             })
 
+    async def _scrape_guarded(
+        self,
+        brand: str,
+        model: str,
+        storage: Optional[str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape through the OLX circuit breaker (raises CircuitOpenError when open).
+        
+        The timeout defaults to what is left of the inspection's deadline;
+        background refreshes pass their own, as no inspection is waiting.
+        """
+        breaker = circuit_breakers.get("olx")
+        if not breaker.allow():
+            raise CircuitOpenError("olx", breaker.retry_in())
+        if timeout is None:
+            timeout = deadline.call_timeout(SCRAPE_TIMEOUT_SECONDS)
+        try:
+            result = await self._scrape_via_pool(brand, model, storage, timeout)
+        except Exception:
+            # A scrape cut short by the inspection deadline says nothing about OLX
+            if not deadline.expired():
+                breaker.record(False)
+            raise
+        breaker.record(not result.get("error"))
+        return result
+
+    async def _scrape_via_pool(self, brand: str, model: str, storage: Optional[str], timeout: float) -> Dict[str, Any]:
+        """Scrape on the shared browser pool's event loop (warm browser, leased page)"""
+        return await browser_pool.arun(self._scrape_olx_async, brand, model, storage, timeout=timeout)
+
+    async def _wait_for_listings(self, page, timeout_ms: int = READY_TIMEOUT_MS) -> Dict[str, Any]:
+        """
+        Wait until MAX_LISTINGS cards are in the DOM or the network goes quiet,
+        whichever comes first, bounded by timeout_ms.
+        
+        Returns how long we actually waited and what made the page ready.
+        """
+        start = time.perf_counter()
+        
+        cards_ready = asyncio.ensure_future(page.wait_for_function(
+            "([selector, count]) => document.querySelectorAll(selector).length >= count",
+            arg=[LISTING_SELECTOR, MAX_LISTINGS],
+            timeout=timeout_ms
+        ))
+        network_idle = asyncio.ensure_future(
+            page.wait_for_load_state('networkidle', timeout=timeout_ms)
+        )
+        
+        ready_by = "timeout"
+        pending = {cards_ready, network_idle}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if cards_ready in done and cards_ready.exception() is None:
+                    ready_by = "listings"
+                    break
+                if network_idle in done and network_idle.exception() is None:
+                    ready_by = "network_idle"
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        # Network went quiet with fewer cards than we want - nudge lazy loading once
+        if ready_by == "network_idle":
+            remaining_ms = timeout_ms - (time.perf_counter() - start) * 1000
+            card_count = await page.locator(LISTING_SELECTOR).count()
+            if card_count < MAX_LISTINGS and remaining_ms > 0:
+                await page.evaluate("window.scrollTo(0, 1000)")
+                try:
+                    await page.wait_for_function(
+                        "([selector, count]) => document.querySelectorAll(selector).length >= count",
+                        arg=[LISTING_SELECTOR, MAX_LISTINGS],
+                        timeout=min(remaining_ms, 2000)
+                    )
+                    ready_by = "listings"
+                except PlaywrightTimeout:
+                    pass
+        
+        wait_ms = (time.perf_counter() - start) * 1000
+        if ready_by == "timeout":
+            print(f"⚠️  OLX: Listings not ready after {wait_ms:.0f}ms, continuing anyway...")
+        else:
+            print(f"✅ OLX: Listings ready by {ready_by} after {wait_ms:.0f}ms")
+        
+        return {"wait_ms": round(wait_ms, 2), "ready_by": ready_by}
+
     async def _scrape_olx_async(
         self,
         brand: str,
@@ -123,49 +276,16 @@ class OLXScraperTool(BaseTool):
         print(f"🔗 URL: {search_url}")
         
         try:
-            # Initialize Playwright async (much better for cloud servers!)
-            print("🔧 OLX: Initializing Playwright browser...")
-            async with async_playwright() as p:
-                # Launch browser with headless mode
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-blink-features=AutomationControlled'
-                    ]
-                )
-                
-                # Create context with real browser-like settings
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    viewport={'width': 1920, 'height': 1080}
-                )
-                
-                # Create page
-                page = await context.new_page()
-                
+            # Lease a page from the warm browser pool instead of launching Chromium
+            print("🔧 OLX: Leasing page from browser pool...")
+            async with browser_pool.page() as page:
                 # Load page (use domcontentloaded instead of networkidle - faster and more reliable)
                 print(f"📄 OLX: Loading page...")
                 await page.goto(search_url, wait_until='domcontentloaded', timeout=45000)
                 
-                # Wait for listings to render
+                # Wait until enough listings are rendered (or the network goes quiet)
                 print("⏳ OLX: Waiting for listings to render...")
-                try:
-                    await page.wait_for_selector('article._617daaaa', timeout=20000)
-                    print("✅ OLX: Listings loaded successfully")
-                except PlaywrightTimeout:
-                    print("⚠️  OLX: Timeout waiting for listings, continuing anyway...")
-                
-                # Give JavaScript time to fully render
-                await asyncio.sleep(2)
-                
-                # Scroll to trigger lazy loading
-                await page.evaluate("window.scrollTo(0, 1000)")
-                await asyncio.sleep(2)
-                await page.evaluate("window.scrollTo(0, 0)")
-                await asyncio.sleep(1)
+                readiness = await self._wait_for_listings(page)
                 
                 # Get page HTML after JavaScript rendering
                 page_source = await page.content()
@@ -173,7 +293,7 @@ class OLXScraperTool(BaseTool):
             
                 # Extract listings (actual OLX structure uses article elements)
                 listings = []
-                listing_cards = soup.find_all('article', class_='_617daaaa')
+                listing_cards = soup.find_all('article', class_=LISTING_CLASS)
                 
                 print(f"🔍 OLX: Found {len(listing_cards)} listing cards")
                 
@@ -186,17 +306,19 @@ class OLXScraperTool(BaseTool):
                     search_url_no_storage = f"{base_url}/mobile-phones_c1453/q-{query_no_storage.replace(' ', '-')}"
                     
                     await page.goto(search_url_no_storage, wait_until='domcontentloaded', timeout=45000)
-                    await asyncio.sleep(3)
-                    await page.evaluate("window.scrollTo(0, 1000)")
-                    await asyncio.sleep(2)
+                    retry_readiness = await self._wait_for_listings(page)
+                    readiness = {
+                        "wait_ms": round(readiness["wait_ms"] + retry_readiness["wait_ms"], 2),
+                        "ready_by": retry_readiness["ready_by"]
+                    }
                     
                     page_source = await page.content()
                     soup = BeautifulSoup(page_source, 'html.parser')
-                    listing_cards = soup.find_all('article', class_='_617daaaa')
+                    listing_cards = soup.find_all('article', class_=LISTING_CLASS)
                     search_url = search_url_no_storage
                     print(f"🔍 OLX: Found {len(listing_cards)} listing cards (without storage)")
             
-            for card in listing_cards[:10]:  # Limit to 10 listings
+            for card in listing_cards[:MAX_LISTINGS]:
                 try:
                     # Extract title (actual class from HTML)
                     title_elem = card.find('h2', class_='_1093b649')
@@ -244,17 +366,15 @@ class OLXScraperTool(BaseTool):
                 "query": query,
                 "total_found": len(listing_cards),
                 "listings": listings,
-                "search_url": search_url
+                "search_url": search_url,
+                "wait_ms": readiness["wait_ms"],
+                "ready_by": readiness["ready_by"]
             }
             
             # Save log
             self._save_tool_log(brand, model, storage or "N/A", search_url, page_source, result)
             
-            print(f"✅ OLX: Extracted {len(listings)} valid listings")
-            
-            # Close browser
-            await browser.close()
-            print("🔒 OLX: Browser closed")
+            print(f"✅ OLX: Extracted {len(listings)} valid listings (waited {readiness['wait_ms']:.0f}ms, ready by {readiness['ready_by']})")
             
             return result
             
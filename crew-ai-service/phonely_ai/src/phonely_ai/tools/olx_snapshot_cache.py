@@ -0,0 +1,201 @@
+"""
+OLX Snapshot Cache - stale-while-revalidate cache for OLX market snapshots
+
+OLX listings for a (brand, model, storage) move on the order of hours, so a
+recent snapshot is served immediately:
+- younger than the soft TTL: served as-is
+- between soft and hard TTL: served, and refreshed in the background
+- older than the hard TTL (or missing): caller must scrape synchronously
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from phonely_ai.tools.price_cache import CACHE_DIR, normalize_model_key
+
+
+SOFT_TTL_SECONDS = int(os.getenv("OLX_SNAPSHOT_SOFT_TTL", str(2 * 3600)))
+HARD_TTL_SECONDS = int(os.getenv("OLX_SNAPSHOT_HARD_TTL", str(12 * 3600)))
+MEMORY_SIZE = int(os.getenv("OLX_SNAPSHOT_MEMORY_SIZE", "256"))
+
+
+class OLXSnapshotCache:
+    """Memory LRU of snapshots backed by SQLite, with background revalidation"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        soft_ttl: int = SOFT_TTL_SECONDS,
+        hard_ttl: int = HARD_TTL_SECONDS,
+        memory_size: int = MEMORY_SIZE
+    ):
+        self.path = Path(path) if path else CACHE_DIR / "olx_snapshots.sqlite3"
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._refreshing: Set[Tuple[str, str, str]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Stats
+        self._fresh_hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS olx_snapshots (
+                    brand TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    storage TEXT NOT NULL,
+                    snapshot TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (brand, model, storage)
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def _remember(self, key: Tuple[str, str, str], entry: Tuple[float, Dict[str, Any]]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def key(brand: str, model: str, storage: Optional[str]) -> Tuple[str, str, str]:
+        brand_key, model_key = normalize_model_key(brand, model)
+        storage_key = (storage or "").lower().replace(" ", "")
+        return brand_key, model_key, storage_key
+
+    def get(
+        self,
+        brand: str,
+        model: str,
+        storage: Optional[str],
+        ignore_hard_ttl: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Return (snapshot, age_seconds) for the key, or (None, inf) if there
+        is no snapshot younger than the hard TTL (any age with ignore_hard_ttl,
+        used as a fallback while OLX is unavailable).
+        """
+        key = self.key(brand, model, storage)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                try:
+                    row = self._conn().execute(
+                        "SELECT fetched_at, snapshot FROM olx_snapshots WHERE brand = ? AND model = ? AND storage = ?",
+                        key
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"⚠️  OLX snapshot read failed: {e}")
+                    row = None
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+            else:
+                self._memory.move_to_end(key)
+
+            if entry is None or (now - entry[0] >= self.hard_ttl and not ignore_hard_ttl):
+                self._misses += 1
+                return None, float("inf")
+
+            age = now - entry[0]
+            if age >= self.soft_ttl:
+                self._stale_hits += 1
+            else:
+                self._fresh_hits += 1
+            return entry[1], age
+
+    def put(self, brand: str, model: str, storage: Optional[str], snapshot: Dict[str, Any]):
+        """Store a freshly scraped snapshot"""
+        key = self.key(brand, model, storage)
+        now = time.time()
+        with self._lock:
+            self._remember(key, (now, snapshot))
+            try:
+                self._conn().execute(
+                    "INSERT OR REPLACE INTO olx_snapshots (brand, model, storage, snapshot, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (*key, json.dumps(snapshot), now)
+                )
+                self._conn().commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  OLX snapshot write failed: {e}")
+
+    def is_stale(self, age: float) -> bool:
+        return age >= self.soft_ttl
+
+    def refresh_in_background(
+        self,
+        brand: str,
+        model: str,
+        storage: Optional[str],
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ):
+        """Schedule one background re-scrape per key on the running loop"""
+        key = self.key(brand, model, storage)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                snapshot = await fetch()
+                if snapshot.get("error"):
+                    self._refresh_failures += 1
+                    print(f"⚠️  OLX snapshot refresh failed for {brand} {model}: {snapshot['error']}")
+                else:
+                    self.put(brand, model, storage, snapshot)
+                    self._refreshes += 1
+                    print(f"🔄 OLX snapshot refreshed: {brand} {model} {storage or ''}")
+            except Exception as e:
+                self._refresh_failures += 1
+                print(f"⚠️  OLX snapshot refresh failed for {brand} {model}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._fresh_hits + self._stale_hits + self._misses
+        return {
+            "soft_ttl_seconds": self.soft_ttl,
+            "hard_ttl_seconds": self.hard_ttl,
+            "snapshots_in_memory": len(self._memory),
+            "memory_size": self.memory_size,
+            "fresh_hits": self._fresh_hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "hit_rate": round((self._fresh_hits + self._stale_hits) / lookups, 3) if lookups else 0.0,
+            "background_refreshes": self._refreshes,
+            "refresh_failures": self._refresh_failures,
+            "refreshing": len(self._refreshing)
+        }
+
+
+# Process-wide snapshot cache shared by every OLXScraperTool instance
+olx_snapshot_cache = OLXSnapshotCache()
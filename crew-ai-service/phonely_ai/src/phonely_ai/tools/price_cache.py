@@ -0,0 +1,374 @@
+"""
+Retail Price Cache - two-tier cache for WhatMobile, PriceOye and GSM Arena lookups
+
+Tier 1: in-process LRU (microsecond hits for hot models)
+Tier 2: SQLite on disk (survives restarts, shared by every tool)
+
+Entries hold the structured lookup result (retail price, launch date,
+source URL, ...) keyed by source and normalized (brand, model) - never
+raw HTML. "Not found" results are cached too, with a shorter per-source
+TTL, and every miss is tallied so unknown models can be fixed.
+
+CLI:
+    price_cache stats
+    price_cache list [--source whatmobile]
+    price_cache misses [--source whatmobile] [--limit 20]
+    price_cache purge [--source whatmobile] [--brand Samsung --model "Galaxy A06"] [--expired]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+CACHE_DIR = Path(os.getenv(
+    "PHONELY_CACHE_DIR",
+    Path(__file__).parent.parent.parent.parent / "cache"
+))
+
+# Per-source time-to-live in seconds
+DEFAULT_TTLS = {
+    "whatmobile": int(os.getenv("PRICE_CACHE_TTL_WHATMOBILE", str(24 * 3600))),
+    "priceoye": int(os.getenv("PRICE_CACHE_TTL_PRICEOYE", str(12 * 3600))),
+    "gsmarena": int(os.getenv("PRICE_CACHE_TTL_GSMARENA", str(30 * 24 * 3600))),
+}
+
+# Per-source time-to-live for "not found" results, in seconds
+MISS_TTLS = {
+    "whatmobile": int(os.getenv("PRICE_CACHE_MISS_TTL_WHATMOBILE", str(6 * 3600))),
+    "priceoye": int(os.getenv("PRICE_CACHE_MISS_TTL_PRICEOYE", str(6 * 3600))),
+    "gsmarena": int(os.getenv("PRICE_CACHE_MISS_TTL_GSMARENA", str(24 * 3600))),
+}
+
+MEMORY_SIZE = int(os.getenv("PRICE_CACHE_MEMORY_SIZE", "512"))
+
+
+def normalize_model_key(brand: str, model: str) -> Tuple[str, str]:
+    """
+    Normalize (brand, model) so cosmetic differences share one cache entry.
+
+    Example: ("Samsung ", "samsung Galaxy-A06") -> ("samsung", "galaxy a06")
+
+    "+" names a different phone, so it is kept as a word:
+    "Galaxy S24+" -> "galaxy s24 plus", the same key as "Galaxy S24 Plus".
+    """
+    brand_key = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', brand.lower())).strip()
+    model_key = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', model.lower().replace('+', ' plus '))).strip()
+    if brand_key and model_key.startswith(brand_key + ' '):
+        model_key = model_key[len(brand_key) + 1:]
+    return brand_key, model_key
+
+
+def is_miss(value: Optional[Dict[str, Any]]) -> bool:
+    """True if a cached value records that the source does not have this phone"""
+    return bool(value) and value.get("not_found") is True
+
+
+class RetailPriceCache:
+    """Memory LRU in front of a persistent SQLite store with per-source TTLs"""
+
+    def __init__(self, path: Optional[Path] = None, memory_size: int = MEMORY_SIZE):
+        self.path = Path(path) if path else CACHE_DIR / "retail_prices.sqlite3"
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        # Stats per source: memory_hits, disk_hits, misses, writes, negative_hits, not_found
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS retail_prices (
+                    source TEXT NOT NULL,
+                    brand TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (source, brand, model)
+                )
+            """)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS lookup_misses (
+                    source TEXT NOT NULL,
+                    brand TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    lookups INTEGER NOT NULL,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    PRIMARY KEY (source, brand, model)
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def _count(self, source: str, field: str):
+        counters = self._stats.setdefault(
+            source, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "negative_hits": 0, "not_found": 0}
+        )
+        counters[field] += 1
+
+    def _remember(self, key: Tuple[str, str, str], expires_at: float, value: Dict[str, Any]):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, source: str, brand: str, model: str, allow_expired: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for (source, brand, model) or None if missing/expired.
+        
+        allow_expired returns an expired entry too (fallback while the source
+        is unavailable); such reads are not counted in the hit rate.
+        """
+        key = (source, *normalize_model_key(brand, model))
+        now = time.time()
+        with self._lock:
+            if allow_expired:
+                try:
+                    row = self._conn().execute(
+                        "SELECT value FROM retail_prices WHERE source = ? AND brand = ? AND model = ?", key
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"⚠️  Price cache read failed: {e}")
+                    row = None
+                return json.loads(row[0]) if row is not None else None
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count(source, "memory_hits")
+                    if is_miss(value):
+                        self._count(source, "negative_hits")
+                        self._tally_miss(key, now)
+                    return value
+                del self._memory[key]
+
+            try:
+                row = self._conn().execute(
+                    "SELECT value, expires_at FROM retail_prices WHERE source = ? AND brand = ? AND model = ?",
+                    key
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️  Price cache read failed: {e}")
+                row = None
+
+            if row is not None and row[1] > now:
+                value = json.loads(row[0])
+                self._remember(key, row[1], value)
+                self._count(source, "disk_hits")
+                if is_miss(value):
+                    self._count(source, "negative_hits")
+                    self._tally_miss(key, now)
+                return value
+
+            self._count(source, "misses")
+            return None
+
+    def put(self, source: str, brand: str, model: str, value: Dict[str, Any], ttl: Optional[int] = None):
+        """Store a structured result in both tiers"""
+        key = (source, *normalize_model_key(brand, model))
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else DEFAULT_TTLS.get(source, 24 * 3600))
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._count(source, "writes")
+            try:
+                self._conn().execute(
+                    "INSERT OR REPLACE INTO retail_prices (source, brand, model, value, fetched_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, json.dumps(value), now, expires_at)
+                )
+                self._conn().commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  Price cache write failed: {e}")
+
+    def _tally_miss(self, key: Tuple[str, str, str], now: float):
+        """Count one lookup that ended as "not found" (caller holds the lock)"""
+        try:
+            self._conn().execute(
+                "INSERT INTO lookup_misses (source, brand, model, lookups, first_seen, last_seen) "
+                "VALUES (?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (source, brand, model) DO UPDATE SET lookups = lookups + 1, last_seen = excluded.last_seen",
+                (*key, now, now)
+            )
+            self._conn().commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  Price cache miss tally failed: {e}")
+
+    def put_miss(self, source: str, brand: str, model: str, ttl: Optional[int] = None):
+        """Cache a definite "not found" for this phone and tally the miss"""
+        self.put(source, brand, model, {"not_found": True}, ttl if ttl is not None else MISS_TTLS.get(source, 3600))
+        key = (source, *normalize_model_key(brand, model))
+        with self._lock:
+            self._count(source, "not_found")
+            self._tally_miss(key, time.time())
+
+    def misses(self, source: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Models most often not found, so they can get catalog or alias fixes.
+
+        lookups counts every lookup that ended as a miss - fresh probes and
+        answers served from the negative cache alike - so it tracks demand.
+        """
+        query = "SELECT source, brand, model, lookups, first_seen, last_seen FROM lookup_misses"
+        params: List[Any] = []
+        if source:
+            query += " WHERE source = ?"
+            params.append(source)
+        query += " ORDER BY lookups DESC, last_seen DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn().execute(query, params).fetchall()
+        return [
+            {"source": row[0], "brand": row[1], "model": row[2], "lookups": row[3], "first_seen": row[4], "last_seen": row[5]}
+            for row in rows
+        ]
+
+    def entries(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List on-disk entries, newest first"""
+        query = "SELECT source, brand, model, value, fetched_at, expires_at FROM retail_prices"
+        params: Tuple = ()
+        if source:
+            query += " WHERE source = ?"
+            params = (source,)
+        query += " ORDER BY fetched_at DESC"
+        with self._lock:
+            rows = self._conn().execute(query, params).fetchall()
+        now = time.time()
+        return [
+            {
+                "source": row[0],
+                "brand": row[1],
+                "model": row[2],
+                "value": json.loads(row[3]),
+                "age_seconds": int(now - row[4]),
+                "expired": row[5] <= now
+            }
+            for row in rows
+        ]
+
+    def purge(
+        self,
+        source: Optional[str] = None,
+        brand: Optional[str] = None,
+        model: Optional[str] = None,
+        expired_only: bool = False
+    ) -> int:
+        """Delete matching entries from both tiers and return how many were removed on disk"""
+        clauses, params = [], []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if brand and model:
+            brand_key, model_key = normalize_model_key(brand, model)
+            clauses += ["brand = ?", "model = ?"]
+            params += [brand_key, model_key]
+        elif brand:
+            clauses.append("brand = ?")
+            params.append(normalize_model_key(brand, "")[0])
+        if expired_only:
+            clauses.append("expires_at <= ?")
+            params.append(time.time())
+
+        query = "DELETE FROM retail_prices"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+
+        with self._lock:
+            removed = self._conn().execute(query, params).rowcount
+            self._conn().commit()
+            # Memory tier is small - simplest to drop it entirely
+            self._memory.clear()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per source plus tier sizes"""
+        with self._lock:
+            per_source = {source: dict(counters) for source, counters in self._stats.items()}
+        for counters in per_source.values():
+            lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+            hits = counters["memory_hits"] + counters["disk_hits"]
+            counters["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        return {
+            "memory_entries": len(self._memory),
+            "memory_size": self.memory_size,
+            "path": str(self.path),
+            "sources": per_source
+        }
+
+
+# Process-wide cache shared by every retail price tool
+price_cache = RetailPriceCache()
+
+
+def main():
+    """CLI to inspect or purge cached retail price lookups"""
+    parser = argparse.ArgumentParser(prog="price_cache", description="Inspect or purge the retail price cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show entry counts per source")
+
+    list_parser = subparsers.add_parser("list", help="List cached entries")
+    list_parser.add_argument("--source", help="Only show one source (whatmobile, priceoye, gsmarena)")
+
+    misses_parser = subparsers.add_parser("misses", help="List models most often not found")
+    misses_parser.add_argument("--source", help="Only show one source")
+    misses_parser.add_argument("--limit", type=int, default=20, help="How many models to show")
+
+    purge_parser = subparsers.add_parser("purge", help="Delete cached entries")
+    purge_parser.add_argument("--source", help="Only purge one source")
+    purge_parser.add_argument("--brand", help="Only purge this brand")
+    purge_parser.add_argument("--model", help="Only purge this model (requires --brand)")
+    purge_parser.add_argument("--expired", action="store_true", help="Only purge expired entries")
+
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        entries = price_cache.entries()
+        summary: Dict[str, Dict[str, int]] = {}
+        for entry in entries:
+            counts = summary.setdefault(entry["source"], {"entries": 0, "not_found": 0, "expired": 0})
+            counts["entries"] += 1
+            counts["not_found"] += int(is_miss(entry["value"]))
+            counts["expired"] += int(entry["expired"])
+        print(json.dumps({"path": str(price_cache.path), "sources": summary}, indent=2))
+    elif args.command == "list":
+        for entry in price_cache.entries(args.source):
+            status = "expired" if entry["expired"] else "fresh"
+            print(f"{entry['source']:<12} {entry['brand']} {entry['model']} [{status}, {entry['age_seconds']}s old] {json.dumps(entry['value'])}")
+    elif args.command == "misses":
+        for miss in price_cache.misses(args.source, args.limit):
+            last_seen = time.strftime("%Y-%m-%d %H:%M", time.localtime(miss["last_seen"]))
+            print(f"{miss['source']:<12} {miss['lookups']:>5}x  {miss['brand']} {miss['model']} (last {last_seen})")
+    elif args.command == "purge":
+        if args.model and not args.brand:
+            parser.error("--model requires --brand")
+        removed = price_cache.purge(args.source, args.brand, args.model, args.expired)
+        print(f"🗑️  Purged {removed} cache entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,23 @@ PriceOye Tool - Fetch Pakistani retail prices and phone specifications
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-import requests
 from bs4 import BeautifulSoup
 import re
 import os
 from datetime import datetime
 from pathlib import Path
 
+from phonely_ai import deadline
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.circuit_breaker import circuit_breakers, is_unavailable
+from phonely_ai.tools.http_client import http_client
+from phonely_ai.tools.price_cache import price_cache, normalize_model_key, is_miss
+from phonely_ai.tools.single_flight import single_flight
+from phonely_ai.tools.url_resolver import url_resolver
+
+
+CACHE_SOURCE = "priceoye"
+
 
 class PriceOyeToolInput(BaseModel):
     """Input schema for PriceOyeToolSchema."""
@@ -48,7 +58,27 @@ class PriceOyeTool(BaseTool):
         except Exception as e:
             print(f"⚠️  Failed to save PriceOye log: {e}")
 
+    def _format_result(self, brand: str, model: str, info: dict) -> str:
+        """Render a structured lookup result as the text the pricing agent reads"""
+        result = f"📱 {brand} {model}\n\n"
+        if info.get("retail_price"):
+            result += f"💰 PriceOye Price: PKR {info['retail_price']:,}\n"
+        result += f"\n🔗 Source: {info['source_url']}\n"
+        return result
+
     def _run(self, brand: str, model: str) -> str:
+        """Synchronous entry point for CrewAI/LangChain callers"""
+        return run_sync(self._arun(brand, model))
+
+    async def _arun(self, brand: str, model: str) -> str:
+        """Coalesce concurrent identical lookups into one fetch"""
+        return await single_flight.do(
+            CACHE_SOURCE,
+            normalize_model_key(brand, model),
+            lambda: self._lookup(brand, model)
+        )
+
+    async def _lookup(self, brand: str, model: str) -> str:
         """
         Fetch phone pricing from PriceOye Pakistan
         
@@ -59,6 +89,27 @@ class PriceOyeTool(BaseTool):
         Returns:
             Formatted string with Pakistani retail price
         """
+        cached = price_cache.get(CACHE_SOURCE, brand, model)
+        if is_miss(cached):
+            print(f"⚡ PriceOye cached miss: {brand} {model}")
+            return f"Phone not found on PriceOye: {brand} {model}"
+        if cached is not None:
+            print(f"⚡ PriceOye cache hit: {brand} {model}")
+            return self._format_result(brand, model, cached)
+        
+        if deadline.expired():
+            print(f"⏱️ Deadline reached, skipping PriceOye lookup for {brand} {model}")
+            return "⏱️ PriceOye skipped: inspection deadline reached."
+        
+        breaker = circuit_breakers.get(CACHE_SOURCE)
+        if not breaker.allow():
+            print(f"⛔ PriceOye circuit open, skipping lookup for {brand} {model}")
+            stale = price_cache.get(CACHE_SOURCE, brand, model, allow_expired=True)
+            if stale is not None and not is_miss(stale):
+                return self._format_result(brand, model, stale) + "\n⚠️ PriceOye is unavailable - this is older cached data."
+            return f"⚠️ PriceOye is temporarily unavailable (retry in {breaker.retry_in():.0f}s)."
+        
+        answered = False
         try:
             # Normalize search - PriceOye uses kebab-case
             # Example: samsung-galaxy-a06
@@ -66,34 +117,62 @@ class PriceOyeTool(BaseTool):
             brand_lower = brand.lower()
             search_term = f"{brand_lower}-{model_normalized}"
             
-            # Try direct URL pattern
-            url = f"https://priceoye.pk/mobiles/{brand_lower}/{search_term}"
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            async def fetch(target_url: str):
+                # Down, blocking or rate-limiting us: a failed lookup, never a "not found"
+                fetched = await http_client.get(target_url, headers=headers, timeout=deadline.call_timeout(10))
+                if is_unavailable(fetched.status_code):
+                    fetched.raise_for_status()
+                return fetched
+            
+            # Go straight to the page that worked last time, if we know it
+            response = None
+            known_url = url_resolver.resolve(CACHE_SOURCE, brand, model)
+            if known_url:
+                print(f"🧭 Trying known URL: {known_url}")
+                url = known_url
+                response = await fetch(url)
+                if response.status_code != 200:
+                    url_resolver.forget(CACHE_SOURCE, brand, model)
+            
+            # Try direct URL pattern
+            if response is None or response.status_code != 200:
+                url = f"https://priceoye.pk/mobiles/{brand_lower}/{search_term}"
+                response = await fetch(url)
             
             # If direct URL fails, try search
             if response.status_code != 200:
                 search_url = f"https://priceoye.pk/search?q={brand}+{model}"
-                response = requests.get(search_url, headers=headers, timeout=10)
+                response = await fetch(search_url)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
                     # Find first result link
                     first_result = soup.find('a', href=re.compile(f'/mobiles/.*{model_normalized}', re.I))
-                    if first_result:
-                        url = "https://priceoye.pk" + first_result['href']
-                        response = requests.get(url, headers=headers, timeout=10)
+                    if not first_result:
+                        answered = True
+                        breaker.record(True)
+                        price_cache.put_miss(CACHE_SOURCE, brand, model)
+                        return f"Phone not found on PriceOye: {brand} {model}"
+                    url = "https://priceoye.pk" + first_result['href']
+                    response = await fetch(url)
             
+            answered = True
+            breaker.record(True)
             if response.status_code != 200:
+                # Only a real 404 is a definite miss - anything else may be gone next time
+                if response.status_code == 404:
+                    price_cache.put_miss(CACHE_SOURCE, brand, model)
                 return f"Phone not found on PriceOye: {brand} {model}"
             
+            url_resolver.record(CACHE_SOURCE, brand, model, url)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract information
-            result = f"📱 {brand} {model}\n\n"
+            info = {"retail_price": None, "source_url": url}
             
             # Get price (PriceOye has price in specific elements)
             price_elem = soup.find('span', class_='price-box') or soup.find('div', class_='product-price')
@@ -103,9 +182,12 @@ class PriceOyeTool(BaseTool):
                 price_match = re.search(r'(\d{1,3}(?:,\d{3})*)', price_text.replace(',', ''))
                 if price_match:
                     retail_price = int(price_match.group(1).replace(',', ''))
-                    result += f"💰 PriceOye Price: PKR {retail_price:,}\n"
+                    info["retail_price"] = retail_price
             
-            result += f"\n🔗 Source: {url}\n"
+            result = self._format_result(brand, model, info)
+            # A page whose price did not parse is not worth serving for days
+            if info.get("retail_price") is not None:
+                price_cache.put(CACHE_SOURCE, brand, model, info)
             
             # Save log
             self._save_tool_log(brand, model, url, response.text, result)
@@ -113,4 +195,7 @@ class PriceOyeTool(BaseTool):
             return result
             
         except Exception as e:
+            # A call cut short by the inspection deadline says nothing about the site
+            if not answered and not deadline.expired():
+                breaker.record(False)
             return f"❌ Error fetching PriceOye data: {str(e)}"
@@ -0,0 +1,73 @@
+"""
+Single-flight request coalescing for tool lookups
+
+When several inspections ask for the same lookup at the same time (e.g. a
+batch of listings for one phone), only the first call actually fetches;
+the others await the same in-flight result.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from phonely_ai import deadline
+
+
+class SingleFlight:
+    """Share one in-flight coroutine between concurrent callers with the same key"""
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[int, str, Hashable], Tuple[asyncio.Task, deadline.SharedDeadline]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, namespace: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() once per (namespace, key) among concurrent callers.
+
+        The fetch runs as its own task, so a caller that is cancelled (e.g.
+        by a deadline) does not cancel the lookup for everyone else. Inside
+        the task the deadline is the latest among the callers waiting on it
+        (extended as later callers join), and each caller waits at most for
+        its own remaining budget.
+        
+        Raises:
+            asyncio.TimeoutError: if the caller's deadline passes first
+        """
+        loop = asyncio.get_running_loop()
+        # Tasks are bound to their loop, so flights never span loops
+        flight_key = (id(loop), namespace, key)
+        counters = self._stats.setdefault(namespace, {"calls": 0, "executions": 0, "deduplicated": 0})
+        counters["calls"] += 1
+
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            task, shared = flight
+            shared.join(deadline.current())
+            counters["deduplicated"] += 1
+            print(f"🔗 Coalesced {namespace} lookup for {key} with in-flight request")
+        else:
+            counters["executions"] += 1
+            shared = deadline.SharedDeadline(deadline.current())
+            # create_task copies the current context; start the task from one
+            # that holds the shared deadline instead of this caller's
+            context = contextvars.Context()
+            context.run(deadline.set_deadline, shared)
+            task = context.run(loop.create_task, fn())
+            self._inflight[flight_key] = (task, shared)
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+
+        left = deadline.remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        return await asyncio.wait_for(asyncio.shield(task), left)
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, real executions and deduplicated calls per namespace"""
+        return {
+            "in_flight": len(self._inflight),
+            "namespaces": {namespace: dict(counters) for namespace, counters in self._stats.items()}
+        }
+
+
+# Process-wide coalescer shared by every tool
+single_flight = SingleFlight()
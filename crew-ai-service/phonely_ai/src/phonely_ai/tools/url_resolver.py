@@ -0,0 +1,179 @@
+"""
+Canonical URL Resolver - remembers which page worked for each phone on each source
+
+Every successful WhatMobile / PriceOye / GSM Arena lookup records the
+canonical URL for its normalized (brand, model). Later lookups go straight
+to that page, and new spellings of a known model ("Galaxy-A06",
+"galaxy a06 128GB") are fuzzy-matched onto the existing entry.
+"""
+
+import difflib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from phonely_ai.tools.price_cache import CACHE_DIR, normalize_model_key
+
+
+FUZZY_CUTOFF = float(os.getenv("URL_RESOLVER_FUZZY_CUTOFF", "0.85"))
+
+# Words that distinguish different phones rather than spellings of one phone
+VARIANT_WORDS = {
+    "pro", "max", "plus", "ultra", "lite", "mini", "fe", "neo", "prime",
+    "edge", "note", "fold", "flip", "5g", "4g"
+}
+
+STORAGE_SIZE = re.compile(r'\b\d+\s*(gb|tb)\b')
+
+
+def _model_tokens(model_key: str) -> list:
+    """Model tokens without storage sizes (storage does not change the page)"""
+    return STORAGE_SIZE.sub(" ", model_key).split()
+
+
+def _signature(model_key: str) -> Tuple[frozenset, frozenset]:
+    """Tokens that must match exactly for a fuzzy hit: numbers and variant words"""
+    tokens = _model_tokens(model_key)
+    numbers = frozenset(token for token in tokens if any(char.isdigit() for char in token) and token not in VARIANT_WORDS)
+    variants = frozenset(token for token in tokens if token in VARIANT_WORDS)
+    return numbers, variants
+
+
+class URLResolver:
+    """Persistent (source, brand, model) -> canonical URL index with fuzzy lookup"""
+
+    def __init__(self, path: Optional[Path] = None, fuzzy_cutoff: float = FUZZY_CUTOFF):
+        self.path = Path(path) if path else CACHE_DIR / "url_resolver.sqlite3"
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._index: Optional[Dict[Tuple[str, str, str], str]] = None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        # Stats per source: exact_hits, fuzzy_hits, misses, learned, forgotten
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS canonical_urls (
+                    source TEXT NOT NULL,
+                    brand TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    learned_at REAL NOT NULL,
+                    PRIMARY KEY (source, brand, model)
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def _load(self) -> Dict[Tuple[str, str, str], str]:
+        if self._index is None:
+            try:
+                rows = self._conn().execute("SELECT source, brand, model, url FROM canonical_urls").fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️  URL resolver load failed: {e}")
+                rows = []
+            self._index = {(row[0], row[1], row[2]): row[3] for row in rows}
+        return self._index
+
+    def _count(self, source: str, field: str):
+        counters = self._stats.setdefault(
+            source, {"exact_hits": 0, "fuzzy_hits": 0, "misses": 0, "learned": 0, "forgotten": 0}
+        )
+        counters[field] += 1
+
+    def _fuzzy_match(self, source: str, brand_key: str, model_key: str) -> Optional[str]:
+        target_signature = _signature(model_key)
+        target = "".join(_model_tokens(model_key))
+        best_url, best_ratio = None, self.fuzzy_cutoff
+        for (entry_source, entry_brand, entry_model), url in self._index.items():
+            if entry_source != source or entry_brand != brand_key:
+                continue
+            if _signature(entry_model) != target_signature:
+                continue
+            ratio = difflib.SequenceMatcher(None, target, "".join(_model_tokens(entry_model))).ratio()
+            if ratio >= best_ratio:
+                best_url, best_ratio = url, ratio
+        return best_url
+
+    def resolve(self, source: str, brand: str, model: str) -> Optional[str]:
+        """Return the known canonical URL for this phone on this source, if any"""
+        brand_key, model_key = normalize_model_key(brand, model)
+        with self._lock:
+            index = self._load()
+            url = index.get((source, brand_key, model_key))
+            if url is not None:
+                self._count(source, "exact_hits")
+                return url
+
+            url = self._fuzzy_match(source, brand_key, model_key)
+            if url is not None:
+                self._count(source, "fuzzy_hits")
+                print(f"🧭 Resolver fuzzy-matched {brand} {model} on {source}: {url}")
+                return url
+
+            self._count(source, "misses")
+            return None
+
+    def record(self, source: str, brand: str, model: str, url: str):
+        """Remember the URL that worked for this phone"""
+        key = (source, *normalize_model_key(brand, model))
+        with self._lock:
+            index = self._load()
+            if index.get(key) == url:
+                return
+            index[key] = url
+            self._count(source, "learned")
+            try:
+                self._conn().execute(
+                    "INSERT OR REPLACE INTO canonical_urls (source, brand, model, url, learned_at) VALUES (?, ?, ?, ?, ?)",
+                    (*key, url, time.time())
+                )
+                self._conn().commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  URL resolver write failed: {e}")
+
+    def forget(self, source: str, brand: str, model: str):
+        """
+        Drop a URL that no longer works (page moved or removed).
+
+        Removes the URL that resolve() returns for this phone - whether it was
+        matched exactly or fuzzily - from every entry that points at it.
+        """
+        brand_key, model_key = normalize_model_key(brand, model)
+        with self._lock:
+            index = self._load()
+            url = index.get((source, brand_key, model_key)) or self._fuzzy_match(source, brand_key, model_key)
+            if url is None:
+                return
+            keys = [key for key, entry_url in index.items() if key[0] == source and entry_url == url]
+            for key in keys:
+                del index[key]
+            self._count(source, "forgotten")
+            try:
+                self._conn().execute("DELETE FROM canonical_urls WHERE source = ? AND url = ?", (source, url))
+                self._conn().commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  URL resolver delete failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and hit rates per source"""
+        with self._lock:
+            entries = len(self._index) if self._index is not None else None
+            per_source = {source: dict(counters) for source, counters in self._stats.items()}
+        for counters in per_source.values():
+            lookups = counters["exact_hits"] + counters["fuzzy_hits"] + counters["misses"]
+            counters["hit_rate"] = round((counters["exact_hits"] + counters["fuzzy_hits"]) / lookups, 3) if lookups else 0.0
+        return {"entries": entries, "fuzzy_cutoff": self.fuzzy_cutoff, "sources": per_source}
+
+
+# Process-wide resolver shared by every scraper tool
+url_resolver = URLResolver()
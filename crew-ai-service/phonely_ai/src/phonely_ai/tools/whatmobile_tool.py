@@ -3,16 +3,28 @@ WhatMobile Tool - Fetch Pakistani retail prices and phone specifications
 """
 
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Awaitable, List, Optional, Tuple, Type
 from pydantic import BaseModel, Field
-import requests
+import httpx
 from bs4 import BeautifulSoup
 import re
 import json
+import asyncio
 import os
 from datetime import datetime
 from pathlib import Path
 
+from phonely_ai import deadline
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.circuit_breaker import circuit_breakers
+from phonely_ai.tools.http_client import http_client
+from phonely_ai.tools.price_cache import price_cache, normalize_model_key, is_miss
+from phonely_ai.tools.single_flight import single_flight
+from phonely_ai.tools.url_resolver import url_resolver
+
+
+CACHE_SOURCE = "whatmobile"
+
 
 class WhatMobileToolInput(BaseModel):
     """Input schema for WhatMobileToolSchema."""
@@ -83,7 +95,141 @@ HTML CONTENT (first 5000 chars):
             print(f"🔍 DEBUG: Full traceback:")
             traceback.print_exc()
 
+    def _format_result(self, brand: str, model: str, info: dict) -> str:
+        """Render a structured lookup result as the text the pricing agent reads"""
+        result = f"📱 {brand} {model}\n\n"
+        if info.get("retail_price"):
+            result += f"💰 Retail Price: PKR {info['retail_price']:,}\n"
+        if info.get("launch_date"):
+            result += f"📅 Launch Date: {info['launch_date']}\n"
+        if info.get("storage"):
+            result += f"💾 {info['storage']}\n"
+        result += f"\n🔗 Source: {info['source_url']}\n"
+        result += "\n✅ Use this retail price for Pakistani market calculations."
+        return result
+
+    def _url_variations(self, brand: str, model: str) -> List[str]:
+        """Build WhatMobile page slugs to try, most specific first"""
+        # WhatMobile URL patterns:
+        # - Brand uses underscores: Apple_, Samsung_, Vivo_
+        # - Model uses hyphens: Galaxy-A55, iPhone-15-Pro-Max
+        # - Some have "5G" suffix, some don't
+        # - Some have storage (512GB), some don't
+        # - Galaxy models: "Galaxy " → "Galaxy-"
+        
+        # Generate multiple URL variations to try
+        url_variations = []
+        
+        # Clean model name
+        model_clean = model.strip()
+        
+        # Replace "Galaxy " with "Galaxy-" for Samsung
+        if "Galaxy" in model_clean:
+            model_clean = model_clean.replace("Galaxy ", "Galaxy-")
+        
+        # Replace spaces with hyphens in model
+        model_hyphenated = model_clean.replace(" ", "-")
+        
+        # Build base URL: Brand_Model
+        base_url = f"{brand}_{model_hyphenated}"
+        
+        # Variation 1: Exact as provided
+        url_variations.append(base_url)
+        
+        # Variation 2: Without storage suffix (remove 128GB, 256GB, 512GB, etc)
+        model_no_storage = re.sub(r'-?\d+(GB|TB)', '', model_hyphenated, flags=re.IGNORECASE)
+        if model_no_storage != model_hyphenated:
+            url_variations.append(f"{brand}_{model_no_storage}")
+        
+        # Variation 3: With "5G" if not present
+        if '5G' not in model_hyphenated.upper():
+            url_variations.append(f"{brand}_{model_hyphenated}-5G")
+            if model_no_storage != model_hyphenated:
+                url_variations.append(f"{brand}_{model_no_storage}-5G")
+        
+        # Variation 4: Without "5G" if present
+        if '5G' in model_hyphenated.upper():
+            model_no_5g = re.sub(r'-?5G', '', model_hyphenated, flags=re.IGNORECASE).rstrip('-')
+            url_variations.append(f"{brand}_{model_no_5g}")
+        
+        return url_variations
+
+    async def _probe_page(self, url: str, headers: dict) -> Optional[Tuple[str, httpx.Response]]:
+        """
+        Fetch one candidate URL; return (url, response) if it is a real phone page.
+        
+        Only a 404 (or a "not found" page served as 200) is a miss. Network
+        errors and any other status raise - 5xx, 403, 408 and 429 mean the
+        site is down or blocking us, not that the phone does not exist.
+        """
+        response = await http_client.get(url, headers=headers, timeout=deadline.call_timeout(10))
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(f"HTTP {response.status_code} from {response.url}", request=response.request, response=response)
+        # Verify it's not a 404 page disguised as 200
+        if 'not found' in response.text.lower()[:500]:
+            return None
+        return url, response
+
+    async def _probe_search(self, brand: str, model: str, headers: dict) -> Optional[Tuple[str, httpx.Response]]:
+        """Use WhatMobile search to find the phone page, then fetch it (misses only on a 200 page with no match)"""
+        search_url = f"https://www.whatmobile.com.pk/search?search={brand}+{model}"
+        response = await http_client.get(search_url, headers=headers, timeout=deadline.call_timeout(10))
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(f"HTTP {response.status_code} from {response.url}", request=response.request, response=response)
+        
+        soup = BeautifulSoup(response.content, 'html.parser')
+        # Find first result link
+        first_result = soup.find('a', href=re.compile(f'{re.escape(brand)}.*{re.escape(model)}', re.I))
+        if not first_result:
+            return None
+        
+        url = "https://www.whatmobile.com.pk" + first_result['href']
+        return await self._probe_page(url, headers)
+
+    async def _first_hit(self, probes: List[Awaitable]) -> Tuple[Optional[Tuple[str, httpx.Response]], int]:
+        """
+        Run all probes concurrently and return (best hit, failed probes), cancelling the rest.
+        
+        Probes are listed in preference order (exact URL first, search last).
+        The first probe in that order that succeeds wins, and we return as soon
+        as every probe ahead of it has missed - so a fast exact match never
+        waits on slower variations, and a "-5G" sibling page can never beat
+        the exact model just by answering first. A probe that errors counts
+        as a miss, but the caller learns about it so it can avoid caching a
+        "not found" that was really an outage.
+        """
+        tasks = [asyncio.ensure_future(probe) for probe in probes]
+        failed = 0
+        try:
+            for task in tasks:
+                try:
+                    result = await task
+                except Exception:
+                    failed += 1
+                    continue
+                if result is not None:
+                    return result, failed
+            return None, failed
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     def _run(self, brand: str, model: str) -> str:
+        """Synchronous entry point for CrewAI/LangChain callers"""
+        return run_sync(self._arun(brand, model))
+
+    async def _arun(self, brand: str, model: str) -> str:
+        """Coalesce concurrent identical lookups into one fetch"""
+        return await single_flight.do(
+            CACHE_SOURCE,
+            normalize_model_key(brand, model),
+            lambda: self._lookup(brand, model)
+        )
+
+    async def _lookup(self, brand: str, model: str) -> str:
         """
         Fetch phone information from WhatMobile Pakistan
         
@@ -96,93 +242,79 @@ HTML CONTENT (first 5000 chars):
         """
         print(f"🚀 WHATMOBILE TOOL ACTUALLY CALLED: {brand} {model}")
         print(f"🔍 Tool execution started at: {datetime.now().isoformat()}")
+        
+        cached = price_cache.get(CACHE_SOURCE, brand, model)
+        if is_miss(cached):
+            print(f"⚡ WhatMobile cached miss: {brand} {model}")
+            return f"Phone not found on WhatMobile: {brand} {model}"
+        if cached is not None:
+            print(f"⚡ WhatMobile cache hit: {brand} {model}")
+            return self._format_result(brand, model, cached)
+        
+        if deadline.expired():
+            print(f"⏱️ Deadline reached, skipping WhatMobile lookup for {brand} {model}")
+            return "⏱️ WhatMobile skipped: inspection deadline reached. Use provided retail_price as fallback."
+        
+        breaker = circuit_breakers.get(CACHE_SOURCE)
+        if not breaker.allow():
+            print(f"⛔ WhatMobile circuit open, skipping lookup for {brand} {model}")
+            stale = price_cache.get(CACHE_SOURCE, brand, model, allow_expired=True)
+            if stale is not None and not is_miss(stale):
+                return self._format_result(brand, model, stale) + "\n⚠️ WhatMobile is unavailable - this is older cached data."
+            return f"⚠️ WhatMobile is temporarily unavailable (retry in {breaker.retry_in():.0f}s). Use provided retail_price as fallback."
+        
+        answered = False
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            # WhatMobile URL patterns:
-            # - Brand uses underscores: Apple_, Samsung_, Vivo_
-            # - Model uses hyphens: Galaxy-A55, iPhone-15-Pro-Max
-            # - Some have "5G" suffix, some don't
-            # - Some have storage (512GB), some don't
-            # - Galaxy models: "Galaxy " → "Galaxy-"
-            
-            # Generate multiple URL variations to try
-            url_variations = []
-            
-            # Clean model name
-            model_clean = model.strip()
-            
-            # Replace "Galaxy " with "Galaxy-" for Samsung
-            if "Galaxy" in model_clean:
-                model_clean = model_clean.replace("Galaxy ", "Galaxy-")
-            
-            # Replace spaces with hyphens in model
-            model_hyphenated = model_clean.replace(" ", "-")
-            
-            # Build base URL: Brand_Model
-            base_url = f"{brand}_{model_hyphenated}"
-            
-            # Variation 1: Exact as provided
-            url_variations.append(base_url)
-            
-            # Variation 2: Without storage suffix (remove 128GB, 256GB, 512GB, etc)
-            model_no_storage = re.sub(r'-?\d+(GB|TB)', '', model_hyphenated, flags=re.IGNORECASE)
-            if model_no_storage != model_hyphenated:
-                url_variations.append(f"{brand}_{model_no_storage}")
-            
-            # Variation 3: With "5G" if not present
-            if '5G' not in model_hyphenated.upper():
-                url_variations.append(f"{brand}_{model_hyphenated}-5G")
-                if model_no_storage != model_hyphenated:
-                    url_variations.append(f"{brand}_{model_no_storage}-5G")
-            
-            # Variation 4: Without "5G" if present
-            if '5G' in model_hyphenated.upper():
-                model_no_5g = re.sub(r'-?5G', '', model_hyphenated, flags=re.IGNORECASE).rstrip('-')
-                url_variations.append(f"{brand}_{model_no_5g}")
-            
-            # Try each URL variation
-            response = None
-            url = None
-            
-            for variation in url_variations:
-                test_url = f"https://www.whatmobile.com.pk/{variation}"
-                print(f"🔍 Trying URL: {test_url}")
+            # Go straight to the page that worked last time, if we know it
+            hit, failed, known_failed = None, 0, 0
+            known_url = url_resolver.resolve(CACHE_SOURCE, brand, model)
+            if known_url:
+                print(f"🧭 Trying known URL: {known_url}")
                 try:
-                    test_response = requests.get(test_url, headers=headers, timeout=10)
-                    if test_response.status_code == 200:
-                        # Verify it's not a 404 page disguised as 200
-                        if 'not found' not in test_response.text.lower()[:500]:
-                            response = test_response
-                            url = test_url
-                            print(f"✅ Found at: {test_url}")
-                            break
-                except:
-                    continue
+                    hit = await self._probe_page(known_url, headers)
+                    if hit is None:
+                        url_resolver.forget(CACHE_SOURCE, brand, model)
+                except Exception as e:
+                    # A transient error says nothing about the URL - keep it and probe the rest
+                    known_failed = 1
+                    print(f"⚠️ Known URL failed ({str(e) or type(e).__name__}), probing variations")
             
-            # If all direct URLs fail, try search
-            if not response or response.status_code != 200:
-                print(f"⚠️  Direct URLs failed, trying search...")
-                search_url = f"https://www.whatmobile.com.pk/search?search={brand}+{model}"
-                response = requests.get(search_url, headers=headers, timeout=10)
+            if hit is None:
+                # Probe every URL variation and the search fallback concurrently
+                candidate_urls = [
+                    f"https://www.whatmobile.com.pk/{variation}"
+                    for variation in self._url_variations(brand, model)
+                ]
+                for candidate_url in candidate_urls:
+                    print(f"🔍 Trying URL: {candidate_url}")
                 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    # Find first result link
-                    first_result = soup.find('a', href=re.compile(f'{brand}.*{model}', re.I))
-                    if first_result:
-                        url = "https://www.whatmobile.com.pk" + first_result['href']
-                        response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code != 200:
+                hit, failed = await self._first_hit(
+                    [self._probe_page(candidate_url, headers) for candidate_url in candidate_urls]
+                    + [self._probe_search(brand, model, headers)]
+                )
+            # The known URL erroring rules out caching a miss, like any failed probe
+            failed += known_failed
+            answered = True
+            if not (failed and deadline.expired()):
+                breaker.record(hit is not None or not failed)
+            if hit is None:
+                # Only a definite miss is cached - failed probes may succeed next time
+                if not failed:
+                    price_cache.put_miss(CACHE_SOURCE, brand, model)
                 return f"Phone not found on WhatMobile: {brand} {model}"
             
+            url, response = hit
+            print(f"✅ Found at: {url}")
+            url_resolver.record(CACHE_SOURCE, brand, model, url)
+            
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract information
-            result = f"📱 {brand} {model}\n\n"
+            info = {"retail_price": None, "launch_date": None, "storage": None, "source_url": url}
             
             # Try to get price from JSON-LD schema first (most reliable)
             script_tags = soup.find_all('script', type='application/ld+json')
@@ -243,8 +375,7 @@ HTML CONTENT (first 5000 chars):
                                 retail_price = potential_price
                                 print(f"💰 Found price via PriceFont: PKR {retail_price:,}")
             
-            if retail_price:
-                result += f"💰 Retail Price: PKR {retail_price:,}\n"
+            info["retail_price"] = retail_price
             
             # Get launch date
             specs_table = soup.find('table', class_='specification') or soup.find('div', class_='specifications')
@@ -258,17 +389,19 @@ HTML CONTENT (first 5000 chars):
                         if date_match:
                             year = date_match.group(1)
                             month = date_match.group(2) if date_match.group(2) else '01'
-                            result += f"📅 Launch Date: {year}-{month[:3]}\n"
+                            info["launch_date"] = f"{year}-{month[:3]}"
                             break
             
             # Get storage/RAM
             storage_elem = soup.find(text=re.compile('Storage|Memory', re.I))
             if storage_elem:
                 storage_text = storage_elem.find_parent().text
-                result += f"💾 {storage_text.strip()}\n"
+                info["storage"] = storage_text.strip()
             
-            result += f"\n🔗 Source: {url}\n"
-            result += "\n✅ Use this retail price for Pakistani market calculations."
+            result = self._format_result(brand, model, info)
+            # A page whose price did not parse is not worth serving for days
+            if info.get("retail_price") is not None:
+                price_cache.put(CACHE_SOURCE, brand, model, info)
             
             # Save log
             self._save_tool_log(brand, model, url, response.text, result)
@@ -276,4 +409,7 @@ HTML CONTENT (first 5000 chars):
             return result
             
         except Exception as e:
+            # A call cut short by the inspection deadline says nothing about the site
+            if not answered and not deadline.expired():
+                breaker.record(False)
             return f"❌ Error fetching WhatMobile data: {str(e)}\nUse provided retail_price as fallback."
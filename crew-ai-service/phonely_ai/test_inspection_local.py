@@ -13,8 +13,8 @@ from pathlib import Path
 # Add the phonely_ai package to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from phonely_ai.langgraph_orchestrator import run_inspection
-from phonely_ai.api import calculate_age_months
+from phonely_ai.langgraph_orchestrator import run_inspection_async
+from phonely_ai.inspection import calculate_age_months
 
 
 def print_header(text):
@@ -158,7 +158,7 @@ async def test_inspection():
         
         try:
             # Run inspection with LangGraph orchestrator
-            result = run_inspection(inspection_data)
+            result = await run_inspection_async(inspection_data)
             
             # Calculate processing time
             end_time = datetime.now()
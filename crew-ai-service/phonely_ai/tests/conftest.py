@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Caches, the registry, the outbox and checkpoints are module-level singletons
+# under PHONELY_CACHE_DIR - keep them out of the source tree during tests
+os.environ.setdefault("PHONELY_CACHE_DIR", tempfile.mkdtemp(prefix="phonely-tests-"))
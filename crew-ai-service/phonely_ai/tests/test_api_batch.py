@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from phonely_ai import api
+
+
+def inspection(inspection_id, model="Galaxy A06"):
+    return {
+        "inspection_id": inspection_id,
+        "images": ["https://example.com/1.jpg"],
+        "phone_details": {"brand": "Samsung", "model": model, "storage": "128GB"},
+        "description": "Used, good condition"
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    started = []
+
+    async def process_batch(groups):
+        started.append(groups)
+
+    monkeypatch.setattr(api, "process_batch", process_batch)
+    monkeypatch.setattr(api, "BATCH_MAX_IN_FLIGHT", 3)
+    monkeypatch.setitem(api.batch_stats, "in_flight", 0)
+    test_client = TestClient(api.app)
+    test_client.started = started
+    return test_client
+
+
+def post_batch(client, items):
+    return client.post("/api/v1/inspection/batch", json={"inspections": items}, headers={"x-api-key": api.API_KEY})
+
+
+def test_batch_groups_same_phone(client):
+    response = post_batch(client, [inspection("b-1"), inspection("b-2"), inspection("b-3", "Galaxy A15")])
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 3
+    assert response.json()["groups"] == 2
+    assert api.batch_stats["in_flight"] == 3
+
+
+def test_batch_rejected_past_in_flight_cap(client):
+    assert post_batch(client, [inspection("c-1"), inspection("c-2")]).status_code == 200
+
+    response = post_batch(client, [inspection("c-3"), inspection("c-4")])
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    # Nothing from the rejected batch was registered or started
+    assert api.inspection_registry.get("c-3") is None
+    assert len(client.started) == 1
+    assert api.batch_stats["in_flight"] == 2
+
+
+def test_duplicates_do_not_count_against_cap(client):
+    assert post_batch(client, [inspection("d-1"), inspection("d-2"), inspection("d-3")]).status_code == 200
+
+    response = post_batch(client, [inspection("d-1"), inspection("d-2")])
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 0
+    assert [item["status"] for item in response.json()["inspections"]] == ["processing", "processing"]
+
+
+def test_finished_items_free_their_slots(monkeypatch):
+    ran = []
+
+    async def prefetch_market_data(brand, model, storage):
+        return {"whatmobile": "price"}, {"whatmobile": {"status": "ok"}}
+
+    async def process_inspection(request, market_data):
+        ran.append((request.inspection_id, market_data))
+        if request.inspection_id == "e-2":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "prefetch_market_data", prefetch_market_data)
+    monkeypatch.setattr(api, "process_inspection", process_inspection)
+    monkeypatch.setitem(api.batch_stats, "in_flight", 2)
+    requests = [api.InspectionRequest(**inspection("e-1")), api.InspectionRequest(**inspection("e-2"))]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(api.process_batch_group(requests))
+    assert api.batch_stats["in_flight"] == 0
+    assert ran[0][1] == ({"whatmobile": "price"}, {"whatmobile": {"status": "ok"}})
@@ -0,0 +1,32 @@
+import json
+
+from phonely_ai.backfill import load_checkpoint
+
+
+def write_lines(path, records, tail=""):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records) + tail)
+
+
+def test_missing_output_means_nothing_done(tmp_path):
+    assert load_checkpoint(tmp_path / "out.jsonl") == set()
+
+
+def test_partial_last_line_is_truncated(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [{"inspection_id": "a", "status": "completed"}], tail='{"inspection_id": "b", "sta')
+
+    assert load_checkpoint(output) == {"a"}
+    assert output.read_text() == json.dumps({"inspection_id": "a", "status": "completed"}) + "\n"
+
+
+def test_retry_failed_reruns_items_whose_last_line_failed(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [
+        {"inspection_id": "a", "status": "completed"},
+        {"inspection_id": "b", "status": "failed"},
+        {"inspection_id": "c", "status": "failed"},
+        {"inspection_id": "c", "status": "completed"},
+    ])
+
+    assert load_checkpoint(output) == {"a", "b", "c"}
+    assert load_checkpoint(output, retry_failed=True) == {"a", "c"}
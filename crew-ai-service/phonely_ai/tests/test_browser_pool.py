@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeout
+
+from phonely_ai.tools.browser_pool import BrowserPool, _ContextSlot
+
+
+class FakePage:
+    def on(self, event, handler):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        pass
+
+
+def lease_and_raise(error):
+    pool = BrowserPool(browsers=1, contexts_per_browser=1)
+
+    async def new_context(browser_index):
+        return FakeContext()
+
+    pool._new_context = new_context
+
+    async def main():
+        pool._slots = asyncio.Queue()
+        slot = _ContextSlot(0)
+        slot.context = FakeContext()
+        pool._slots.put_nowait(slot)
+        with pytest.raises(type(error)):
+            async with pool.page():
+                raise error
+
+    asyncio.run(main())
+    return pool.stats()
+
+
+def test_navigation_timeout_keeps_the_context():
+    stats = lease_and_raise(PlaywrightTimeout("Timeout 45000ms exceeded"))
+    assert stats["crashes"] == 0
+    assert stats["contexts_recycled"] == 0
+    assert stats["navigation_errors"] == 1
+
+
+def test_closed_target_recycles_the_context():
+    stats = lease_and_raise(PlaywrightError("Target page, context or browser has been closed"))
+    assert stats["crashes"] == 1
+    assert stats["contexts_recycled"] == 1
+    assert stats["navigation_errors"] == 0
+
+
+def test_parsing_error_is_neither_crash_nor_navigation_error():
+    stats = lease_and_raise(ValueError("bad listing"))
+    assert stats["crashes"] == 0
+    assert stats["navigation_errors"] == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from phonely_ai import callback_dispatcher
+from phonely_ai.callback_dispatcher import CallbackDispatcher, backoff_delay
+
+
+@pytest.mark.parametrize("attempts", [0, 1, 2, 5, 10, 30])
+def test_backoff_delay_bounds(attempts):
+    cap = min(callback_dispatcher.BACKOFF_MAX_SECONDS, callback_dispatcher.BACKOFF_BASE_SECONDS * (2 ** attempts))
+    for _ in range(50):
+        assert 0 <= backoff_delay(attempts) <= cap
+
+
+def test_backoff_delay_is_jittered():
+    assert len({backoff_delay(6) for _ in range(20)}) > 1
+
+
+def test_backoff_delay_capped(monkeypatch):
+    monkeypatch.setattr(callback_dispatcher, "BACKOFF_MAX_SECONDS", 5.0)
+    assert max(backoff_delay(20) for _ in range(200)) <= 5.0
+
+
+def test_insert_supersedes_pending_callback(tmp_path):
+    dispatcher = CallbackDispatcher(tmp_path / "outbox.sqlite3")
+    dispatcher._insert("insp-1", {"status": "failed"}, 1.0)
+    dispatcher._insert("insp-2", {"status": "completed"}, 1.0)
+    dispatcher._insert("insp-1", {"status": "completed"}, 2.0)
+    due = dispatcher._due(10)
+    assert sorted((inspection_id, payload["status"]) for _, inspection_id, payload, _ in due) == [
+        ("insp-1", "completed"), ("insp-2", "completed")
+    ]
@@ -0,0 +1,134 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from phonely_ai import checkpoints
+from phonely_ai import langgraph_orchestrator as orchestrator
+from phonely_ai.checkpoints import InspectionCheckpoints
+from phonely_ai.tools.async_utils import run_sync
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Runs the sync API twice with the LLM nodes stubbed out, then reports how
+# many checkpointed graphs are still cached. The process must exit by itself.
+SYNC_TWICE = textwrap.dedent("""
+    from phonely_ai import langgraph_orchestrator as orchestrator
+
+    async def vision(state):
+        return {"vision_result": {"condition_score": 8}, "vision_status": "vision_completed"}
+
+    async def text(state):
+        return {"text_result": {"completeness": 90}, "text_status": "text_completed"}
+
+    async def pricing(state):
+        return {"pricing_result": {"suggested_min_price": 1, "confidence_level": "high"}, "status": "completed"}
+
+    orchestrator.vision_analysis_node = vision
+    orchestrator.text_analysis_node = text
+    orchestrator.pricing_analysis_node = pricing
+
+    for number in range(2):
+        result = orchestrator.run_inspection({
+            "inspection_id": f"sync-{number}", "payload_hash": "abc", "brand": "Samsung", "model": "Galaxy A06",
+            "storage": "128GB", "image_urls": "", "num_images": 0, "description": "",
+            "retail_price": 40000, "age_months": 6, "deadline_seconds": 30
+        })
+        assert result["status"] == "completed", result
+    print("graphs", len(orchestrator._checkpointed_graphs))
+""")
+
+
+def test_sync_run_inspection_twice_lets_the_process_exit(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(SRC), "PHONELY_CACHE_DIR": str(tmp_path), "INSPECTION_CHECKPOINTS": "true"}
+    completed = subprocess.run(
+        [sys.executable, "-c", SYNC_TWICE], env=env, capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    assert "graphs 0" in completed.stdout
+    assert (tmp_path / "graph_checkpoints.sqlite3").exists()
+
+
+INSPECTION = {
+    "inspection_id": "insp-1", "payload_hash": "abc", "brand": "Samsung", "model": "Galaxy A06",
+    "storage": "128GB", "image_urls": "", "num_images": 0, "description": "Like new",
+    "retail_price": 40000, "age_months": 6, "deadline_seconds": 30
+}
+
+
+@pytest.fixture
+def stubbed_graph(tmp_path, monkeypatch):
+    """Checkpointed runs with stub nodes; pricing fails until `pricing_ok` is set"""
+    calls = {"vision": 0, "text": 0, "pricing_ok": False}
+
+    async def vision(state):
+        # Like the real node: a restored result skips the LLM call
+        if state.get("vision_status") == "vision_completed":
+            return {}
+        calls["vision"] += 1
+        return {"vision_result": {"condition_score": 8}, "vision_status": "vision_completed"}
+
+    async def text(state):
+        if state.get("text_status") == "text_completed":
+            return {}
+        calls["text"] += 1
+        return {"text_result": {"completeness": 90}, "text_status": "text_completed"}
+
+    async def pricing(state):
+        if calls["pricing_ok"]:
+            return {"pricing_result": {"suggested_min_price": 1, "confidence_level": "high"}, "status": "completed"}
+        return {"status": "failed", "pricing_retries": state.get("pricing_retries", 0) + 1}
+
+    monkeypatch.setattr(orchestrator, "vision_analysis_node", vision)
+    monkeypatch.setattr(orchestrator, "text_analysis_node", text)
+    monkeypatch.setattr(orchestrator, "pricing_analysis_node", pricing)
+    monkeypatch.setattr(orchestrator, "inspection_checkpoints", InspectionCheckpoints(tmp_path / "checkpoints.sqlite3"))
+    return calls
+
+
+def test_rerun_resumes_completed_steps(stubbed_graph):
+    first = run_sync(orchestrator.run_inspection_async(dict(INSPECTION)))
+    assert first["status"] == "failed"
+    assert first["resumed_from_checkpoint"] == []
+
+    stubbed_graph["pricing_ok"] = True
+    second = run_sync(orchestrator.run_inspection_async(dict(INSPECTION)))
+    assert second["status"] == "completed"
+    assert sorted(second["resumed_from_checkpoint"]) == ["text", "vision"]
+    assert second["results"]["vision_analysis"] == {"condition_score": 8}
+    assert stubbed_graph["vision"] == 1
+    assert stubbed_graph["text"] == 1
+    assert orchestrator.inspection_checkpoints.stats()["resumed"] == 1
+    assert orchestrator.inspection_checkpoints.stats()["completed"] == 1
+
+
+def test_changed_input_starts_fresh(stubbed_graph):
+    run_sync(orchestrator.run_inspection_async(dict(INSPECTION)))
+
+    stubbed_graph["pricing_ok"] = True
+    changed = run_sync(orchestrator.run_inspection_async({**INSPECTION, "description": "Cracked screen"}))
+    assert changed["resumed_from_checkpoint"] == []
+    assert stubbed_graph["vision"] == 2
+
+
+def test_touch_prunes_expired_threads(tmp_path, monkeypatch):
+    store = InspectionCheckpoints(tmp_path / "checkpoints.sqlite3")
+    real_time = time.time
+
+    async def main():
+        saver = await store.saver()
+        await store.touch(saver, "old:abc")
+        # A day later the next touch runs the hourly prune
+        monkeypatch.setattr(time, "time", lambda: real_time() + checkpoints.CHECKPOINT_TTL_SECONDS + 60)
+        await store.touch(saver, "new:abc")
+        async with saver.conn.execute("SELECT thread_id FROM inspection_threads") as cursor:
+            threads = [row[0] for row in await cursor.fetchall()]
+        await store.close()
+        return threads
+
+    assert run_sync(main()) == ["new:abc"]
+    assert store.stats()["pruned"] == 1
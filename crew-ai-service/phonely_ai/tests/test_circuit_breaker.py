@@ -0,0 +1,85 @@
+import pytest
+
+from phonely_ai.tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, is_unavailable
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setenv("CIRCUIT_MIN_CALLS_TEST", "4")
+    monkeypatch.setenv("CIRCUIT_FAILURE_RATE_TEST", "0.5")
+    monkeypatch.setenv("CIRCUIT_OPEN_SECONDS_TEST", "30")
+    return CircuitBreaker("test")
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record(False)
+    assert breaker._state == OPEN
+
+
+def test_per_source_settings(breaker):
+    assert breaker.min_calls == 4
+    assert breaker.failure_rate == 0.5
+    assert breaker.open_seconds == 30
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(breaker.min_calls - 1):
+        breaker.record(False)
+    assert breaker._state == CLOSED
+    assert breaker.allow()
+
+
+def test_stays_closed_below_failure_rate(breaker):
+    breaker.record(True)
+    breaker.record(True)
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker._state == CLOSED
+
+
+def test_opens_at_failure_rate_and_rejects(breaker):
+    breaker.record(True)
+    breaker.record(True)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker._state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() > 0
+
+
+def test_half_open_allows_one_probe(breaker):
+    open_breaker(breaker)
+    breaker._opened_at -= breaker.open_seconds
+    assert breaker.allow()
+    assert breaker._state == HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes(breaker):
+    open_breaker(breaker)
+    breaker._opened_at -= breaker.open_seconds
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker._state == CLOSED
+    assert breaker.allow()
+    # Old failures were cleared - one more failure does not re-open
+    breaker.record(False)
+    assert breaker._state == CLOSED
+
+
+def test_failed_probe_reopens(breaker):
+    open_breaker(breaker)
+    breaker._opened_at -= breaker.open_seconds
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker._state == OPEN
+    assert not breaker.allow()
+
+
+@pytest.mark.parametrize("status, unavailable", [
+    (200, False), (404, False), (410, False),
+    (403, True), (408, True), (429, True), (500, True), (503, True)
+])
+def test_is_unavailable(status, unavailable):
+    assert is_unavailable(status) is unavailable
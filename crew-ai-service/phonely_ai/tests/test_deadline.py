@@ -0,0 +1,21 @@
+import time
+
+from phonely_ai import langgraph_orchestrator as orchestrator
+
+
+def test_default_reserve_for_normal_deadlines():
+    assert orchestrator.pricing_reserve(time.time() + 120) == orchestrator.PRICING_RESERVE_SECONDS
+
+
+def test_short_deadline_leaves_vision_and_text_a_budget():
+    deadline_at = time.time() + 20
+    reserve = orchestrator.pricing_reserve(deadline_at)
+    assert 6.0 < reserve <= 20 / 3
+
+    state = {'deadline_at': deadline_at, 'pricing_reserve': reserve, 'vision_status': 'vision_failed', 'text_status': 'text_failed'}
+    assert orchestrator.should_retry_vision(state) == "retry_vision"
+    assert orchestrator.should_retry_text(state) == "retry_text"
+
+
+def test_expired_deadline_reserves_nothing():
+    assert orchestrator.pricing_reserve(time.time() - 1) == 0.0
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from phonely_ai.tools import device_catalog as catalog_module
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.device_catalog import DeviceCatalog, catalog_key, normalize_launch_date
+
+
+@pytest.mark.parametrize("model", [
+    "Galaxy A06", "Galaxy A06 128GB", "Galaxy A06 128 GB", "galaxy-a06 (128gb)", "Samsung Galaxy A06 1TB"
+])
+def test_catalog_key_ignores_storage(model):
+    assert catalog_key("Samsung", model) == ("samsung", "galaxy a06")
+
+
+def test_catalog_key_keeps_model_numbers():
+    assert catalog_key("Xiaomi", "Redmi 13 256GB") == ("xiaomi", "redmi 13")
+    assert catalog_key("Samsung", "Galaxy S24+ 256 GB") == ("samsung", "galaxy s24 plus")
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-08", "2024-08"), ("2024-8", "2024-08"), ("2024, August", "2024-08"), ("Aug 2024", "2024-08"),
+    ("2024", "2024-01"), ("soon", None), ("2024-13", None)
+])
+def test_normalize_launch_date(value, expected):
+    assert normalize_launch_date(value) == expected
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return DeviceCatalog(tmp_path / "catalog.sqlite3")
+
+
+def test_import_normalizes_and_rejects_dates(catalog):
+    imported = catalog.import_records([
+        {"brand": "Samsung", "model": "Galaxy A06", "launch_date": "2024, August"},
+        {"brand": "Samsung", "model": "Galaxy A16", "launch_date": "soon"},
+        {"brand": "Samsung", "model": "Galaxy A26"},
+        {"model": "No brand"}
+    ])
+    assert imported == 2
+    assert catalog.launch_date("Samsung", "Galaxy A06 128 GB") == "2024-08"
+    assert catalog.get("Samsung", "Galaxy A16") is None
+    assert catalog.get("Samsung", "Galaxy A26") == {}
+
+
+def test_refresh_runs_in_one_loop(catalog, monkeypatch):
+    from phonely_ai.tools.gsmarena_tool_fixed import GSMArenaTool
+
+    catalog.import_records([
+        {"brand": "Samsung", "model": "Galaxy A06"},
+        {"brand": "Samsung", "model": "Galaxy A16"}
+    ])
+    loops = set()
+
+    async def lookup(self, brand, model, use_catalog=True):
+        loops.add(asyncio.get_running_loop())
+        catalog.upsert(brand, model, {"launch_date": "2024-09"})
+        return "ok"
+
+    monkeypatch.setattr(catalog_module, "device_catalog", catalog)
+    monkeypatch.setattr(GSMArenaTool, "_lookup", lookup)
+    counts = run_sync(catalog_module._refresh(None, None, False))
+
+    assert counts == {"refreshed": 2, "failed": 0, "skipped": 0}
+    assert len(loops) == 1
@@ -0,0 +1,35 @@
+import asyncio
+
+from phonely_ai.tools.async_utils import run_sync
+from phonely_ai.tools.http_client import http_client
+
+
+async def open_client():
+    return http_client._loop_client().client
+
+
+def test_run_sync_closes_its_loop_client():
+    client = run_sync(open_client())
+    assert client.is_closed
+    assert len(http_client._clients) == 0
+
+
+def test_run_sync_from_running_loop_closes_worker_client():
+    async def main():
+        return run_sync(open_client())
+
+    assert asyncio.run(main()).is_closed
+
+
+def test_cleanup_runs_when_coroutine_raises():
+    clients = []
+
+    async def fail():
+        clients.append(http_client._loop_client().client)
+        raise ValueError("boom")
+
+    try:
+        run_sync(fail())
+    except ValueError:
+        pass
+    assert clients[0].is_closed
@@ -0,0 +1,60 @@
+from phonely_ai.inspection_registry import ATTACHED, CACHED, NEW, InspectionRegistry, payload_hash
+
+
+def test_payload_hash_ignores_key_order():
+    assert payload_hash({"brand": "Samsung", "model": "A06"}) == payload_hash({"model": "A06", "brand": "Samsung"})
+    assert payload_hash({"brand": "Samsung", "model": "A06"}) != payload_hash({"brand": "Samsung", "model": "A05"})
+
+
+def test_duplicate_attaches_then_is_served_from_cache(tmp_path):
+    registry = InspectionRegistry(tmp_path / "inspections.sqlite3")
+    digest = payload_hash({"model": "A06"})
+
+    assert registry.check("insp-1", digest) == NEW
+    registry.register("insp-1", digest)
+    assert registry.check("insp-1", digest) == ATTACHED
+
+    assert registry.finish("insp-1", digest, {"status": "completed", "price": 42000})
+    assert registry.check("insp-1", digest) == CACHED
+    assert registry.get("insp-1")["result"] == {"status": "completed", "price": 42000}
+    assert registry.stats()["active"] == 0
+
+
+def test_changed_payload_runs_again(tmp_path):
+    registry = InspectionRegistry(tmp_path / "inspections.sqlite3")
+    old, new = payload_hash({"model": "A06"}), payload_hash({"model": "A06", "storage": "128GB"})
+
+    registry.register("insp-1", old)
+    registry.finish("insp-1", old, {"status": "completed"})
+    assert registry.check("insp-1", new) == NEW
+    assert registry.stats()["changed_payloads"] == 1
+
+
+def test_failed_run_is_retried(tmp_path):
+    registry = InspectionRegistry(tmp_path / "inspections.sqlite3")
+    digest = payload_hash({"model": "A06"})
+
+    registry.register("insp-1", digest)
+    registry.finish("insp-1", digest, {"status": "failed", "error": "boom"})
+    assert registry.check("insp-1", digest) == NEW
+
+
+def test_stale_run_cannot_finish(tmp_path):
+    registry = InspectionRegistry(tmp_path / "inspections.sqlite3")
+    old, new = payload_hash({"model": "A06"}), payload_hash({"model": "A06", "storage": "128GB"})
+
+    registry.register("insp-1", old)
+    registry.register("insp-1", new)
+    assert registry.finish("insp-1", old, {"status": "completed"}) is False
+    assert registry.get("insp-1")["status"] == "queued"
+    assert registry.check("insp-1", new) == ATTACHED
+
+
+def test_restart_marks_live_jobs_interrupted(tmp_path):
+    path = tmp_path / "inspections.sqlite3"
+    digest = payload_hash({"model": "A06"})
+    InspectionRegistry(path).register("insp-1", digest)
+
+    restarted = InspectionRegistry(path)
+    assert restarted.get("insp-1")["status"] == "interrupted"
+    assert restarted.check("insp-1", digest) == NEW
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from phonely_ai.llm_output import JSONObjectScanner, NodeMetrics, extract_json_object
+
+
+# ============================================================================
+# JSONObjectScanner / extract_json_object
+# ============================================================================
+
+def test_plain_object():
+    assert extract_json_object('{"a": 1}') == {"a": 1}
+
+
+def test_nested_braces():
+    text = '{"a": {"b": {"c": [1, {"d": 2}]}}, "e": 3}'
+    assert extract_json_object(text) == json.loads(text)
+
+
+def test_braces_inside_strings():
+    text = '{"note": "looks like } or { but is text", "x": "{}}"}'
+    assert extract_json_object(text) == {"note": "looks like } or { but is text", "x": "{}}"}
+
+
+def test_escaped_quotes_inside_strings():
+    text = r'{"quote": "he said \"}\" twice", "slash": "C:\\"}'
+    assert extract_json_object(text) == {"quote": 'he said "}" twice', "slash": "C:\\"}
+
+
+def test_prose_before_and_after():
+    text = 'Sure! Here is the analysis:\n```json\n{"condition": "Good", "score": 8}\n```\nLet me know {if} you need more.'
+    assert extract_json_object(text) == {"condition": "Good", "score": 8}
+
+
+def test_first_of_several_objects():
+    assert extract_json_object('{"first": 1} and {"second": 2}') == {"first": 1}
+
+
+def test_incremental_feed():
+    scanner = JSONObjectScanner()
+    chunks = ['Result: {"a": "x', '}y", "b": {', '"c": 1}', '} trailing']
+    results = [scanner.feed(chunk) for chunk in chunks]
+    assert results[:3] == [None, None, None]
+    assert results[3] == '{"a": "x}y", "b": {"c": 1}}'
+    # Further text does not change a completed result
+    assert scanner.feed('{"other": 2}') == results[3]
+
+
+def test_incomplete_object_raises():
+    with pytest.raises(ValueError):
+        extract_json_object('{"a": {"b": 1}')
+
+
+def test_no_object_raises():
+    with pytest.raises(ValueError):
+        extract_json_object("no json here")
+
+
+def test_malformed_object_raises():
+    with pytest.raises(ValueError):
+        extract_json_object("{not: valid}")
+
+
+# ============================================================================
+# NodeMetrics
+# ============================================================================
+
+def test_retry_rate_without_retries():
+    metrics = NodeMetrics()
+    metrics.record("vision", 0, True, "structured")
+    metrics.record("vision", 0, True, "lenient")
+    stats = metrics.stats()["vision"]
+    assert stats["runs"] == 2
+    assert stats["attempts"] == 2
+    assert stats["retry_rate"] == 0.0
+    assert stats["structured"] == 1
+    assert stats["lenient"] == 1
+
+
+def test_retry_rate_counts_extra_attempts_per_run():
+    metrics = NodeMetrics()
+    # Run 1 fails twice, then succeeds; run 2 succeeds first time
+    metrics.record("pricing", 0, False)
+    metrics.record("pricing", 1, False)
+    metrics.record("pricing", 2, True, "streamed")
+    metrics.record("pricing", 0, True, "structured")
+    stats = metrics.stats()["pricing"]
+    assert stats["runs"] == 2
+    assert stats["attempts"] == 4
+    assert stats["failures"] == 2
+    assert stats["retry_rate"] == 1.0
+
+
+def test_retry_rate_with_no_runs():
+    metrics = NodeMetrics()
+    metrics.record("text", 1, True, "lenient")  # retry of a run recorded elsewhere
+    assert metrics.stats()["text"]["retry_rate"] == 0.0
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+from phonely_ai.tools.olx_snapshot_cache import OLXSnapshotCache
+
+SNAPSHOT = {"listings": 12, "median_price": 38000}
+
+
+def age_entry(cache, brand, model, storage, seconds):
+    """Pretend the stored snapshot was fetched `seconds` ago (memory and disk)"""
+    key = cache.key(brand, model, storage)
+    fetched_at, snapshot = cache._memory[key]
+    cache._memory[key] = (fetched_at - seconds, snapshot)
+    cache._conn().execute(
+        "UPDATE olx_snapshots SET fetched_at = ? WHERE brand = ? AND model = ? AND storage = ?",
+        (fetched_at - seconds, *key)
+    )
+
+
+def test_fresh_stale_and_expired(tmp_path):
+    cache = OLXSnapshotCache(tmp_path / "olx.sqlite3", soft_ttl=100, hard_ttl=1000)
+    assert cache.get("Samsung", "Galaxy A06", "128GB") == (None, float("inf"))
+
+    cache.put("Samsung", "Galaxy A06", "128GB", SNAPSHOT)
+    snapshot, age = cache.get("samsung", "galaxy a06", "128 GB")
+    assert snapshot == SNAPSHOT and not cache.is_stale(age)
+
+    age_entry(cache, "Samsung", "Galaxy A06", "128GB", 500)
+    snapshot, age = cache.get("Samsung", "Galaxy A06", "128GB")
+    assert snapshot == SNAPSHOT and cache.is_stale(age)
+
+    age_entry(cache, "Samsung", "Galaxy A06", "128GB", 1000)
+    assert cache.get("Samsung", "Galaxy A06", "128GB")[0] is None
+    assert cache.get("Samsung", "Galaxy A06", "128GB", ignore_hard_ttl=True)[0] == SNAPSHOT
+
+    stats = cache.stats()
+    assert (stats["fresh_hits"], stats["stale_hits"], stats["misses"]) == (1, 2, 2)
+
+
+def test_memory_tier_is_a_bounded_lru(tmp_path):
+    cache = OLXSnapshotCache(tmp_path / "olx.sqlite3", memory_size=2)
+    cache.put("Samsung", "Galaxy A06", None, SNAPSHOT)
+    cache.put("Samsung", "Galaxy A16", None, SNAPSHOT)
+    cache.get("Samsung", "Galaxy A06", None)  # A06 becomes most recently used
+    cache.put("Samsung", "Galaxy A26", None, SNAPSHOT)
+
+    assert list(cache._memory) == [("samsung", "galaxy a06", ""), ("samsung", "galaxy a26", "")]
+    # Evicted entries are still served from disk
+    assert cache.get("Samsung", "Galaxy A16", None)[0] == SNAPSHOT
+    assert cache.stats()["snapshots_in_memory"] == 2
+
+
+def test_one_background_refresh_per_key(tmp_path):
+    cache = OLXSnapshotCache(tmp_path / "olx.sqlite3")
+    calls = []
+
+    async def fetch():
+        calls.append(time.time())
+        await asyncio.sleep(0.01)
+        return {"listings": 20}
+
+    async def main():
+        for _ in range(3):
+            cache.refresh_in_background("Samsung", "Galaxy A06", None, fetch)
+        await asyncio.gather(*cache._tasks)
+
+    asyncio.run(main())
+    assert len(calls) == 1
+    assert cache.get("Samsung", "Galaxy A06", None)[0] == {"listings": 20}
+    assert cache.stats()["background_refreshes"] == 1
+    assert cache.stats()["refreshing"] == 0
+
+
+def test_failed_refresh_keeps_the_old_snapshot(tmp_path):
+    cache = OLXSnapshotCache(tmp_path / "olx.sqlite3")
+    cache.put("Samsung", "Galaxy A06", None, SNAPSHOT)
+
+    async def fetch():
+        return {"error": "blocked"}
+
+    async def main():
+        cache.refresh_in_background("Samsung", "Galaxy A06", None, fetch)
+        await asyncio.gather(*cache._tasks)
+
+    asyncio.run(main())
+    assert cache.get("Samsung", "Galaxy A06", None)[0] == SNAPSHOT
+    assert cache.stats()["refresh_failures"] == 1
@@ -0,0 +1,58 @@
+import pytest
+
+from phonely_ai.tools.price_cache import RetailPriceCache, is_miss, normalize_model_key
+
+
+@pytest.mark.parametrize("brand, model, key", [
+    ("Samsung ", "samsung Galaxy-A06", ("samsung", "galaxy a06")),
+    ("Samsung", "Galaxy S24+", ("samsung", "galaxy s24 plus")),
+    ("Samsung", "Galaxy S24 Plus", ("samsung", "galaxy s24 plus")),
+    ("Samsung", "Galaxy S24", ("samsung", "galaxy s24")),
+    ("Samsung", "Galaxy S24 Ultra", ("samsung", "galaxy s24 ultra")),
+    ("Xiaomi", "Redmi Note 13 Pro+ 5G", ("xiaomi", "redmi note 13 pro plus 5g")),
+    ("Infinix", "Hot 40 12/256", ("infinix", "hot 40 12 256")),
+    ("Apple", "iPhone 15 Pro Max (256GB)", ("apple", "iphone 15 pro max 256gb")),
+])
+def test_normalize_model_key(brand, model, key):
+    assert normalize_model_key(brand, model) == key
+
+
+def test_plus_and_ultra_are_distinct_phones():
+    keys = {
+        normalize_model_key("Samsung", "Galaxy S24"),
+        normalize_model_key("Samsung", "Galaxy S24+"),
+        normalize_model_key("Samsung", "Galaxy S24 Ultra"),
+    }
+    assert len(keys) == 3
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RetailPriceCache(tmp_path / "prices.sqlite3")
+
+
+def test_negative_entry_is_served(cache):
+    cache.put_miss("whatmobile", "Samsung", "Galaxy X1")
+    assert is_miss(cache.get("whatmobile", "samsung", "galaxy-x1"))
+    assert cache.get("priceoye", "Samsung", "Galaxy X1") is None
+
+
+def test_miss_counter_counts_every_lookup_that_misses(cache):
+    cache.put_miss("whatmobile", "Samsung", "Galaxy X1")
+    # Served from the memory tier, then from disk once memory is cold
+    cache.get("whatmobile", "Samsung", "Galaxy X1")
+    cache.get("whatmobile", "Samsung", "Galaxy X1")
+    cache._memory.clear()
+    cache.get("whatmobile", "Samsung", "Galaxy X1")
+
+    cache.put_miss("whatmobile", "Samsung", "Galaxy X2")
+
+    misses = cache.misses("whatmobile")
+    assert [(row["model"], row["lookups"]) for row in misses] == [("galaxy x1", 4), ("galaxy x2", 1)]
+    assert cache.stats()["sources"]["whatmobile"]["negative_hits"] == 3
+
+
+def test_positive_hits_are_not_tallied(cache):
+    cache.put("whatmobile", "Samsung", "Galaxy A06", {"retail_price": 40000})
+    cache.get("whatmobile", "Samsung", "Galaxy A06")
+    assert cache.misses() == []
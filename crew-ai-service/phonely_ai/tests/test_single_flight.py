@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+
+from phonely_ai import deadline
+from phonely_ai.tools.single_flight import SingleFlight
+
+
+async def call_with_deadline(flight, key, fn, deadline_at):
+    token = deadline.set_deadline(deadline_at)
+    try:
+        return await flight.do("test", key, fn)
+    finally:
+        deadline.reset_deadline(token)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("test", "galaxy a06", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(runs) == 1
+    assert flight.stats()["namespaces"]["test"] == {"calls": 5, "executions": 1, "deduplicated": 4}
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("test", "galaxy s24", lambda: asyncio.sleep(0.01, "s24")),
+            flight.do("test", "galaxy s24 plus", lambda: asyncio.sleep(0.01, "s24+"))
+        )
+
+    assert asyncio.run(main()) == ["s24", "s24+"]
+
+
+def test_tool_call_inside_flight_sees_callers_deadline():
+    flight = SingleFlight()
+    seen = {}
+
+    async def tool_lookup():
+        # What a scraper tool does before each network call
+        seen["timeout"] = deadline.call_timeout(10.0)
+        seen["expired"] = deadline.expired()
+        return "ok"
+
+    async def main():
+        return await call_with_deadline(flight, "key", tool_lookup, time.time() + 3)
+
+    assert asyncio.run(main()) == "ok"
+    assert 2.0 < seen["timeout"] <= 3.0
+    assert seen["expired"] is False
+
+
+def test_flight_deadline_extends_to_latest_caller():
+    flight = SingleFlight()
+    seen = []
+
+    async def tool_lookup():
+        seen.append(deadline.remaining())
+        await asyncio.sleep(0.05)
+        seen.append(deadline.remaining())
+        return "ok"
+
+    async def main():
+        now = time.time()
+        first = asyncio.create_task(call_with_deadline(flight, "key", tool_lookup, now + 2))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(call_with_deadline(flight, "key", tool_lookup, now + 20))
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(main()) == ["ok", "ok"]
+    assert seen[0] <= 2.0
+    assert 15.0 < seen[1] <= 20.0
+
+
+def test_caller_without_deadline_lifts_flight_deadline():
+    flight = SingleFlight()
+    seen = []
+
+    async def tool_lookup():
+        await asyncio.sleep(0.05)
+        seen.append(deadline.remaining())
+        return "ok"
+
+    async def main():
+        first = asyncio.create_task(call_with_deadline(flight, "key", tool_lookup, time.time() + 2))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(flight.do("test", "key", tool_lookup))
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(main()) == ["ok", "ok"]
+    assert seen == [None]
+
+
+def test_caller_times_out_without_cancelling_the_flight():
+    flight = SingleFlight()
+
+    async def slow_lookup():
+        await asyncio.sleep(0.2)
+        return "late"
+
+    async def main():
+        impatient = asyncio.create_task(call_with_deadline(flight, "key", slow_lookup, time.time() + 0.05))
+        await asyncio.sleep(0.01)
+        patient = asyncio.create_task(flight.do("test", "key", slow_lookup))
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(main()) == "late"
@@ -0,0 +1,38 @@
+from phonely_ai.tools.url_resolver import URLResolver
+
+A06 = "https://www.whatmobile.com.pk/Samsung_Galaxy-A06"
+A06_5G = "https://www.whatmobile.com.pk/Samsung_Galaxy-A06-5G"
+
+
+def test_exact_and_fuzzy_lookups(tmp_path):
+    resolver = URLResolver(tmp_path / "urls.sqlite3")
+    resolver.record("whatmobile", "Samsung", "Galaxy A06", A06)
+
+    assert resolver.resolve("whatmobile", "samsung", "galaxy a06") == A06
+    assert resolver.resolve("whatmobile", "Samsung", "Galaxy-A06 128GB") == A06
+    assert resolver.resolve("whatmobile", "Samsung", "Galaxy A06 128 GB") == A06
+    assert resolver.stats()["sources"]["whatmobile"]["fuzzy_hits"] == 2
+
+
+def test_variants_and_other_numbers_never_fuzzy_match(tmp_path):
+    resolver = URLResolver(tmp_path / "urls.sqlite3")
+    resolver.record("whatmobile", "Samsung", "Galaxy A06", A06)
+
+    assert resolver.resolve("whatmobile", "Samsung", "Galaxy A06 5G") is None
+    assert resolver.resolve("whatmobile", "Samsung", "Galaxy A05") is None
+    assert resolver.resolve("priceoye", "Samsung", "Galaxy A06") is None
+
+
+def test_forget_drops_every_key_pointing_at_the_url(tmp_path):
+    resolver = URLResolver(tmp_path / "urls.sqlite3")
+    resolver.record("whatmobile", "Samsung", "Galaxy A06", A06)
+    resolver.record("whatmobile", "Samsung", "Galaxy-A06 (4GB)", A06)
+    resolver.record("whatmobile", "Samsung", "Galaxy A06 5G", A06_5G)
+
+    resolver.forget("whatmobile", "Samsung", "Galaxy A06 128GB")
+    assert resolver.resolve("whatmobile", "Samsung", "Galaxy A06") is None
+    assert resolver.resolve("whatmobile", "Samsung", "Galaxy A06 5G") == A06_5G
+
+    # Survives a restart
+    assert URLResolver(tmp_path / "urls.sqlite3").resolve("whatmobile", "Samsung", "Galaxy A06 5G") == A06_5G
+    assert URLResolver(tmp_path / "urls.sqlite3").resolve("whatmobile", "Samsung", "Galaxy A06") is None
@@ -0,0 +1,38 @@
+import asyncio
+
+import httpx
+
+from phonely_ai.tools import whatmobile_tool
+from phonely_ai.tools.whatmobile_tool import WhatMobileTool
+
+
+SEARCH_PAGE = """
+<a href="/Samsung_Galaxy-S244">Galaxy S244</a>
+<a href="/Samsung_Galaxy-S24+">Galaxy S24+</a>
+"""
+
+
+class FakeClient:
+    async def get(self, url, **kwargs):
+        return httpx.Response(200, text=SEARCH_PAGE, request=httpx.Request("GET", url))
+
+
+def probe(model, monkeypatch):
+    pages = []
+
+    async def fake_probe_page(self, url, headers):
+        pages.append(url)
+        return url, None
+
+    monkeypatch.setattr(whatmobile_tool, "http_client", FakeClient())
+    monkeypatch.setattr(WhatMobileTool, "_probe_page", fake_probe_page)
+    asyncio.run(WhatMobileTool()._probe_search("Samsung", model, {}))
+    return pages
+
+
+def test_search_matches_model_literally(monkeypatch):
+    assert probe("Galaxy-S24+", monkeypatch) == ["https://www.whatmobile.com.pk/Samsung_Galaxy-S24+"]
+
+
+def test_search_tolerates_regex_metacharacters(monkeypatch):
+    assert probe("Galaxy (S24", monkeypatch) == []